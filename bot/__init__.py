@@ -92,7 +92,6 @@ queue_dict_lock = Lock()
 qb_listener_lock = Lock()
 nzb_listener_lock = Lock()
 jd_listener_lock = Lock()
-cpu_eater_lock = Lock()
 same_directory_lock = Lock()
 
 def load_shorteners_from_file():
@@ -1,3 +1,4 @@
+from ast import literal_eval
 from importlib import import_module
 from os import getenv
 
@@ -35,6 +36,8 @@ class Config:
     AUTHOR_NAME = "𝐌ʀ𝐉ʜᴀᴘʟᴜ"
     AUTHOR_URL = "https://t.me/mrjhaplu"
     DEBRID_LINK_API = ""
+    DIRECT_LINK_CACHE_TTL = 300
+    DIRECT_LINK_HOST_LIMIT = 4
     INSTADL_API = ""
     IMDB_TEMPLATE = ""
     INCOMPLETE_TASK_NOTIFIER = False
@@ -68,6 +71,7 @@ class Config:
     LEECH_FONT = ""
     LEECH_SPLIT_SIZE = 2097152000
     MEDIA_GROUP = False
+    LEECH_CACHE = False
     HYBRID_LEECH = True
     HYPER_THREADS = 0
     HYDRA_IP = ""
@@ -77,6 +81,9 @@ class Config:
     QUEUE_ALL = 0
     QUEUE_DOWNLOAD = 0
     QUEUE_UPLOAD = 0
+    QUEUE_POLICY = "fair"
+    QUEUE_SUDO_PRIORITY = False
+    QUEUE_ENGINE_LIMITS = {}
     RCLONE_FLAGS = ""
     RCLONE_PATH = ""
     RCLONE_SERVE_URL = ""
@@ -103,6 +110,8 @@ class Config:
     VERIFY_TIMEOUT = 21600
     LOGIN_PASS = ""
     TORRENT_TIMEOUT = 0
+    DIRECT_PARALLEL = 4
+    DIRECT_CONNECTIONS = 16
     TIMEZONE = "Asia/Kolkata"
     USER_MAX_TASKS = 0
     USER_TIME_INTERVAL = 0
@@ -116,6 +125,7 @@ class Config:
     USE_SERVICE_ACCOUNTS = False
     WEB_PINCODE = True
     YT_DLP_OPTIONS = {}
+    YT_DLP_PLAYLIST_CONCURRENCY = 3
 
     @classmethod
     def get(cls, key):
@@ -204,6 +214,12 @@ class Config:
                 return float(value)
             except ValueError:
                 return original_value
+        elif isinstance(original_value, (dict, list)):
+            try:
+                value = literal_eval(value)
+            except (ValueError, SyntaxError):
+                return original_value
+            return value if isinstance(value, type(original_value)) else original_value
         return value
 
     @classmethod
@@ -100,7 +100,10 @@ class TgClient:
 
     @classmethod
     async def stop(cls):
+        from ..helper.ext_utils.hyperdl_utils import MediaSessionPool
+
         async with cls._lock:
+            await MediaSessionPool.stop_all()
             if cls.bot:
                 await cls.bot.stop()
                 cls.bot = None
@@ -114,7 +117,10 @@ class TgClient:
 
     @classmethod
     async def reload(cls):
+        from ..helper.ext_utils.hyperdl_utils import MediaSessionPool
+
         async with cls._lock:
+            await MediaSessionPool.stop_all()
             await cls.bot.restart()
             if cls.user:
                 await cls.user.restart()
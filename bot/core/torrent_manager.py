@@ -1,7 +1,8 @@
-from asyncio import TimeoutError, gather
+from asyncio import Lock, TimeoutError, gather
 from contextlib import suppress
 from inspect import iscoroutinefunction
 from pathlib import Path
+from time import time
 
 from aioaria2 import Aria2WebsocketClient
 from aiohttp import ClientError
@@ -39,6 +40,16 @@ def wrap_with_retry(obj, max_retries=3):
 class TorrentManager:
     aria2 = None
     qbittorrent = None
+    poll_interval = 1
+    aria2_downloads = {}
+    qbit_torrents = {}
+    _qbit_by_hash = {}
+    _qbit_rid = 0
+    _aria2_polled = 0
+    _aria2_tracked = {}
+    _qbit_polled = 0
+    _aria2_lock = Lock()
+    _qbit_lock = Lock()
 
     @classmethod
     async def initiate(cls):
@@ -72,6 +83,85 @@ class TorrentManager:
         if close_tasks:
             await gather(*close_tasks)
 
+    @classmethod
+    async def _refresh_aria2(cls):
+        # gids nobody asked about for a minute belong to finished tasks
+        now = time()
+        for gid, asked in list(cls._aria2_tracked.items()):
+            if now - asked > 60:
+                del cls._aria2_tracked[gid]
+        downloads = {
+            download["gid"]: download for download in await cls.aria2.tellActive()
+        }
+        if missing := [gid for gid in cls._aria2_tracked if gid not in downloads]:
+            results = await cls.aria2.multicall(
+                [
+                    {"methodName": "aria2.tellStatus", "params": [gid]}
+                    for gid in missing
+                ]
+            )
+            for gid, res in zip(missing, results):
+                # each entry is [status] or a fault struct for purged gids
+                if isinstance(res, list) and res:
+                    downloads[gid] = res[0]
+        cls.aria2_downloads = downloads
+
+    @classmethod
+    async def get_aria2_download(cls, gid):
+        async with cls._aria2_lock:
+            cls._aria2_tracked[gid] = time()
+            if time() - cls._aria2_polled >= cls.poll_interval:
+                cls._aria2_polled = time()
+                try:
+                    await cls._refresh_aria2()
+                except Exception as e:
+                    LOGGER.error(f"{e}: Aria2c, Error while polling downloads")
+        if (download := cls.aria2_downloads.get(gid)) is None:
+            download = await cls.aria2.tellStatus(gid)
+            cls.aria2_downloads[gid] = download
+        return download
+
+    @classmethod
+    async def _refresh_qbittorrent(cls):
+        data = await cls.qbittorrent.sync.maindata(cls._qbit_rid)
+        cls._qbit_rid = getattr(data, "rid", 0)
+        if getattr(data, "full_update", True):
+            cls._qbit_by_hash = {
+                tor.hash: tor for tor in await cls.qbittorrent.torrents.info()
+            }
+        else:
+            for ext_hash in getattr(data, "torrents_removed", None) or []:
+                cls._qbit_by_hash.pop(ext_hash, None)
+            if changed := list(getattr(data, "torrents", None) or {}):
+                for tor in await cls.qbittorrent.torrents.info(hashes=changed):
+                    cls._qbit_by_hash[tor.hash] = tor
+        torrents = {}
+        for tor in cls._qbit_by_hash.values():
+            for tag in tor.tags:
+                torrents[tag] = tor
+        cls.qbit_torrents = torrents
+
+    @classmethod
+    async def get_qbit_torrents(cls):
+        async with cls._qbit_lock:
+            if time() - cls._qbit_polled >= cls.poll_interval:
+                cls._qbit_polled = time()
+                try:
+                    await cls._refresh_qbittorrent()
+                except Exception as e:
+                    cls._qbit_rid = 0
+                    LOGGER.error(f"{e}: Qbittorrent, Error while syncing torrents")
+        return list(cls._qbit_by_hash.values())
+
+    @classmethod
+    async def get_qbit_torrent(cls, tag):
+        await cls.get_qbit_torrents()
+        if (tor := cls.qbit_torrents.get(tag)) is None:
+            if res := await cls.qbittorrent.torrents.info(tag=tag):
+                tor = res[0]
+                cls._qbit_by_hash[tor.hash] = cls.qbit_torrents[tag] = tor
+        return tor
+
     @classmethod
     async def aria2_remove(cls, download):
         if download.get("status", "") in ["active", "paused", "waiting"]:
@@ -1,19 +1,19 @@
 import re
-from asyncio import gather, sleep
+from asyncio import Lock, gather, sleep
 from contextlib import suppress
-from os import path as ospath, walk
+from os import path as ospath
 from re import sub
 from secrets import token_hex
 from shlex import split
+from time import time
 
 from aiofiles.os import listdir, makedirs, remove, path as aiopath
 from aioshutil import move, rmtree
-from pyrogram.enums import ChatAction
+from pyrogram.enums import ChatAction, ChatType
 
 from .. import (
     DOWNLOAD_DIR,
     LOGGER,
-    cpu_eater_lock,
     excluded_extensions,
     intervals,
     multi_tags,
@@ -23,16 +23,17 @@ from .. import (
 )
 from ..core.config_manager import Config, BinConfig
 from ..core.tg_client import TgClient
-from .ext_utils.bot_utils import get_size_bytes, new_task, sync_to_async
+from .ext_utils.bot_utils import get_size_bytes, new_task
 from .ext_utils.bulk_links import extract_bulk_links
+from .ext_utils.cpu_scheduler import CpuScheduler, ffmpeg_job_kind
 from .ext_utils.files_utils import (
     SevenZ,
     get_base_name,
     get_path_size,
+    get_tree,
     is_archive,
     is_archive_split,
     is_first_archive_split,
-    split_file,
 )
 from .ext_utils.links_utils import (
     is_gdrive_id,
@@ -47,6 +48,7 @@ from .ext_utils.media_utils import (
     get_document_type,
     take_ss,
 )
+from .ext_utils.task_manager import bulk_task_limit
 from .mirror_leech_utils.gdrive_utils.list import GoogleDriveList
 from .mirror_leech_utils.rclone_utils.list import RcloneList
 from .mirror_leech_utils.status_utils.ffmpeg_status import FFmpegStatus
@@ -68,6 +70,7 @@ class TaskConfig:
         self.dir = f"{DOWNLOAD_DIR}{self.mid}"
         self.up_dir = ""
         self.link = ""
+        self.source_link = ""
         self.up_dest = ""
         self.rc_flags = ""
         self.tag = ""
@@ -78,6 +81,7 @@ class TaskConfig:
         self.folder_name = ""
         self.split_size = 0
         self.max_split_size = 0
+        self.virtual_splits = {}
         self.multi = 0
         self.size = 0
         self.subsize = 0
@@ -501,15 +505,17 @@ class TaskConfig:
 
     @new_task
     async def run_multi(self, input_list, obj):
+        if self.multi <= 1:
+            # bulk tasks share the tag with their siblings (multi 0), only the
+            # last step of an -i chain owns it
+            if self.multi == 1 and self.multi_tag in multi_tags:
+                multi_tags.discard(self.multi_tag)
+            return
         await sleep(7)
-        if not self.multi_tag and self.multi > 1:
+        if not self.multi_tag:
             self.multi_tag = token_hex(3)
             multi_tags.add(self.multi_tag)
-        elif self.multi <= 1:
-            if self.multi_tag in multi_tags:
-                multi_tags.discard(self.multi_tag)
-            return
-        if self.multi_tag and self.multi_tag not in multi_tags:
+        if self.multi_tag not in multi_tags:
             await send_message(
                 self.message, f"{self.tag} Multi Task has been cancelled!"
             )
@@ -518,25 +524,17 @@ class TaskConfig:
                 for fd_name in self.same_dir:
                     self.same_dir[fd_name]["total"] -= self.multi
             return
-        if len(self.bulk) != 0:
-            msg = input_list[:1]
-            msg.append(f"{self.bulk[0]} -i {self.multi - 1} {self.options}")
-            msgts = " ".join(msg)
-            if self.multi > 2:
-                msgts += f"\n• <b>Cancel Multi:</b> <i>/{BotCommands.CancelTaskCommand[1]}_{self.multi_tag}</i>"
-            nextmsg = await send_message(self.message, msgts)
-        else:
-            msg = [s.strip() for s in input_list]
-            index = msg.index("-i")
-            msg[index + 1] = f"{self.multi - 1}"
-            nextmsg = await self.client.get_messages(
-                chat_id=self.message.chat.id,
-                message_ids=self.message.reply_to_message_id + 1,
-            )
-            msgts = " ".join(msg)
-            if self.multi > 2:
-                msgts += f"\n• <b>Cancel Multi:</b> <i>/{BotCommands.CancelTaskCommand[1]}_{self.multi_tag}</i>"
-            nextmsg = await send_message(nextmsg, msgts)
+        msg = [s.strip() for s in input_list]
+        index = msg.index("-i")
+        msg[index + 1] = f"{self.multi - 1}"
+        nextmsg = await self.client.get_messages(
+            chat_id=self.message.chat.id,
+            message_ids=self.message.reply_to_message_id + 1,
+        )
+        msgts = " ".join(msg)
+        if self.multi > 2:
+            msgts += f"\n• <b>Cancel Multi:</b> <i>/{BotCommands.CancelTaskCommand[1]}_{self.multi_tag}</i>"
+        nextmsg = await send_message(nextmsg, msgts)
         nextmsg = await self.client.get_messages(
             chat_id=self.message.chat.id, message_ids=nextmsg.id
         )
@@ -567,28 +565,68 @@ class TaskConfig:
             self.bulk = await extract_bulk_links(self.message, bulk_start, bulk_end)
             if len(self.bulk) == 0:
                 raise ValueError("Bulk Empty!")
-            b_msg = input_list[:1]
             self.options = input_list[1:]
             index = self.options.index("-b")
             del self.options[index]
             if bulk_start or bulk_end:
                 del self.options[index + 1]
             self.options = " ".join(self.options)
-            b_msg.append(f"{self.bulk[0]} -i {len(self.bulk)} {self.options}")
-            msg = " ".join(b_msg)
-            if len(self.bulk) > 2:
-                self.multi_tag = token_hex(3)
-                multi_tags.add(self.multi_tag)
-                msg += f"\n• <b>Cancel Multi:</b> <i>/{BotCommands.CancelTaskCommand[1]}_{self.multi_tag}</i>"
-            nextmsg = await send_message(self.message, msg)
-            nextmsg = await self.client.get_messages(
-                chat_id=self.message.chat.id, message_ids=nextmsg.id
+        except Exception:
+            await send_message(
+                self.message,
+                "Reply to text file or to telegram message that have links seperated by new line!",
             )
+            return
+        await self.start_bulk(input_list[0], obj)
+
+    async def start_bulk(self, cmd, obj):
+        """Starts one task per bulk link as soon as its message is sent and lets
+        the queue decide which of them run, instead of chaining them 7s apart."""
+        links = list(dict.fromkeys(link.strip() for link in self.bulk if link.strip()))
+        self.bulk = []
+        await self.get_tag(self.message.text.split("\n"))
+        over_limit = 0
+        if (limit := await bulk_task_limit(self.message)) is not None:
+            over_limit = max(len(links) - limit, 0)
+            links = links[:limit]
+        self.multi_tag = token_hex(3)
+        multi_tags.add(self.multi_tag)
+        if self.folder_name:
+            async with task_dict_lock:
+                if self.folder_name in self.same_dir:
+                    self.same_dir[self.folder_name]["total"] += len(links)
+                else:
+                    self.same_dir[self.folder_name] = {
+                        "total": len(links),
+                        "tasks": set(),
+                    }
+        msg = f"{self.tag} Bulk: <b>{len(links)}</b> tasks"
+        if over_limit:
+            msg += f"\n• <b>Skipped:</b> {over_limit} links over your task limit"
+        msg += f"\n• <b>Cancel Multi:</b> <i>/{BotCommands.CancelTaskCommand[1]}_{self.multi_tag}</i>"
+        await send_message(self.message, msg)
+        # one send at a time, paced under telegram's per-chat flood limits
+        send_lock = Lock()
+        interval = 1 if self.message.chat.type == ChatType.PRIVATE else 3
+        last_sent = [0]
+
+        async def start_task(link):
+            async with send_lock:
+                if self.multi_tag not in multi_tags or intervals["stopAll"]:
+                    return None
+                if (wait := last_sent[0] + interval - time()) > 0:
+                    await sleep(wait)
+                nextmsg = await send_message(
+                    self.message, f"{cmd} {link} {self.options}".rstrip()
+                )
+                last_sent[0] = time()
+            if isinstance(nextmsg, str) or nextmsg is None:
+                return None
             if self.message.from_user:
                 nextmsg.from_user = self.user
             else:
                 nextmsg.sender_chat = self.user
-            await obj(
+            task = obj(
                 self.client,
                 nextmsg,
                 self.is_qbit,
@@ -596,15 +634,45 @@ class TaskConfig:
                 self.is_jd,
                 self.is_nzb,
                 self.same_dir,
-                self.bulk,
+                [],
                 self.multi_tag,
                 self.options,
-            ).new_event()
-        except Exception:
-            await send_message(
-                self.message,
-                "Reply to text file or to telegram message that have links seperated by new line!",
             )
+            if self.folder_name:
+                async with task_dict_lock:
+                    self.same_dir[self.folder_name]["tasks"].add(task.mid)
+            try:
+                await task.new_event(bulk_child=True)
+            finally:
+                async with task_dict_lock:
+                    registered = task.mid in task_dict
+                    # a child that bailed out before registering may not have
+                    # left the folder merge, which would then wait forever
+                    if (
+                        not registered
+                        and self.folder_name
+                        and task.mid in self.same_dir[self.folder_name]["tasks"]
+                    ):
+                        self.same_dir[self.folder_name]["tasks"].remove(task.mid)
+                        self.same_dir[self.folder_name]["total"] -= 1
+            return registered
+
+        started = await gather(
+            *(start_task(link) for link in links), return_exceptions=True
+        )
+        for result in started:
+            if isinstance(result, Exception):
+                LOGGER.error(f"Bulk task failed to start: {result}")
+        # links that never got a message were counted in the folder total
+        if not_sent := started.count(None):
+            if self.folder_name:
+                async with task_dict_lock:
+                    self.same_dir[self.folder_name]["total"] -= not_sent
+            if self.multi_tag not in multi_tags:
+                await send_message(
+                    self.message, f"{self.tag} Multi Task has been cancelled!"
+                )
+        multi_tags.discard(self.multi_tag)
 
     async def proceed_extract(self, dl_path, gid):
         pswd = self.extract if isinstance(self.extract, str) else ""
@@ -612,15 +680,14 @@ class TaskConfig:
         if self.is_file and is_archive(dl_path):
             self.files_to_proceed.append(dl_path)
         else:
-            for dirpath, _, files in await sync_to_async(walk, dl_path, topdown=False):
-                for file_ in files:
-                    if (
-                        is_first_archive_split(file_)
-                        or is_archive(file_)
-                        and not file_.strip().lower().endswith(".rar")
-                    ):
-                        f_path = ospath.join(dirpath, file_)
-                        self.files_to_proceed.append(f_path)
+            _, files = await get_tree(dl_path)
+            for entry in files:
+                if (
+                    is_first_archive_split(entry.name)
+                    or is_archive(entry.name)
+                    and not entry.name.strip().lower().endswith(".rar")
+                ):
+                    self.files_to_proceed.append(entry.path)
 
         if not self.files_to_proceed:
             return dl_path
@@ -628,42 +695,56 @@ class TaskConfig:
         LOGGER.info(f"Extracting: {self.name}")
         async with task_dict_lock:
             task_dict[self.mid] = SevenZStatus(self, sevenz, gid, "Extract")
-        for dirpath, _, files in await sync_to_async(
-            walk, self.up_dir or self.dir, topdown=False
-        ):
-            code = 0
+        archives = []
+        dir_files = {}
+        _, files = await get_tree(self.up_dir or self.dir)
+        names = {}
+        for entry in files:
+            names.setdefault(entry.dirpath, []).append(entry.name)
+        for entry in files:
+            if (
+                is_first_archive_split(entry.name)
+                or is_archive(entry.name)
+                and not entry.name.strip().lower().endswith(".rar")
+            ):
+                t_path = get_base_name(entry.path) if self.is_file else entry.dirpath
+                archives.append((entry.path, t_path))
+                dir_files[entry.dirpath] = names[entry.dirpath]
+        codes = await sevenz.extract_all(archives, pswd) if archives else []
+        if self.is_cancelled:
+            return False
+        failed_dirs = {
+            ospath.dirname(f_path)
+            for (f_path, _), code in zip(archives, codes)
+            if code != 0
+        }
+        code = 0 if not failed_dirs else 1
+        for dirpath, files in dir_files.items():
+            if dirpath in failed_dirs:
+                continue
             for file_ in files:
-                if self.is_cancelled:
-                    return False
-                if (
-                    is_first_archive_split(file_)
-                    or is_archive(file_)
-                    and not file_.strip().lower().endswith(".rar")
-                ):
-                    self.proceed_count += 1
-                    f_path = ospath.join(dirpath, file_)
-                    t_path = get_base_name(f_path) if self.is_file else dirpath
-                    if not self.is_file:
-                        self.subname = file_
-                    code = await sevenz.extract(f_path, t_path, pswd)
-            if self.is_cancelled:
-                return code
-            if code == 0:
-                for file_ in files:
-                    if is_archive_split(file_) or is_archive(file_):
-                        del_path = ospath.join(dirpath, file_)
-                        try:
-                            await remove(del_path)
-                        except Exception:
-                            self.is_cancelled = True
-        return t_path if self.is_file and code == 0 else dl_path
+                if is_archive_split(file_) or is_archive(file_):
+                    del_path = ospath.join(dirpath, file_)
+                    try:
+                        await remove(del_path)
+                    except Exception:
+                        self.is_cancelled = True
+        if self.is_file and code == 0 and archives:
+            return archives[0][1]
+        return dl_path
 
     async def proceed_ffmpeg(self, dl_path, gid):
         checked = False
+        slots = 0
         cmds = [
             [part.strip() for part in split(item) if part.strip()]
             for item in self.ffmpeg_cmds
         ]
+        kind = (
+            "encode"
+            if any(ffmpeg_job_kind(cmd) == "encode" for cmd in cmds)
+            else "copy"
+        )
         try:
             ffmpeg = FFMpeg(self)
             for ffmpeg_cmd in cmds:
@@ -717,7 +798,8 @@ class TaskConfig:
                                 self, ffmpeg, gid, "FFmpeg"
                             )
                         self.progress = False
-                        await cpu_eater_lock.acquire()
+                        slots = await CpuScheduler.acquire(self, kind)
+                        ffmpeg.threads = slots
                         self.progress = True
                     LOGGER.info(f"Running ffmpeg cmd for: {file_path}")
                     cmd[index + 1] = file_path
@@ -744,53 +826,52 @@ class TaskConfig:
                         await move(file_path, dl_path)
                         await rmtree(new_folder)
                 else:
-                    for dirpath, _, files in await sync_to_async(
-                        walk, dl_path, topdown=False
-                    ):
-                        for file_ in files:
-                            var_cmd = cmd.copy()
-                            if self.is_cancelled:
-                                return False
-                            f_path = ospath.join(dirpath, file_)
-                            is_video, is_audio, _ = await get_document_type(f_path)
-                            if not is_video and not is_audio:
-                                continue
-                            elif is_video and ext == "audio":
-                                continue
-                            elif is_audio and not is_video and ext == "video":
-                                continue
-                            elif ext not in [
-                                "all",
-                                "audio",
-                                "video",
-                            ] and not f_path.strip().lower().endswith(ext):
-                                continue
-                            self.proceed_count += 1
-                            var_cmd[index + 1] = f_path
-                            if not checked:
-                                checked = True
-                                async with task_dict_lock:
-                                    task_dict[self.mid] = FFmpegStatus(
-                                        self, ffmpeg, gid, "FFmpeg"
-                                    )
-                                self.progress = False
-                                await cpu_eater_lock.acquire()
-                                self.progress = True
-                            LOGGER.info(f"Running ffmpeg cmd for: {f_path}")
-                            self.subsize = await get_path_size(f_path)
-                            self.subname = file_
-                            res = await ffmpeg.ffmpeg_cmds(var_cmd, f_path)
-                            if res and delete_files:
-                                await remove(f_path)
-                                if len(res) == 1:
-                                    file_name = ospath.basename(res[0])
-                                    if file_name.startswith("ffmpeg"):
-                                        newname = file_name.split(".", 1)[-1]
-                                        newres = ospath.join(dirpath, newname)
-                                        await move(res[0], newres)
+                    _, files = await get_tree(dl_path)
+                    for entry in files:
+                        var_cmd = cmd.copy()
+                        if self.is_cancelled:
+                            return False
+                        f_path, dirpath, file_ = entry.path, entry.dirpath, entry.name
+                        is_video, is_audio, _ = await get_document_type(f_path)
+                        if not is_video and not is_audio:
+                            continue
+                        elif is_video and ext == "audio":
+                            continue
+                        elif is_audio and not is_video and ext == "video":
+                            continue
+                        elif ext not in [
+                            "all",
+                            "audio",
+                            "video",
+                        ] and not f_path.strip().lower().endswith(ext):
+                            continue
+                        self.proceed_count += 1
+                        var_cmd[index + 1] = f_path
+                        if not checked:
+                            checked = True
+                            async with task_dict_lock:
+                                task_dict[self.mid] = FFmpegStatus(
+                                    self, ffmpeg, gid, "FFmpeg"
+                                )
+                            self.progress = False
+                            slots = await CpuScheduler.acquire(self, kind)
+                            ffmpeg.threads = slots
+                            self.progress = True
+                        LOGGER.info(f"Running ffmpeg cmd for: {f_path}")
+                        self.subsize = entry.size
+                        self.subname = file_
+                        res = await ffmpeg.ffmpeg_cmds(var_cmd, f_path)
+                        if res and delete_files:
+                            await remove(f_path)
+                            if len(res) == 1:
+                                file_name = ospath.basename(res[0])
+                                if file_name.startswith("ffmpeg"):
+                                    newname = file_name.split(".", 1)[-1]
+                                    newres = ospath.join(dirpath, newname)
+                                    await move(res[0], newres)
         finally:
-            if checked:
-                cpu_eater_lock.release()
+            if slots:
+                CpuScheduler.release(self, slots)
         return dl_path
 
     async def substitute(self, dl_path):
@@ -825,13 +906,12 @@ class TaskConfig:
             await move(dl_path, new_path)
             return new_path
         else:
-            for dirpath, _, files in await sync_to_async(walk, dl_path, topdown=False):
-                for file_ in files:
-                    f_path = ospath.join(dirpath, file_)
-                    new_name = perform_swap(file_, self.name_swap)
-                    if not new_name:
-                        continue
-                    await move(f_path, ospath.join(dirpath, new_name))
+            _, files = await get_tree(dl_path)
+            for entry in files:
+                new_name = perform_swap(entry.name, self.name_swap)
+                if not new_name:
+                    continue
+                await move(entry.path, ospath.join(entry.dirpath, new_name))
             return dl_path
 
     async def generate_screenshots(self, dl_path):
@@ -851,11 +931,10 @@ class TaskConfig:
                     return new_folder
         else:
             LOGGER.info(f"Creating Screenshot for: {dl_path}")
-            for dirpath, _, files in await sync_to_async(walk, dl_path, topdown=False):
-                for file_ in files:
-                    f_path = ospath.join(dirpath, file_)
-                    if (await get_document_type(f_path))[0]:
-                        await take_ss(f_path, ss_nb)
+            _, files = await get_tree(dl_path)
+            for entry in files:
+                if (await get_document_type(entry.path))[0]:
+                    await take_ss(entry.path, ss_nb)
         return dl_path
 
     async def convert_media(self, dl_path, gid):
@@ -896,14 +975,13 @@ class TaskConfig:
             astatus = ""
 
         self.files_to_proceed = {}
-        all_files = []
+        sizes = {}
         if self.is_file:
-            all_files.append(dl_path)
+            all_files = [dl_path]
         else:
-            for dirpath, _, files in await sync_to_async(walk, dl_path, topdown=False):
-                for file_ in files:
-                    f_path = ospath.join(dirpath, file_)
-                    all_files.append(f_path)
+            _, files = await get_tree(dl_path)
+            all_files = [entry.path for entry in files]
+            sizes = {entry.path: entry.size for entry in files}
 
         for f_path in all_files:
             is_video, is_audio, _ = await get_document_type(f_path)
@@ -941,7 +1019,10 @@ class TaskConfig:
             async with task_dict_lock:
                 task_dict[self.mid] = FFmpegStatus(self, ffmpeg, gid, "Convert")
             self.progress = False
-            async with cpu_eater_lock:
+            kind = "encode" if "video" in self.files_to_proceed.values() else "audio"
+            slots = await CpuScheduler.acquire(self, kind)
+            ffmpeg.threads = slots
+            try:
                 self.progress = True
                 for f_path, f_type in self.files_to_proceed.items():
                     self.proceed_count += 1
@@ -949,7 +1030,9 @@ class TaskConfig:
                     if self.is_file:
                         self.subsize = self.size
                     else:
-                        self.subsize = await get_path_size(f_path)
+                        self.subsize = sizes.get(f_path) or await get_path_size(
+                            f_path
+                        )
                         self.subname = ospath.basename(f_path)
                     if f_type == "video":
                         res = await ffmpeg.convert_video(f_path, vext)
@@ -963,6 +1046,8 @@ class TaskConfig:
                             return False
                         if self.is_file:
                             return res
+            finally:
+                CpuScheduler.release(self, slots)
         return dl_path
 
     async def generate_sample_video(self, dl_path, gid):
@@ -981,17 +1066,18 @@ class TaskConfig:
             file_ = ospath.basename(dl_path)
             self.files_to_proceed[dl_path] = file_
         else:
-            for dirpath, _, files in await sync_to_async(walk, dl_path, topdown=False):
-                for file_ in files:
-                    f_path = ospath.join(dirpath, file_)
-                    if (await get_document_type(f_path))[0]:
-                        self.files_to_proceed[f_path] = file_
+            _, files = await get_tree(dl_path)
+            for entry in files:
+                if (await get_document_type(entry.path))[0]:
+                    self.files_to_proceed[entry.path] = entry.name
         if self.files_to_proceed:
             ffmpeg = FFMpeg(self)
             async with task_dict_lock:
                 task_dict[self.mid] = FFmpegStatus(self, ffmpeg, gid, "Sample Video")
             self.progress = False
-            async with cpu_eater_lock:
+            slots = await CpuScheduler.acquire(self, "encode")
+            ffmpeg.threads = slots
+            try:
                 self.progress = True
                 LOGGER.info(f"Creating Sample video: {self.name}")
                 for f_path, file_ in self.files_to_proceed.items():
@@ -1012,6 +1098,8 @@ class TaskConfig:
                             move(res, f"{new_folder}/SAMPLE.{file_}"),
                         )
                         return new_folder
+            finally:
+                CpuScheduler.release(self, slots)
         return dl_path
 
     async def proceed_compress(self, dl_path, gid):
@@ -1034,17 +1122,16 @@ class TaskConfig:
 
     async def proceed_split(self, dl_path, gid):
         self.files_to_proceed = {}
+        self.virtual_splits = {}
         if self.is_file:
             f_size = await get_path_size(dl_path)
             if f_size > self.split_size:
                 self.files_to_proceed[dl_path] = [f_size, ospath.basename(dl_path)]
         else:
-            for dirpath, _, files in await sync_to_async(walk, dl_path, topdown=False):
-                for file_ in files:
-                    f_path = ospath.join(dirpath, file_)
-                    f_size = await get_path_size(f_path)
-                    if f_size > self.split_size:
-                        self.files_to_proceed[f_path] = [f_size, file_]
+            _, files = await get_tree(dl_path)
+            for entry in files:
+                if entry.size > self.split_size:
+                    self.files_to_proceed[entry.path] = [entry.size, entry.name]
         if self.files_to_proceed:
             ffmpeg = FFMpeg(self)
             async with task_dict_lock:
@@ -1062,16 +1149,18 @@ class TaskConfig:
                     split_size = (f_size // parts) + (f_size % parts)
                 else:
                     split_size = self.split_size
-                if not self.as_doc and (await get_document_type(f_path))[0]:
+                res = False
+                is_video = not self.as_doc and (await get_document_type(f_path))[0]
+                if is_video:
                     self.progress = True
                     res = await ffmpeg.split(f_path, file_, parts, split_size)
-                else:
-                    self.progress = False
-                    res = await split_file(f_path, split_size, self)
                 if self.is_cancelled:
                     return False
-                if res or f_size >= self.max_split_size:
+                if res:
                     try:
                         await remove(f_path)
                     except Exception:
                         self.is_cancelled = True
+                elif not is_video or f_size >= self.max_split_size:
+                    # Uploaded as byte ranges of the original file
+                    self.virtual_splits[f_path] = split_size
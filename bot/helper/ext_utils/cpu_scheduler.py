@@ -0,0 +1,100 @@
+from collections import defaultdict
+from itertools import count
+
+from ... import bot_loop, cpu_no
+
+
+class CpuScheduler:
+    """Hands out CPU slots to ffmpeg jobs instead of running one at a time.
+
+    ``cpu_no`` slots are shared by all tasks. A stream-copy remux costs one
+    slot; a re-encode costs a quarter of the cores (at least two), so big
+    boxes run several encodes side by side while small ones stay serial.
+    Waiting jobs are served user by user, preferring whoever holds the
+    fewest slots, and in arrival order within a user.
+    """
+
+    total = max(cpu_no or 1, 1)
+    used = 0
+    waiting = []
+    user_slots = defaultdict(int)
+    _order = count()
+
+    @classmethod
+    def weight(cls, kind):
+        if kind == "encode":
+            return min(cls.total, max(2, cls.total // 4))
+        return 1
+
+    @classmethod
+    def _next_waiter(cls):
+        return min(
+            cls.waiting,
+            key=lambda w: (cls.user_slots[w["user_id"]], w["order"]),
+            default=None,
+        )
+
+    @classmethod
+    def _dispatch(cls):
+        while (waiter := cls._next_waiter()) is not None:
+            if cls.used + waiter["slots"] > cls.total:
+                break
+            cls.waiting.remove(waiter)
+            if waiter["future"].done():
+                continue
+            cls.used += waiter["slots"]
+            cls.user_slots[waiter["user_id"]] += waiter["slots"]
+            waiter["future"].set_result(waiter["slots"])
+
+    @classmethod
+    async def acquire(cls, listener, kind="encode"):
+        """Wait for CPU slots and return how many were granted."""
+        waiter = {
+            "mid": listener.mid,
+            "user_id": listener.user_id,
+            "slots": cls.weight(kind),
+            "order": next(cls._order),
+            "future": bot_loop.create_future(),
+        }
+        cls.waiting.append(waiter)
+        cls._dispatch()
+        try:
+            return await waiter["future"]
+        except BaseException:
+            if waiter in cls.waiting:
+                cls.waiting.remove(waiter)
+            elif waiter["future"].done() and not waiter["future"].cancelled():
+                cls.release(listener, waiter["slots"])
+            raise
+
+    @classmethod
+    def release(cls, listener, slots):
+        cls.used = max(cls.used - slots, 0)
+        cls.user_slots[listener.user_id] -= slots
+        if cls.user_slots[listener.user_id] <= 0:
+            del cls.user_slots[listener.user_id]
+        cls._dispatch()
+
+    @classmethod
+    def position(cls, mid):
+        """1-based place of ``mid`` in the dispatch order, or None if not queued."""
+        pending = list(cls.waiting)
+        slots = defaultdict(int, cls.user_slots)
+        place = 0
+        while pending:
+            waiter = min(pending, key=lambda w: (slots[w["user_id"]], w["order"]))
+            place += 1
+            if waiter["mid"] == mid:
+                return place
+            pending.remove(waiter)
+            slots[waiter["user_id"]] += waiter["slots"]
+        return None
+
+
+def ffmpeg_job_kind(cmd):
+    """Classify a user ffmpeg command as a stream copy or a re-encode."""
+    codec_opts = ("-c", "-c:v", "-codec", "-codec:v", "-vcodec")
+    if any(opt in cmd for opt in ("-vf", "-filter:v", "-filter_complex", "-lavfi")):
+        return "encode"
+    codecs = [cmd[i + 1] for i, item in enumerate(cmd[:-1]) if item in codec_opts]
+    return "copy" if codecs and all(c == "copy" for c in codecs) else "encode"
@@ -226,6 +226,23 @@ class DbManager:
         await self.db.tasks[TgClient.ID].drop()
         return notifier_dict
 
+    async def get_leech_cache(self, key):
+        if self._return:
+            return
+        return await self.db.leech_cache[TgClient.ID].find_one({"_id": key})
+
+    async def set_leech_cache(self, key, data):
+        if self._return:
+            return
+        await self.db.leech_cache[TgClient.ID].replace_one(
+            {"_id": key}, data, upsert=True
+        )
+
+    async def rm_leech_cache(self, key):
+        if self._return:
+            return
+        await self.db.leech_cache[TgClient.ID].delete_one({"_id": key})
+
     async def trunc_table(self, name):
         if self._return:
             return
@@ -1,10 +1,26 @@
 from aioshutil import rmtree as aiormtree, move
-from asyncio import create_subprocess_exec, sleep, wait_for
+from asyncio import Semaphore, create_subprocess_exec, gather, wait_for
 from asyncio.subprocess import PIPE
 from contextlib import suppress
+from io import RawIOBase, SEEK_CUR, SEEK_END, SEEK_SET
+from collections import OrderedDict
 from psutil import disk_usage
-from os import path as ospath, readlink, walk
-from re import I, escape, search as re_search, split as re_split
+from os import (
+    O_RDONLY,
+    close as os_close,
+    cpu_count,
+    open as os_open,
+    path as ospath,
+    pread,
+    readlink,
+    rename,
+    rmdir as os_rmdir,
+    scandir,
+    stat,
+)
+from re import I, escape, findall as re_findall, search as re_search, split as re_split
+from threading import Lock, local
+from typing import NamedTuple
 
 from aiofiles.os import (
     listdir,
@@ -109,6 +125,94 @@ def is_archive_split(file):
     return bool(re_search(SPLIT_REGEX, file.lower(), I))
 
 
+class TreeEntry(NamedTuple):
+    path: str
+    dirpath: str
+    name: str
+    size: int
+    is_link: bool
+    ext: str
+    mtime: float
+
+
+def scan_tree(opath):
+    """One scandir pass over ``opath``, deepest directories first.
+
+    Returns ``(dirs, files)``: every real directory below ``opath`` and a
+    ``TreeEntry`` per file. Symlinked files are sized by their target,
+    symlinked directories are skipped so callers never rmdir or descend a link.
+    """
+    dirs, files = [], []
+
+    def _scan(dirpath):
+        here = []
+        try:
+            with scandir(dirpath) as it:
+                for entry in it:
+                    try:
+                        is_link = entry.is_symlink()
+                        if entry.is_dir():
+                            if not is_link:
+                                _scan(entry.path)
+                                dirs.append(entry.path)
+                            continue
+                    except OSError:
+                        is_link = False
+                    try:
+                        st = entry.stat()
+                        size, mtime = st.st_size, st.st_mtime
+                    except OSError:
+                        size, mtime = 0, 0.0
+                    here.append(
+                        TreeEntry(
+                            entry.path,
+                            dirpath,
+                            entry.name,
+                            size,
+                            is_link,
+                            ospath.splitext(entry.name)[1].lower(),
+                            mtime,
+                        )
+                    )
+        except OSError as e:
+            LOGGER.error(f"Unable to scan {dirpath}: {e}")
+        files.extend(here)
+
+    _scan(opath)
+    return dirs, files
+
+
+def merge_tree(src, dst):
+    """Move the contents of ``src`` into ``dst`` and remove ``src``.
+
+    Directories present on both sides are merged; any other clash is renamed
+    to ``name_N.ext`` like 7z's ``-aot`` does.
+    """
+    with scandir(src) as it:
+        entries = list(it)
+    for entry in entries:
+        target = ospath.join(dst, entry.name)
+        if not ospath.lexists(target):
+            rename(entry.path, target)
+        elif (
+            entry.is_dir(follow_symlinks=False)
+            and ospath.isdir(target)
+            and not ospath.islink(target)
+        ):
+            merge_tree(entry.path, target)
+        else:
+            name, ext = ospath.splitext(entry.name)
+            index = 1
+            while ospath.lexists(ospath.join(dst, f"{name}_{index}{ext}")):
+                index += 1
+            rename(entry.path, ospath.join(dst, f"{name}_{index}{ext}"))
+    os_rmdir(src)
+
+
+async def get_tree(opath):
+    return await sync_to_async(scan_tree, opath)
+
+
 async def clean_target(opath):
     if await aiopath.exists(opath):
         LOGGER.info(f"Cleaning Target: {opath}")
@@ -140,14 +244,15 @@ async def clean_all():
 
 async def clean_unwanted(opath):
     LOGGER.info(f"Cleaning unwanted files/folders: {opath}")
-    for dirpath, _, files in await sync_to_async(walk, opath, topdown=False):
-        for filee in files:
-            f_path = ospath.join(dirpath, filee)
-            if filee.strip().endswith(".parts") and filee.startswith("."):
-                await remove(f_path)
+    dirs, files = await get_tree(opath)
+    for entry in files:
+        if entry.name.strip().endswith(".parts") and entry.name.startswith("."):
+            await remove(entry.path)
+    for dirpath in dirs + [opath]:
         if dirpath.strip().endswith(".unwanted"):
             await aiormtree(dirpath, ignore_errors=True)
-    for dirpath, _, files in await sync_to_async(walk, opath, topdown=False):
+    dirs, _ = await get_tree(opath)
+    for dirpath in dirs + [opath]:
         if not await listdir(dirpath):
             await rmdir(dirpath)
 
@@ -163,22 +268,15 @@ async def get_path_size(opath):
         if await aiopath.islink(opath):
             opath = await aioreadlink(opath)
         return await aiopath.getsize(opath)
-    for root, _, files in await sync_to_async(walk, opath):
-        for f in files:
-            abs_path = ospath.join(root, f)
-            if await aiopath.islink(abs_path):
-                abs_path = await aioreadlink(abs_path)
-            total_size += await aiopath.getsize(abs_path)
+    _, files = await get_tree(opath)
+    for entry in files:
+        total_size += entry.size
     return total_size
 
 
 async def count_files_and_folders(opath):
-    total_files = 0
-    total_folders = 0
-    for _, dirs, files in await sync_to_async(walk, opath):
-        total_files += len(files)
-        total_folders += len(dirs)
-    return total_folders, total_files
+    dirs, files = await get_tree(opath)
+    return len(dirs), len(files)
 
 
 def get_base_name(orig_path):
@@ -207,20 +305,84 @@ async def create_recursive_symlink(source, destination):
             LOGGER.error(f"Error creating shortcut for {source}: {e}")
 
 
+class MimeTypes:
+    """libmagic MIME detection with one ``Magic`` per thread, a signature
+    check for common containers and a (path, size, mtime) keyed cache."""
+
+    entries = OrderedDict()
+    max_size = 4096
+    _lock = Lock()
+    _local = local()
+
+    # extension -> (offset, magic bytes, mime type)
+    SIGNATURES = {
+        ".mkv": (0, b"\x1a\x45\xdf\xa3", "video/x-matroska"),
+        ".webm": (0, b"\x1a\x45\xdf\xa3", "video/webm"),
+        ".mp4": (4, b"ftyp", "video/mp4"),
+        ".m4v": (4, b"ftyp", "video/x-m4v"),
+        ".mov": (4, b"ftyp", "video/quicktime"),
+        ".m4a": (4, b"ftyp", "audio/x-m4a"),
+        ".avi": (8, b"AVI ", "video/x-msvideo"),
+        ".flac": (0, b"fLaC", "audio/flac"),
+        ".mp3": (0, b"ID3", "audio/mpeg"),
+        ".jpg": (0, b"\xff\xd8\xff", "image/jpeg"),
+        ".jpeg": (0, b"\xff\xd8\xff", "image/jpeg"),
+        ".png": (0, b"\x89PNG", "image/png"),
+        ".pdf": (0, b"%PDF", "application/pdf"),
+        ".zip": (0, b"PK\x03\x04", "application/zip"),
+        ".7z": (0, b"7z\xbc\xaf\x27\x1c", "application/x-7z-compressed"),
+        ".rar": (0, b"Rar!\x1a\x07", "application/x-rar"),
+    }
+
+    @classmethod
+    def _magic(cls):
+        if (mime := getattr(cls._local, "mime", None)) is None:
+            mime = cls._local.mime = Magic(mime=True)
+        return mime
+
+    @classmethod
+    def _from_signature(cls, file_path):
+        ext = ospath.splitext(file_path)[1].lower()
+        if (signature := cls.SIGNATURES.get(ext)) is None:
+            return None
+        offset, magic_bytes, mime_type = signature
+        with open(file_path, "rb") as f:
+            f.seek(offset)
+            if f.read(len(magic_bytes)) == magic_bytes:
+                return mime_type
+        return None
+
+    @classmethod
+    def get(cls, file_path):
+        if ospath.islink(file_path):
+            file_path = readlink(file_path)
+        st = stat(file_path)
+        key = (file_path, st.st_size, st.st_mtime_ns)
+        with cls._lock:
+            if (mime_type := cls.entries.get(key)) is not None:
+                cls.entries.move_to_end(key)
+                return mime_type
+        mime_type = (
+            cls._from_signature(file_path)
+            or cls._magic().from_file(file_path)
+            or "text/plain"
+        )
+        with cls._lock:
+            cls.entries[key] = mime_type
+            while len(cls.entries) > cls.max_size:
+                cls.entries.popitem(last=False)
+        return mime_type
+
+
 def get_mime_type(file_path):
-    if ospath.islink(file_path):
-        file_path = readlink(file_path)
-    mime = Magic(mime=True)
-    mime_type = mime.from_file(file_path)
-    mime_type = mime_type or "text/plain"
-    return mime_type
+    return MimeTypes.get(file_path)
 
 
 async def remove_excluded_files(fpath, ee):
-    for root, _, files in await sync_to_async(walk, fpath):
-        for f in files:
-            if f.strip().lower().endswith(tuple(ee)):
-                await remove(ospath.join(root, f))
+    _, files = await get_tree(fpath)
+    for entry in files:
+        if entry.name.strip().lower().endswith(tuple(ee)):
+            await remove(entry.path)
 
 
 async def move_and_merge(source, destination, mid):
@@ -273,91 +435,120 @@ async def join_files(opath):
                     await remove(f"{opath}/{file_}")
 
 
-async def split_file(f_path, split_size, listener):
-    out_path = f"{f_path}."
-    if listener.is_cancelled:
-        return False
-    listener.subproc = await create_subprocess_exec(
-        "split",
-        "--numeric-suffixes=1",
-        "--suffix-length=3",
-        f"--bytes={split_size}",
-        f_path,
-        out_path,
-        stderr=PIPE,
-    )
-    _, stderr = await listener.subproc.communicate()
-    code = listener.subproc.returncode
-    if listener.is_cancelled:
-        return False
-    if code == -9:
-        listener.is_cancelled = True
-        return False
-    elif code != 0:
-        try:
-            stderr = stderr.decode().strip()
-        except Exception:
-            stderr = "Unable to decode the error!"
-        LOGGER.error(f"{stderr}. Split Document: {f_path}")
-    return True
+class FileSlice(RawIOBase):
+    """Read-only file object over ``length`` bytes of ``path`` from ``offset``.
+
+    Used to upload a leech part straight from the original file with
+    positional reads, so no split copy is written to disk.
+    """
+
+    def __init__(self, path, offset, length, name=None):
+        super().__init__()
+        self._fd = os_open(path, O_RDONLY)
+        self._offset = offset
+        self._length = length
+        self._pos = 0
+        self.name = name or path
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, pos, whence=SEEK_SET):
+        if whence == SEEK_CUR:
+            pos += self._pos
+        elif whence == SEEK_END:
+            pos += self._length
+        self._pos = max(pos, 0)
+        return self._pos
+
+    def read(self, size=-1):
+        remaining = self._length - self._pos
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        if size <= 0:
+            return b""
+        data = pread(self._fd, size, self._offset + self._pos)
+        self._pos += len(data)
+        return data
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            os_close(self._fd)
+        super().close()
 
 
 class SevenZ:
     def __init__(self, listener):
         self._listener = listener
-        self._processed_bytes = 0
-        self._percentage = "0%"
+        self._jobs = {}
+        self.subprocs = set()
 
     @property
     def processed_bytes(self):
-        return self._processed_bytes
+        return sum(size * percent / 100 for size, percent in self._jobs.values())
 
     @property
     def progress(self):
-        return self._percentage
-
-    async def _sevenz_progress(self):
-        pattern = r"(\d+)\s+bytes|Total Physical Size\s*=\s*(\d+)"
-        while not (
-            self._listener.subproc.returncode is not None
-            or self._listener.is_cancelled
-            or self._listener.subproc.stdout.at_eof()
-        ):
-            try:
-                line = await wait_for(self._listener.subproc.stdout.readline(), 2)
-            except Exception:
-                break
-            line = line.decode().strip()
-            if match := re_search(pattern, line):
-                self._listener.subsize = int(match[1] or match[2])
-            await sleep(0.05)
-        s = b""
+        total = sum(size for size, _ in self._jobs.values())
+        if not total:
+            return "0%"
+        return f"{int(self.processed_bytes / total * 100)}%"
+
+    def add_job(self, key, size):
+        self._jobs[key] = [size, 0]
+        self._listener.subsize = sum(size for size, _ in self._jobs.values())
+
+    async def _sevenz_progress(self, subproc, key):
+        # 7z redraws its progress line with backspaces/carriage returns, so
+        # read in chunks and only look at the last complete percentage.
+        size_re = rb"(\d+)\s+bytes|Total Physical Size\s*=\s*(\d+)"
+        job = self._jobs[key]
+        buf = b""
         while not (
             self._listener.is_cancelled
-            or self._listener.subproc.returncode is not None
-            or self._listener.subproc.stdout.at_eof()
+            or subproc.returncode is not None
+            or subproc.stdout.at_eof()
         ):
             try:
-                char = await wait_for(self._listener.subproc.stdout.read(1), 60)
+                chunk = await wait_for(subproc.stdout.read(4096), 60)
             except Exception:
                 break
-            if not char:
+            if not chunk:
                 break
-            s += char
-            if char == b"%":
-                try:
-                    self._percentage = s.decode().rsplit(" ", 1)[-1].strip()
-                    self._processed_bytes = (
-                        int(self._percentage.strip("%")) / 100
-                    ) * self._listener.subsize
-                except Exception:
-                    self._processed_bytes = 0
-                    self._percentage = "0%"
-                s = b""
-            await sleep(0.05)
-
-        self._processed_bytes = 0
-        self._percentage = "0%"
+            *parts, buf = re_split(rb"[\r\n\x08]+", buf + chunk)
+            for part in parts:
+                if match := re_search(size_re, part):
+                    job[0] = int(match[1] or match[2])
+                    self._listener.subsize = sum(
+                        size for size, _ in self._jobs.values()
+                    )
+                elif percents := re_findall(rb"(\d+)%", part):
+                    job[1] = min(int(percents[-1]), 100)
+            buf = buf[-512:]
+
+    async def _run(self, cmd, key):
+        subproc = await create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
+        self._listener.subproc = subproc
+        self.subprocs.add(subproc)
+        try:
+            await self._sevenz_progress(subproc, key)
+            _, stderr = await subproc.communicate()
+        finally:
+            self.subprocs.discard(subproc)
+        if subproc.returncode == 0:
+            self._jobs[key][1] = 100
+        return subproc.returncode, stderr
 
     async def extract(self, f_path, t_path, pswd):
         cmd = [
@@ -376,14 +567,9 @@ class SevenZ:
             del cmd[2]
         if self._listener.is_cancelled:
             return False
-        self._listener.subproc = await create_subprocess_exec(
-            *cmd,
-            stdout=PIPE,
-            stderr=PIPE,
-        )
-        await self._sevenz_progress()
-        _, stderr = await self._listener.subproc.communicate()
-        code = self._listener.subproc.returncode
+        if f_path not in self._jobs:
+            self.add_job(f_path, await get_path_size(f_path))
+        code, stderr = await self._run(cmd, f_path)
         if self._listener.is_cancelled:
             return False
         if code == -9:
@@ -397,6 +583,52 @@ class SevenZ:
             LOGGER.error(f"{stderr}. Unable to extract archive!. Path: {f_path}")
         return code
 
+    async def extract_all(self, archives, pswd):
+        """Extract independent archives concurrently.
+
+        ``archives`` is a list of ``(f_path, t_path)``; returns their exit
+        codes in the same order. Concurrency is bounded by half the cores and
+        by how many of the largest archives fit in the free disk space.
+        Archives sharing a target are each extracted into their own staging
+        directory and merged into the target afterwards, in archive order, so
+        parallel 7z runs never write the same files.
+        """
+        sizes = [await get_path_size(f_path) for f_path, _ in archives]
+        for (f_path, _), size in zip(archives, sizes):
+            self.add_job(f_path, size)
+        free = (await sync_to_async(disk_usage, DOWNLOAD_DIR)).free
+        limit = min(
+            len(archives),
+            max((cpu_count() or 1) // 2, 1),
+            max(free // (max(sizes) or 1), 1),
+        )
+        semaphore = Semaphore(limit)
+        targets = {}
+        for _, t_path in archives:
+            target = ospath.normpath(t_path)
+            targets[target] = targets.get(target, 0) + 1
+
+        async def _extract(f_path, t_path):
+            async with semaphore:
+                if self._listener.is_cancelled:
+                    return False
+                self._listener.proceed_count += 1
+                self._listener.subname = ospath.basename(f_path)
+                return await self.extract(f_path, t_path, pswd)
+
+        jobs = []
+        for index, (f_path, t_path) in enumerate(archives):
+            if targets[ospath.normpath(t_path)] > 1:
+                t_path = ospath.join(t_path, f".extract.{index}")
+            jobs.append((f_path, t_path))
+        codes = await gather(*(_extract(f, t) for f, t in jobs))
+        if self._listener.is_cancelled:
+            return codes
+        for (_, t_path), (_, staging) in zip(archives, jobs):
+            if staging != t_path and await aiopath.isdir(staging):
+                await sync_to_async(merge_tree, staging, t_path)
+        return codes
+
     async def zip(self, dl_path, up_path, pswd):
         size = await get_path_size(dl_path)
         if self._listener.equal_splits:
@@ -427,12 +659,8 @@ class SevenZ:
             LOGGER.info(f"Zip: orig_path: {dl_path}, zip_path: {up_path}")
         if self._listener.is_cancelled:
             return False
-        self._listener.subproc = await create_subprocess_exec(
-            *cmd, stdout=PIPE, stderr=PIPE
-        )
-        await self._sevenz_progress()
-        _, stderr = await self._listener.subproc.communicate()
-        code = self._listener.subproc.returncode
+        self.add_job(up_path, size)
+        code, stderr = await self._run(cmd, up_path)
         if self._listener.is_cancelled:
             return False
         if code == -9:
@@ -1,5 +1,7 @@
 from asyncio import (
     CancelledError,
+    Lock,
+    Queue,
     create_task,
     gather,
     sleep,
@@ -7,20 +9,31 @@ from asyncio import (
     TimeoutError as AsyncTimeoutError,
     Event,
 )
+from collections import OrderedDict
 from datetime import datetime
-from math import ceil, floor
+from json import dump, load
+from math import ceil
 from mimetypes import guess_extension
-from os import path as ospath
+from os import (
+    O_CREAT,
+    O_WRONLY,
+    close as osclose,
+    ftruncate,
+    open as osopen,
+    path as ospath,
+    posix_fallocate,
+    pwrite,
+    replace,
+)
 from pathlib import Path
 from re import sub
 from sys import argv
 from time import time
 
-from aiofiles import open as aiopen
 from aiofiles.os import makedirs, remove
 from aioshutil import move
 from pyrogram import StopTransmission, raw, utils
-from pyrogram.errors import AuthBytesInvalid, FloodWait
+from pyrogram.errors import AuthBytesInvalid, FileReferenceExpired, FloodWait
 from pyrogram.file_id import PHOTO_TYPES, FileId, FileType, ThumbnailSource
 from pyrogram.session import Auth, Session
 from pyrogram.session.internals import MsgId
@@ -28,6 +41,148 @@ from pyrogram.session.internals import MsgId
 from ... import LOGGER
 from ...core.config_manager import Config
 from ...core.tg_client import TgClient
+from .bot_utils import sync_to_async
+
+
+class MediaSessionPool:
+    _lock = Lock()
+    _key_locks = {}
+    sessions = {}
+    last_used = {}
+    idle_timeout = 15 * 60
+
+    @classmethod
+    async def get(cls, client, index, dc_id):
+        key = (index, dc_id)
+        await cls._evict_idle(exclude=key)
+        async with cls._lock:
+            key_lock = cls._key_locks.setdefault(key, Lock())
+        async with key_lock:
+            entry = cls.sessions.get(key)
+            if entry is not None:
+                owner, session = entry
+                if owner is client and cls._is_healthy(session):
+                    cls.last_used[key] = time()
+                    return session
+                await cls._stop_session(key)
+            session = await cls._create(client, dc_id)
+            cls.sessions[key] = (client, session)
+            cls.last_used[key] = time()
+            return session
+
+    @staticmethod
+    def _is_healthy(session):
+        is_started = getattr(session, "is_started", None)
+        return is_started is None or is_started.is_set()
+
+    @staticmethod
+    async def _create(client, dc_id, max_retries=3):
+        retries = 0
+        while retries < max_retries:
+            try:
+                if dc_id != await client.storage.dc_id():
+                    media_session = Session(
+                        client,
+                        dc_id,
+                        await Auth(
+                            client, dc_id, await client.storage.test_mode()
+                        ).create(),
+                        await client.storage.test_mode(),
+                        is_media=True,
+                    )
+                    await media_session.start()
+
+                    for _ in range(6):
+                        exported_auth = await client.invoke(
+                            raw.functions.auth.ExportAuthorization(dc_id=dc_id)
+                        )
+
+                        try:
+                            await media_session.invoke(
+                                raw.functions.auth.ImportAuthorization(
+                                    id=exported_auth.id, bytes=exported_auth.bytes
+                                )
+                            )
+                            break
+                        except AuthBytesInvalid:
+                            await sleep(1)
+                    else:
+                        await media_session.stop()
+                        raise AuthBytesInvalid
+                else:
+                    media_session = Session(
+                        client,
+                        dc_id,
+                        await client.storage.auth_key(),
+                        await client.storage.test_mode(),
+                        is_media=True,
+                    )
+                    await media_session.start()
+
+                return media_session
+
+            except Exception:
+                retries += 1
+                await sleep(1)
+
+        raise ValueError(f"Failed to create media session after {max_retries} attempts")
+
+    @classmethod
+    async def _stop_session(cls, key):
+        cls.last_used.pop(key, None)
+        if entry := cls.sessions.pop(key, None):
+            try:
+                await entry[1].stop()
+            except Exception as e:
+                LOGGER.warning(f"HyperDL: Error stopping media session {key}: {e}")
+
+    @classmethod
+    async def _evict_idle(cls, exclude=None):
+        now = time()
+        for key, last in list(cls.last_used.items()):
+            if key == exclude or now - last < cls.idle_timeout:
+                continue
+            key_lock = cls._key_locks.get(key)
+            if key_lock is None or key_lock.locked():
+                continue
+            async with key_lock:
+                if now - cls.last_used.get(key, now) >= cls.idle_timeout:
+                    await cls._stop_session(key)
+
+    @classmethod
+    async def stop_all(cls):
+        async with cls._lock:
+            for key in list(cls.sessions):
+                await cls._stop_session(key)
+            cls._key_locks.clear()
+
+
+class FileRefCache:
+    entries = OrderedDict()
+    max_size = 256
+    ttl = 45 * 60
+
+    @classmethod
+    def get(cls, key):
+        if (entry := cls.entries.get(key)) is None:
+            return None
+        file_ref, stored = entry
+        if time() - stored > cls.ttl:
+            del cls.entries[key]
+            return None
+        cls.entries.move_to_end(key)
+        return file_ref
+
+    @classmethod
+    def put(cls, key, file_ref):
+        cls.entries[key] = (file_ref, time())
+        cls.entries.move_to_end(key)
+        while len(cls.entries) > cls.max_size:
+            cls.entries.popitem(last=False)
+
+    @classmethod
+    def invalidate(cls, key):
+        cls.entries.pop(key, None)
 
 
 class HyperTGDownload:
@@ -39,16 +194,20 @@ class HyperTGDownload:
         self.download_dir = "downloads/"
         self.directory = None
         self.num_parts = Config.HYPER_THREADS or max(8, len(self.clients))
-        self.cache_file_ref = {}
-        self.cache_last_access = {}
-        self.cache_max_size = 100
         self._processed_bytes = 0
         self.file_size = 0
         self.chunk_size = 1024 * 1024
         self.file_name = ""
         self._cancel_event = Event()
-        self.session_pool = {}
-        create_task(self._clean_cache())
+        self._fd = None
+        self._media_id = 0
+        self._temp_path = ""
+        self._manifest_path = ""
+        self._manifest_saved = 0
+        self._done_ranges = []
+        self._parked_until = {}
+        self._chunk_retries = {}
+        self._in_flight = 0
 
     @staticmethod
     async def get_media_type(message):
@@ -68,15 +227,6 @@ class HyperTGDownload:
                 return media
         raise ValueError("This message doesn't contain any downloadable media")
 
-    def _update_cache(self, index, file_ref):
-        self.cache_file_ref[index] = file_ref
-        self.cache_last_access[index] = time()
-
-        if len(self.cache_file_ref) > self.cache_max_size:
-            oldest = sorted(self.cache_last_access.items(), key=lambda x: x[1])[0][0]
-            del self.cache_file_ref[oldest]
-            del self.cache_last_access[oldest]
-
     async def get_specific_file_ref(self, mid, client, max_retries=3):
         retries = 0
         last_error = None
@@ -100,85 +250,14 @@ class HyperTGDownload:
         )
 
     async def get_file_id(self, client, index) -> FileId:
-        if index not in self.cache_file_ref:
+        key = (self.dump_chat, self.message.id, index)
+        if (file_ref := FileRefCache.get(key)) is None:
             file_ref = await self.get_specific_file_ref(self.message.id, client)
-            self._update_cache(index, file_ref)
-        else:
-            self.cache_last_access[index] = time()
-        return self.cache_file_ref[index]
-
-    async def _clean_cache(self):
-        while True:
-            await sleep(15 * 60)
-            current_time = time()
-            expired_keys = [
-                k
-                for k, v in self.cache_last_access.items()
-                if current_time - v > 45 * 60
-            ]
-
-            for key in expired_keys:
-                if key in self.cache_file_ref:
-                    del self.cache_file_ref[key]
-                if key in self.cache_last_access:
-                    del self.cache_last_access[key]
-
-    async def generate_media_session(self, client, file_id, index, max_retries=3):
-        session_key = (index, file_id.dc_id)
-
-        if session_key in self.session_pool:
-            return self.session_pool[session_key]
-
-        retries = 0
-        while retries < max_retries:
-            try:
-                if file_id.dc_id != await client.storage.dc_id():
-                    media_session = Session(
-                        client,
-                        file_id.dc_id,
-                        await Auth(
-                            client, file_id.dc_id, await client.storage.test_mode()
-                        ).create(),
-                        await client.storage.test_mode(),
-                        is_media=True,
-                    )
-                    await media_session.start()
-
-                    for _ in range(6):
-                        exported_auth = await client.invoke(
-                            raw.functions.auth.ExportAuthorization(dc_id=file_id.dc_id)
-                        )
-
-                        try:
-                            await media_session.invoke(
-                                raw.functions.auth.ImportAuthorization(
-                                    id=exported_auth.id, bytes=exported_auth.bytes
-                                )
-                            )
-                            break
-                        except AuthBytesInvalid:
-                            await sleep(1)
-                    else:
-                        await media_session.stop()
-                        raise AuthBytesInvalid
-                else:
-                    media_session = Session(
-                        client,
-                        file_id.dc_id,
-                        await client.storage.auth_key(),
-                        await client.storage.test_mode(),
-                        is_media=True,
-                    )
-                    await media_session.start()
-
-                self.session_pool[session_key] = media_session
-                return media_session
-
-            except Exception:
-                retries += 1
-                await sleep(1)
+            FileRefCache.put(key, file_ref)
+        return file_ref
 
-        raise ValueError(f"Failed to create media session after {max_retries} attempts")
+    async def generate_media_session(self, client, file_id, index):
+        return await MediaSessionPool.get(client, index, file_id.dc_id)
 
     @staticmethod
     async def get_location(file_id: FileId):
@@ -219,93 +298,87 @@ class HyperTGDownload:
                 thumb_size=file_id.thumbnail_size,
             )
 
-    async def get_file(
-        self,
-        offset_bytes: int,
-        first_part_cut: int,
-        last_part_cut: int,
-        part_count: int,
-        max_retries=5,
-    ):
-        index = min(self.work_loads, key=self.work_loads.get)
-        client = self.clients[index]
-
-        self.work_loads[index] += 1
-        current_retry = 0
-
-        try:
-            while current_retry < max_retries:
-                try:
-                    if self._cancel_event.is_set():
-                        raise CancelledError("Download cancelled")
-
-                    file_id = await self.get_file_id(client, index)
-                    media_session, location = await gather(
-                        self.generate_media_session(client, file_id, index),
-                        self.get_location(file_id),
-                    )
-
-                    current_part = 1
-                    current_offset = offset_bytes
-
-                    while current_part <= part_count:
-                        if self._cancel_event.is_set():
-                            raise CancelledError("Download cancelled")
-
-                        try:
-                            r = await wait_for(
-                                media_session.invoke(
-                                    raw.functions.upload.GetFile(
-                                        location=location,
-                                        offset=current_offset,
-                                        limit=self.chunk_size,
-                                    ),
-                                ),
-                                timeout=30,
-                            )
-
-                            if isinstance(r, raw.types.upload.File):
-                                chunk = r.bytes
-
-                                if not chunk:
-                                    break
-
-                                if part_count == 1:
-                                    yield chunk[first_part_cut:last_part_cut]
-                                elif current_part == 1:
-                                    yield chunk[first_part_cut:]
-                                elif current_part == part_count:
-                                    yield chunk[:last_part_cut]
-                                else:
-                                    yield chunk
-
-                                current_part += 1
-                                current_offset += self.chunk_size
-                                self._processed_bytes += len(chunk)
-                            else:
-                                raise ValueError(f"Unexpected response: {r}")
-
-                        except (FloodWait, AsyncTimeoutError, ConnectionError) as e:
-                            if isinstance(e, FloodWait):
-                                await sleep(e.value + 1)
-                            else:
-                                await sleep(1)
-                            continue
-
-                    if current_part <= part_count:
-                        raise ValueError(
-                            f"Incomplete download: got {current_part-1} of {part_count} parts"
-                        )
-                    break
-
-                except (AsyncTimeoutError, ConnectionError, AttributeError):
-                    current_retry += 1
-                    if current_retry >= max_retries:
-                        raise
-                    await sleep(current_retry * 2)
+    async def _fetch_chunk(self, media_session, location, chunk_index):
+        r = await wait_for(
+            media_session.invoke(
+                raw.functions.upload.GetFile(
+                    location=location,
+                    offset=chunk_index * self.chunk_size,
+                    limit=self.chunk_size,
+                ),
+            ),
+            timeout=30,
+        )
+        if not isinstance(r, raw.types.upload.File):
+            raise ValueError(f"Unexpected response: {r}")
+        expected = min(
+            self.chunk_size, self.file_size - chunk_index * self.chunk_size
+        )
+        if len(r.bytes) < expected:
+            raise ConnectionError(
+                f"Short read on chunk {chunk_index}: {len(r.bytes)}/{expected}"
+            )
+        return r.bytes[:expected]
 
-        finally:
-            self.work_loads[index] -= 1
+    async def _chunk_worker(self, index, queue, max_retries=5):
+        client = self.clients[index]
+        while True:
+            if self._cancel_event.is_set():
+                raise CancelledError("Download cancelled")
+            if (wait := self._parked_until.get(index, 0) - time()) > 0:
+                await sleep(wait)
+                continue
+            if queue.empty():
+                if not self._in_flight:
+                    return
+                await sleep(0.5)
+                continue
+            chunk_index = queue.get_nowait()
+
+            self._in_flight += 1
+            self.work_loads[index] += 1
+            try:
+                file_id = await self.get_file_id(client, index)
+                media_session, location = await gather(
+                    self.generate_media_session(client, file_id, index),
+                    self.get_location(file_id),
+                )
+                chunk = await self._fetch_chunk(media_session, location, chunk_index)
+            except FloodWait as e:
+                queue.put_nowait(chunk_index)
+                self._parked_until[index] = time() + e.value + 1
+                LOGGER.warning(
+                    f"HyperDL: Helper @{client.me.username} parked for {e.value}s (FloodWait)"
+                )
+                continue
+            except (
+                AsyncTimeoutError,
+                ConnectionError,
+                AttributeError,
+                FileReferenceExpired,
+            ) as e:
+                queue.put_nowait(chunk_index)
+                if isinstance(e, FileReferenceExpired):
+                    FileRefCache.invalidate((self.dump_chat, self.message.id, index))
+                retries = self._chunk_retries.get(chunk_index, 0) + 1
+                self._chunk_retries[chunk_index] = retries
+                if retries >= max_retries:
+                    raise ValueError(
+                        f"Chunk {chunk_index} failed after {retries} attempts: {e}"
+                    ) from e
+                self._parked_until[index] = time() + retries * 2
+                continue
+            finally:
+                self.work_loads[index] -= 1
+                self._in_flight -= 1
+
+            if self._cancel_event.is_set():
+                raise CancelledError("Download cancelled")
+            position = chunk_index * self.chunk_size
+            await sync_to_async(pwrite, self._fd, chunk, position)
+            self._mark_done(position, position + len(chunk))
+            self._processed_bytes += len(chunk)
+            await self._save_manifest()
 
     async def progress_callback(self, progress, progress_args):
         if not progress:
@@ -323,35 +396,76 @@ class HyperTGDownload:
             except Exception:
                 await sleep(1)
 
-    async def single_part(self, start, end, part_index, max_retries=3):
-        until_bytes, from_bytes = min(end, self.file_size - 1), start
-
-        offset = from_bytes - (from_bytes % self.chunk_size)
-        first_part_cut = from_bytes - offset
-        last_part_cut = until_bytes % self.chunk_size + 1
+    def _mark_done(self, start, end):
+        ranges = []
+        for r_start, r_end in self._done_ranges:
+            if r_end < start or r_start > end:
+                ranges.append((r_start, r_end))
+            else:
+                start, end = min(start, r_start), max(end, r_end)
+        ranges.append((start, end))
+        self._done_ranges = sorted(ranges)
+
+    def _missing_ranges(self, start, end):
+        missing = []
+        for r_start, r_end in self._done_ranges:
+            if r_end <= start or r_start >= end:
+                continue
+            if r_start > start:
+                missing.append((start, r_start))
+            start = max(start, r_end)
+        if start < end:
+            missing.append((start, end))
+        return missing
+
+    def _load_manifest(self):
+        try:
+            with open(self._manifest_path) as f:
+                data = load(f)
+        except (OSError, ValueError):
+            return []
+        if (
+            data.get("media_id") != self._media_id
+            or data.get("file_size") != self.file_size
+        ):
+            return []
+        return [(int(r[0]), int(r[1])) for r in data.get("ranges", [])]
+
+    def _write_manifest(self, ranges):
+        tmp_path = f"{self._manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            dump(
+                {
+                    "media_id": self._media_id,
+                    "file_size": self.file_size,
+                    "ranges": ranges,
+                },
+                f,
+            )
+        replace(tmp_path, self._manifest_path)
 
-        part_count = ceil(until_bytes / self.chunk_size) - floor(
-            offset / self.chunk_size
-        )
-        part_file_path = ospath.join(
-            self.directory, f"{self.file_name}.temp.{part_index:02d}"
-        )
+    async def _save_manifest(self, force=False):
+        if not force and time() - self._manifest_saved < 5:
+            return
+        self._manifest_saved = time()
+        try:
+            await sync_to_async(self._write_manifest, list(self._done_ranges))
+        except OSError as e:
+            LOGGER.warning(f"HyperDL: Unable to save resume manifest: {e}")
 
-        for attempt in range(max_retries):
-            try:
-                async with aiopen(part_file_path, "wb") as f:
-                    async for chunk in self.get_file(
-                        offset, first_part_cut, last_part_cut, part_count
-                    ):
-                        if self._cancel_event.is_set():
-                            raise CancelledError("Download cancelled")
-                        await f.write(chunk)
-                return part_index, part_file_path
-            except (AsyncTimeoutError, ConnectionError):
-                if attempt == max_retries - 1:
-                    raise
-                await sleep((attempt + 1) * 2)
-                self._processed_bytes = 0
+    def _allocate_file(self, file_path):
+        if ospath.exists(file_path) and ospath.getsize(file_path) == self.file_size:
+            self._done_ranges = self._load_manifest()
+        else:
+            self._done_ranges = []
+        fd = osopen(file_path, O_CREAT | O_WRONLY, 0o644)
+        if not self._done_ranges:
+            ftruncate(fd, 0)
+        try:
+            posix_fallocate(fd, 0, self.file_size)
+        except OSError:
+            ftruncate(fd, self.file_size)
+        return fd
 
     async def handle_download(self, progress, progress_args):
         self._cancel_event.clear()
@@ -364,59 +478,60 @@ class HyperTGDownload:
             + ".temp"
         )
 
-        num_parts = min(self.num_parts, max(1, self.file_size // (10 * 1024 * 1024)))
-
-        if self.file_size < 10 * 1024 * 1024:
-            num_parts = 1
-
-        part_size = self.file_size // num_parts if num_parts > 0 else self.file_size
-        ranges = [
-            (i * part_size, min((i + 1) * part_size - 1, self.file_size - 1))
-            for i in range(num_parts)
-        ]
+        # the manifest sits next to the partial file in the task dir: it only
+        # carries over re-entries within the same task, restarts wipe it
+        self._temp_path = temp_file_path
+        self._manifest_path = f"{temp_file_path}.parts"
 
         tasks = []
         prog_task = None
+        completed = False
+        cancelled = False
 
         try:
-            for i, (start, end) in enumerate(ranges):
-                tasks.append(create_task(self.single_part(start, end, i)))
+            self._fd = await sync_to_async(self._allocate_file, temp_file_path)
+            self._processed_bytes = sum(end - start for start, end in self._done_ranges)
+            if self._processed_bytes:
+                LOGGER.info(
+                    f"HyperDL: Resuming {self.file_name} from {self._processed_bytes} bytes"
+                )
+
+            queue = Queue()
+            total_chunks = ceil(self.file_size / self.chunk_size)
+            for chunk_index in range(total_chunks):
+                start = chunk_index * self.chunk_size
+                end = min(start + self.chunk_size, self.file_size)
+                if self._missing_ranges(start, end):
+                    queue.put_nowait(chunk_index)
+
+            per_helper = max(1, ceil(self.num_parts / len(self.clients)))
+            per_helper = min(per_helper, max(1, queue.qsize()))
+            for index in list(self.clients):
+                for _ in range(per_helper):
+                    tasks.append(create_task(self._chunk_worker(index, queue)))
 
             if progress:
                 prog_task = create_task(self.progress_callback(progress, progress_args))
 
-            results = await gather(*tasks)
+            await gather(*tasks)
 
-            async with aiopen(temp_file_path, "wb") as temp_file:
-                for _, part_file_path in sorted(results, key=lambda x: x[0]):
-                    try:
-                        async with aiopen(part_file_path, "rb") as part_file:
-                            while True:
-                                chunk = await part_file.read(8 * 1024 * 1024)
-                                if not chunk:
-                                    break
-                                await temp_file.write(chunk)
-                        await remove(part_file_path)
-                    except Exception as e:
-                        LOGGER.error(
-                            f"Error processing part file {part_file_path}: {e}"
-                        )
-                        raise
+            if missing := self._missing_ranges(0, self.file_size):
+                raise ValueError(f"Incomplete download, missing ranges: {missing}")
 
             if prog_task and not prog_task.done():
                 prog_task.cancel()
 
+            await sync_to_async(osclose, self._fd)
+            self._fd = None
+
             file_path = ospath.splitext(temp_file_path)[0]
             await move(temp_file_path, file_path)
+            completed = True
 
             return file_path
 
-        except FloodWait as fw:
-            raise fw
         except (CancelledError, StopTransmission):
-            return None
-        except Exception as e:
-            LOGGER.error(f"HyperDL Error: {e}")
+            cancelled = True
             return None
         finally:
             self._cancel_event.set()
@@ -427,15 +542,32 @@ class HyperTGDownload:
                 if not task.done():
                     task.cancel()
 
-            for i in range(len(ranges)):
-                part_path = ospath.join(
-                    self.directory, f"{self.file_name}.temp.{i:02d}"
-                )
+            if self._fd is not None:
                 try:
-                    if ospath.exists(part_path):
-                        await remove(part_path)
-                except Exception:
+                    osclose(self._fd)
+                except OSError:
                     pass
+                self._fd = None
+
+            if completed or cancelled:
+                for path in (temp_file_path, self._manifest_path):
+                    try:
+                        if ospath.exists(path):
+                            await remove(path)
+                    except Exception:
+                        pass
+            elif self._done_ranges:
+                await self._save_manifest(True)
+
+    async def discard_partial(self):
+        if not self._temp_path:
+            return
+        for path in (self._temp_path, self._manifest_path):
+            try:
+                if ospath.exists(path):
+                    await remove(path)
+            except Exception:
+                pass
 
     @staticmethod
     async def get_extension(file_type, mime_type):
@@ -485,6 +617,7 @@ class HyperTGDownload:
             file_id_obj = FileId.decode(file_id_str)
 
             file_type = file_id_obj.file_type
+            self._media_id = getattr(file_id_obj, "media_id", 0)
             media_file_name = getattr(media, "file_name", "")
             self.file_size = getattr(media, "file_size", 0)
             mime_type = getattr(media, "mime_type", "image/jpeg")
@@ -0,0 +1,70 @@
+from collections import OrderedDict
+from os import path as ospath
+
+from ... import LOGGER
+from ...core.config_manager import Config
+from .bot_utils import sync_to_async
+from .db_handler import database
+from .media_utils import get_sample_hash
+
+
+class LeechCache:
+    """Maps leeched file content to the Telegram message that already holds it.
+
+    Entries live in the ``leech_cache`` collection when a database is
+    configured and in a bounded in-memory map otherwise. Only messages sent
+    to group or channel chats are recorded, so the bot can copy them later;
+    ``client`` names the session that sent it, since a file_id only works for
+    the client that received it.
+    """
+
+    entries = OrderedDict()
+    max_size = 2048
+
+    @staticmethod
+    def enabled():
+        return Config.LEECH_CACHE
+
+    @staticmethod
+    async def key(up_path, as_doc):
+        fingerprint = await sync_to_async(get_sample_hash, up_path)
+        mode = "doc" if as_doc else "media"
+        return f"{fingerprint}:{mode}:{ospath.basename(up_path)}"
+
+    @classmethod
+    async def get(cls, key):
+        if database.db is not None:
+            return await database.get_leech_cache(key)
+        if (entry := cls.entries.get(key)) is not None:
+            cls.entries.move_to_end(key)
+        return entry
+
+    @classmethod
+    async def put(cls, key, sent_msg, client="bot"):
+        media = sent_msg.document or sent_msg.video or sent_msg.audio or sent_msg.photo
+        if media is None or sent_msg.chat.type.name == "PRIVATE":
+            return
+        data = {
+            "chat_id": sent_msg.chat.id,
+            "message_id": sent_msg.id,
+            "file_id": media.file_id,
+            "client": client,
+        }
+        try:
+            if database.db is not None:
+                await database.set_leech_cache(key, data)
+                return
+        except Exception as e:
+            LOGGER.error(f"Failed to save leech cache entry: {e}")
+            return
+        cls.entries[key] = data
+        cls.entries.move_to_end(key)
+        while len(cls.entries) > cls.max_size:
+            cls.entries.popitem(last=False)
+
+    @classmethod
+    async def remove(cls, key):
+        if database.db is not None:
+            await database.rm_leech_cache(key)
+        else:
+            cls.entries.pop(key, None)
@@ -1,35 +1,54 @@
 from contextlib import suppress
 from PIL import Image
 from hashlib import md5
-from aiofiles.os import remove, path as aiopath, makedirs
+from aiofiles.os import remove, path as aiopath, makedirs, stat as aiostat
 from asyncio import (
     create_subprocess_exec,
     gather,
     wait_for,
     sleep,
 )
-from asyncio.subprocess import PIPE
+from asyncio.subprocess import DEVNULL, PIPE
+from collections import OrderedDict
+from json import loads
 from os import path as ospath
 from re import search as re_search, escape
 from time import time
+from typing import NamedTuple
 from aioshutil import rmtree
 from langcodes import Language
 
-from ... import LOGGER, cpu_no, DOWNLOAD_DIR
+from ... import LOGGER, bot_loop, cpu_no, DOWNLOAD_DIR
 from ...core.config_manager import BinConfig
 from .bot_utils import cmd_exec, sync_to_async
-from .files_utils import get_mime_type, is_archive, is_archive_split
+from .files_utils import FileSlice, get_mime_type, is_archive, is_archive_split
 from .status_utils import time_to_seconds
 
 
-def get_md5_hash(up_path):
+def get_md5_hash(up_path, offset=0, length=None):
     md5_hash = md5()
-    with open(up_path, "rb") as f:
+    with (
+        open(up_path, "rb") if length is None else FileSlice(up_path, offset, length)
+    ) as f:
         for byte_block in iter(lambda: f.read(4096), b""):
             md5_hash.update(byte_block)
         return md5_hash.hexdigest()
 
 
+def get_sample_hash(up_path, samples=16, sample_size=1048576):
+    """Size-prefixed md5 over evenly spaced samples; small files hash in full."""
+    size = ospath.getsize(up_path)
+    if size <= samples * sample_size:
+        return f"{size}-{get_md5_hash(up_path)}"
+    md5_hash = md5()
+    with open(up_path, "rb") as f:
+        for index in range(samples):
+            # spread exactly so the last sample ends at the last byte
+            f.seek(index * (size - sample_size) // (samples - 1))
+            md5_hash.update(f.read(sample_size))
+    return f"{size}-{md5_hash.hexdigest()}"
+
+
 async def create_thumb(msg, _id=""):
     if not _id:
         _id = time()
@@ -44,9 +63,56 @@ async def create_thumb(msg, _id=""):
     return output
 
 
-async def get_media_info(path, extra_info=False):
-    try:
-        result = await cmd_exec(
+class MediaInfo(NamedTuple):
+    ok: bool
+    duration: int = 0
+    has_video: bool = False
+    has_audio: bool = False
+    height: int = 0
+    languages: str = ""
+    subtitles: str = ""
+    artist: str | None = None
+    title: str | None = None
+
+
+class MediaProbe:
+    """Runs ffprobe once per (path, size, mtime) and keeps the parsed result."""
+
+    entries = OrderedDict()
+    max_size = 512
+    _pending = {}
+
+    @classmethod
+    async def get(cls, path):
+        try:
+            st = await aiostat(path)
+        except Exception as e:
+            LOGGER.error(f"Media Probe: {e}. Mostly File not found! - File: {path}")
+            return MediaInfo(False)
+        key = (path, st.st_size, st.st_mtime_ns)
+        if (info := cls.entries.get(key)) is not None:
+            cls.entries.move_to_end(key)
+            return info
+        if (pending := cls._pending.get(key)) is not None:
+            return await pending
+        cls._pending[key] = future = bot_loop.create_future()
+        info = MediaInfo(False)
+        try:
+            info = await cls._probe(path)
+        except Exception as e:
+            LOGGER.error(f"Media Probe: {e}. File: {path}")
+        finally:
+            del cls._pending[key]
+            future.set_result(info)
+        if info.ok:
+            cls.entries[key] = info
+            while len(cls.entries) > cls.max_size:
+                cls.entries.popitem(last=False)
+        return info
+
+    @staticmethod
+    async def _probe(path):
+        stdout, stderr, code = await cmd_exec(
             [
                 "ffprobe",
                 "-hide_banner",
@@ -59,44 +125,63 @@ async def get_media_info(path, extra_info=False):
                 path,
             ]
         )
-    except Exception as e:
-        LOGGER.error(f"Get Media Info: {e}. Mostly File not found! - File: {path}")
-        return (0, "", "", "") if extra_info else (0, None, None)
-    if result[0] and result[2] == 0:
-        ffresult = eval(result[0])
-        fields = ffresult.get("format")
+        if code != 0 or not stdout:
+            LOGGER.error(f"Media Probe: {stderr} - File: {path}")
+            return MediaInfo(False)
+        result = loads(stdout)
+        fields = result.get("format")
+        streams = result.get("streams") or []
         if fields is None:
-            LOGGER.error(f"get_media_info: {result}")
-            return (0, "", "", "") if extra_info else (0, None, None)
-        duration = round(float(fields.get("duration", 0)))
-        if extra_info:
-            lang, qual, stitles = "", "", ""
-            if (streams := ffresult.get("streams")) and streams[0].get(
-                "codec_type"
-            ) == "video":
-                qual = int(streams[0].get("height"))
-                qual = f"{480 if qual <= 480 else 540 if qual <= 540 else 720 if qual <= 720 else 1080 if qual <= 1080 else 2160 if qual <= 2160 else 4320 if qual <= 4320 else 8640}p"
-                for stream in streams:
-                    if stream.get("codec_type") == "audio" and (
-                        lc := stream.get("tags", {}).get("language")
-                    ):
-                        with suppress(Exception):
-                            lc = Language.get(lc).display_name()
-                        if lc not in lang:
-                            lang += f"{lc}, "
-                    if stream.get("codec_type") == "subtitle" and (
-                        st := stream.get("tags", {}).get("language")
-                    ):
-                        with suppress(Exception):
-                            st = Language.get(st).display_name()
-                        if st not in stitles:
-                            stitles += f"{st}, "
-            return duration, qual, lang[:-2], stitles[:-2]
+            LOGGER.error(f"Media Probe: no format section - File: {path}")
+            return MediaInfo(False)
+        has_video = has_audio = False
+        lang, stitles = "", ""
+        for stream in streams:
+            if stream.get("codec_type") == "video":
+                if stream.get("codec_name", "").lower() not in {"mjpeg", "png", "bmp"}:
+                    has_video = True
+            elif stream.get("codec_type") == "audio":
+                has_audio = True
+                if lc := stream.get("tags", {}).get("language"):
+                    with suppress(Exception):
+                        lc = Language.get(lc).display_name()
+                    if lc not in lang:
+                        lang += f"{lc}, "
+            elif stream.get("codec_type") == "subtitle" and (
+                st := stream.get("tags", {}).get("language")
+            ):
+                with suppress(Exception):
+                    st = Language.get(st).display_name()
+                if st not in stitles:
+                    stitles += f"{st}, "
+        height = 0
+        if streams and streams[0].get("codec_type") == "video":
+            with suppress(Exception):
+                height = int(streams[0].get("height"))
         tags = fields.get("tags", {})
-        artist = tags.get("artist") or tags.get("ARTIST") or tags.get("Artist")
-        title = tags.get("title") or tags.get("TITLE") or tags.get("Title")
-        return duration, artist, title
-    return (0, "", "", "") if extra_info else (0, None, None)
+        return MediaInfo(
+            ok=True,
+            duration=round(float(fields.get("duration", 0))),
+            has_video=has_video,
+            has_audio=has_audio,
+            height=height,
+            languages=lang[:-2],
+            subtitles=stitles[:-2],
+            artist=tags.get("artist") or tags.get("ARTIST") or tags.get("Artist"),
+            title=tags.get("title") or tags.get("TITLE") or tags.get("Title"),
+        )
+
+
+async def get_media_info(path, extra_info=False):
+    info = await MediaProbe.get(path)
+    if not info.ok:
+        return (0, "", "", "") if extra_info else (0, None, None)
+    if extra_info:
+        if not (qual := info.height):
+            return info.duration, "", "", ""
+        qual = f"{480 if qual <= 480 else 540 if qual <= 540 else 720 if qual <= 720 else 1080 if qual <= 1080 else 2160 if qual <= 2160 else 4320 if qual <= 4320 else 8640}p"
+        return info.duration, qual, info.languages, info.subtitles
+    return info.duration, info.artist, info.title
 
 
 async def get_document_type(path):
@@ -110,44 +195,12 @@ async def get_document_type(path):
     mime_type = await sync_to_async(get_mime_type, path)
     if mime_type.startswith("image"):
         return False, False, True
-    try:
-        result = await cmd_exec(
-            [
-                "ffprobe",
-                "-hide_banner",
-                "-loglevel",
-                "error",
-                "-print_format",
-                "json",
-                "-show_streams",
-                path,
-            ]
-        )
-        if result[1] and mime_type.startswith("video"):
-            is_video = True
-    except Exception as e:
-        LOGGER.error(f"Get Document Type: {e}. Mostly File not found! - File: {path}")
+    info = await MediaProbe.get(path)
+    if not info.ok:
         if mime_type.startswith("audio"):
             return False, True, False
-        if not mime_type.startswith("video") and not mime_type.endswith("octet-stream"):
-            return is_video, is_audio, is_image
-        if mime_type.startswith("video"):
-            is_video = True
-        return is_video, is_audio, is_image
-    if result[0] and result[2] == 0:
-        fields = eval(result[0]).get("streams")
-        if fields is None:
-            LOGGER.error(f"get_document_type: {result}")
-            return is_video, is_audio, is_image
-        is_video = False
-        for stream in fields:
-            if stream.get("codec_type") == "video":
-                codec_name = stream.get("codec_name", "").lower()
-                if codec_name not in {"mjpeg", "png", "bmp"}:
-                    is_video = True
-            elif stream.get("codec_type") == "audio":
-                is_audio = True
-    return is_video, is_audio, is_image
+        return mime_type.startswith("video"), False, False
+    return info.has_video, info.has_audio, is_image
 
 
 async def take_ss(video_file, ss_nb) -> bool:
@@ -339,6 +392,7 @@ class FFMpeg:
         self._eta_raw = 0
         self._time_rate = 0.1
         self._start_time = 0
+        self.threads = max(1, cpu_no // 2)
 
     @property
     def processed_bytes(self):
@@ -434,6 +488,9 @@ class FFMpeg:
             output = f"{dir}/{prefix}{output_file.replace('mltb', base_name)}{ext}"
             outputs.append(output)
             ffmpeg[index] = output
+        if "-threads" not in ffmpeg:
+            for index in reversed(indices):
+                ffmpeg[index:index] = ["-threads", f"{self.threads}"]
         if self._listener.is_cancelled:
             return False
         self._listener.subproc = await create_subprocess_exec(
@@ -484,7 +541,7 @@ class FFMpeg:
                 "-c:a",
                 "aac",
                 "-threads",
-                f"{max(1, cpu_no // 2)}",
+                f"{self.threads}",
                 output,
             ]
             if ext == "mp4":
@@ -508,7 +565,7 @@ class FFMpeg:
                 "-c",
                 "copy",
                 "-threads",
-                f"{max(1, cpu_no // 2)}",
+                f"{self.threads}",
                 output,
             ]
         if self._listener.is_cancelled:
@@ -555,7 +612,7 @@ class FFMpeg:
             "-i",
             audio_file,
             "-threads",
-            f"{max(1, cpu_no // 2)}",
+            f"{self.threads}",
             output,
         ]
         if self._listener.is_cancelled:
@@ -635,7 +692,7 @@ class FFMpeg:
             "-c:a",
             "aac",
             "-threads",
-            f"{max(1, cpu_no // 2)}",
+            f"{self.threads}",
             output_file,
         ]
 
@@ -666,7 +723,160 @@ class FFMpeg:
                 await remove(output_file)
             return False
 
+    async def _keyframe_index(self, f_path):
+        """Return ``(start_time, [(pts_time, pos), ...])`` for the video keyframes."""
+        cmd = [
+            "ffprobe",
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "packet=pts_time,pos,flags:format=start_time",
+            "-of",
+            "compact",
+            f_path,
+        ]
+        self._listener.subproc = await create_subprocess_exec(
+            *cmd, stdout=PIPE, stderr=DEVNULL
+        )
+        start_time = 0.0
+        keyframes = []
+        async for line in self._listener.subproc.stdout:
+            section, _, fields = line.decode().strip().partition("|")
+            values = dict(
+                field.split("=", 1) for field in fields.split("|") if "=" in field
+            )
+            if section == "packet":
+                if "K" not in values.get("flags", ""):
+                    continue
+                with suppress(ValueError):
+                    keyframes.append((float(values["pts_time"]), int(values["pos"])))
+            elif section == "format":
+                # ffmpeg only rebases outputs for a positive start time; a
+                # negative one (audio priming) leaves packet times as probed.
+                with suppress(ValueError):
+                    start_time = max(float(values.get("start_time", 0)), 0)
+        await self._listener.subproc.wait()
+        if self._listener.subproc.returncode != 0:
+            return start_time, []
+        keyframes.sort(key=lambda k: k[1])
+        return start_time, keyframes
+
+    @staticmethod
+    def _plan_cuts(keyframes, start_time, file_size, split_size):
+        """Pick keyframes so every part stays under ``split_size`` bytes.
+
+        The segment muxer cuts at the first keyframe at or after each time, so
+        aim halfway between the chosen keyframe and the one before it; small
+        timestamp offsets between probe and muxer then still land on it.
+        """
+        cuts = []
+        part_start = 0
+        for i in range(1, len(keyframes)):
+            if keyframes[i][1] - part_start <= split_size:
+                continue
+            pts, pos = keyframes[i - 1]
+            if pos <= part_start or i < 2:
+                return []
+            cuts.append((keyframes[i - 2][0] + pts) / 2 - start_time)
+            part_start = pos
+        if file_size - part_start > split_size and len(keyframes) > 1:
+            pts, pos = keyframes[-1]
+            if pos <= part_start:
+                return []
+            cuts.append((keyframes[-2][0] + pts) / 2 - start_time)
+        return [cut for cut in cuts if cut > 0]
+
+    async def _split_by_keyframes(self, f_path, file_, split_size):
+        start_time, keyframes = await self._keyframe_index(f_path)
+        if self._listener.is_cancelled or not keyframes:
+            return None
+        file_size = await aiopath.getsize(f_path)
+        cuts = self._plan_cuts(keyframes, start_time, file_size, split_size)
+        if not cuts:
+            return None
+        base_name, extension = ospath.splitext(file_)
+        pattern = f_path.replace(
+            file_, f"{base_name.replace('%', '%%')}.part%03d{extension}"
+        )
+        cmd = [
+            BinConfig.FFMPEG_NAME,
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-progress",
+            "pipe:1",
+            "-i",
+            f_path,
+            "-map",
+            "0",
+            "-map_chapters",
+            "-1",
+            "-c",
+            "copy",
+            "-f",
+            "segment",
+            "-segment_times",
+            ",".join(f"{cut:.6f}" for cut in cuts),
+            "-segment_start_number",
+            "1",
+            "-reset_timestamps",
+            "1",
+            "-threads",
+            f"{self.threads}",
+            pattern,
+        ]
+        outputs = [
+            f_path.replace(file_, f"{base_name}.part{i:03}{extension}")
+            for i in range(1, len(cuts) + 2)
+        ]
+        self._listener.subproc = await create_subprocess_exec(
+            *cmd, stdout=PIPE, stderr=PIPE
+        )
+        await self._ffmpeg_progress()
+        _, stderr = await self._listener.subproc.communicate()
+        code = self._listener.subproc.returncode
+        if self._listener.is_cancelled:
+            return False
+        if code == -9:
+            self._listener.is_cancelled = True
+            return False
+        ok = code == 0
+        for out_path in outputs:
+            if not ok:
+                break
+            if not await aiopath.exists(out_path) or (
+                await aiopath.getsize(out_path) > self._listener.max_split_size
+            ):
+                ok = False
+        if ok:
+            return True
+        if code != 0:
+            with suppress(Exception):
+                stderr = stderr.decode().strip()
+            LOGGER.warning(
+                f"{stderr}. Keyframe split failed, falling back to sequential split. Path: {f_path}"
+            )
+        else:
+            LOGGER.warning(
+                f"Keyframe split produced an oversized part, falling back to sequential split. Path: {f_path}"
+            )
+        for out_path in outputs:
+            with suppress(Exception):
+                await remove(out_path)
+        return None
+
     async def split(self, f_path, file_, parts, split_size):
+        self.clear()
+        self._total_time = (await get_media_info(f_path))[0]
+        res = await self._split_by_keyframes(f_path, file_, split_size - 3000000)
+        if res is not None:
+            return res
+        return await self._split_by_size(f_path, file_, parts, split_size)
+
+    async def _split_by_size(self, f_path, file_, parts, split_size):
         self.clear()
         multi_streams = True
         self._total_time = duration = (await get_media_info(f_path))[0]
@@ -700,7 +910,7 @@ class FFMpeg:
                 "-c",
                 "copy",
                 "-threads",
-                f"{max(1, cpu_no // 2)}",
+                f"{self.threads}",
                 out_path,
             ]
             if not multi_streams:
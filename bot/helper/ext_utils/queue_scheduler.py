@@ -0,0 +1,92 @@
+from collections import Counter
+from itertools import count
+
+from ... import (
+    non_queued_dl,
+    non_queued_up,
+    queued_dl,
+    queued_up,
+    sudo_users,
+    user_data,
+)
+from ...core.config_manager import Config
+
+
+class QueueScheduler:
+    """Decides which queued tasks start next; callers hold ``queue_dict_lock``.
+
+    ``QUEUE_POLICY`` picks the order:
+        fifo: arrival order.
+        fair: the user with the fewest running tasks goes first (deficit round
+              robin with a one-task quantum), arrival order within a user.
+        sjf:  fair across users, smallest known ``listener.size`` first.
+    ``QUEUE_SUDO_PRIORITY`` puts owner/sudo tasks ahead of everyone else and
+    ``QUEUE_ENGINE_LIMITS`` caps running tasks per engine, e.g.
+    ``{"aria2": 4, "qbit": 2, "ytdlp": 2, "telegram": 3}``.
+    """
+
+    tasks = {}
+    _order = count()
+
+    @classmethod
+    def register(cls, listener, engine):
+        active = non_queued_dl | non_queued_up | queued_dl.keys() | queued_up.keys()
+        for mid in [mid for mid in cls.tasks if mid not in active]:
+            del cls.tasks[mid]
+        cls.tasks[listener.mid] = {
+            "listener": listener,
+            "engine": engine,
+            "order": next(cls._order),
+        }
+
+    @staticmethod
+    def is_sudo(user_id):
+        return bool(
+            user_id == Config.OWNER_ID
+            or user_id in sudo_users
+            or user_data.get(user_id, {}).get("SUDO")
+        )
+
+    @classmethod
+    def engine_full(cls, engine, running):
+        limits = Config.QUEUE_ENGINE_LIMITS
+        if not engine or not isinstance(limits, dict):
+            return False
+        if not (limit := limits.get(engine)):
+            return False
+        busy = sum(
+            1
+            for mid in running
+            if (task := cls.tasks.get(mid)) and task["engine"] == engine
+        )
+        return busy >= int(limit)
+
+    @classmethod
+    def order(cls, queued, running):
+        """Queued mids in the order they should be started."""
+        policy = Config.QUEUE_POLICY
+        sudo_first = Config.QUEUE_SUDO_PRIORITY
+        unknown = [mid for mid in queued if mid not in cls.tasks]
+        pending = [cls.tasks[mid] | {"mid": mid} for mid in queued if mid in cls.tasks]
+        loads = Counter(
+            task["listener"].user_id
+            for mid in running
+            if (task := cls.tasks.get(mid))
+        )
+
+        def rank(task):
+            listener = task["listener"]
+            return (
+                sudo_first and not cls.is_sudo(listener.user_id),
+                loads[listener.user_id] if policy in ("fair", "sjf") else 0,
+                (listener.size or float("inf")) if policy == "sjf" else 0,
+                task["order"],
+            )
+
+        ordered = []
+        while pending:
+            task = min(pending, key=rank)
+            pending.remove(task)
+            loads[task["listener"].user_id] += 1
+            ordered.append(task["mid"])
+        return ordered + unknown
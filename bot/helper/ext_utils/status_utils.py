@@ -1,4 +1,4 @@
-from asyncio import gather, iscoroutinefunction
+from asyncio import Lock, gather, iscoroutinefunction
 from html import escape
 from re import findall
 from time import time
@@ -19,6 +19,10 @@ from ..telegram_helper.button_build import ButtonMaker
 
 SIZE_UNITS = ["B", "KB", "MB", "GB", "TB", "PB"]
 
+_snapshot = {"time": 0, "tasks": [], "stats": {}}
+_snapshot_lock = Lock()
+_page_cache = {}
+
 
 class MirrorStatus:
     STATUS_UPLOAD = "Upload"
@@ -75,12 +79,12 @@ STATUSES = {
 
 async def get_task_by_gid(gid: str):
     async with task_dict_lock:
-        for tk in task_dict.values():
-            if hasattr(tk, "seeding"):
-                await tk.update()
-            if tk.gid() == gid:
-                return tk
-        return None
+        tasks = list(task_dict.values())
+    await gather(*(tk.update() for tk in tasks if hasattr(tk, "seeding")))
+    for tk in tasks:
+        if tk.gid() == gid:
+            return tk
+    return None
 
 
 async def get_specific_tasks(status, user_id):
@@ -215,36 +219,63 @@ def get_progress_bar_string(pct):
     return f"[{p_str}]"
 
 
-async def get_readable_message(sid, is_user, page_no=1, status="All", page_step=1):
-    msg = ""
-    button = None
+async def _task_status(task):
+    if iscoroutinefunction(task.status):
+        return await task.status()
+    return task.status()
+
+
+async def get_status_snapshot(max_age=1):
+    """One shared view of all tasks and bot stats per tick, built without task_dict_lock"""
+    async with _snapshot_lock:
+        if time() - _snapshot["time"] < max_age:
+            return _snapshot
+        tasks = list(task_dict.values())
+        statuses = await gather(
+            *(_task_status(tk) for tk in tasks), return_exceptions=True
+        )
+        _snapshot["tasks"] = [
+            (tk, st) for tk, st in zip(tasks, statuses) if not isinstance(st, Exception)
+        ]
+        _snapshot["stats"] = {
+            "cpu": cpu_percent(),
+            "ram": virtual_memory().percent,
+            "free": disk_usage(DOWNLOAD_DIR).free,
+        }
+        _snapshot["time"] = time()
+        _page_cache.clear()
+        return _snapshot
+
+
+def _filter_snapshot(snapshot, status, user_id):
+    result = []
+    for tk, st in snapshot["tasks"]:
+        if user_id and tk.listener.user_id != user_id:
+            continue
+        if (
+            status == "All"
+            or st == status
+            or (status == MirrorStatus.STATUS_DOWNLOAD and st not in STATUSES.values())
+        ):
+            result.append((tk, st))
+    return result
 
-    bot_header = Config.CUSTOM_BOT_HEADER or "𝐌ʀ𝐉ʜᴀᴘʟᴜ 𝐓ᴇʟᴇɢʀᴀᴍ"
-    bot_header_link = Config.CUSTOM_BOT_HEADER_LINK or "https://t.me/mrjhaplu"
-    msg += f"<blockquote><b><i><a href='{bot_header_link}'>ᴘᴏᴡᴇʀᴇᴅ ʙʏ {bot_header}</a></i></b>\n\n</blockquote>"
 
-    tasks = await get_specific_tasks(status, sid if is_user else None)
+def _progress_bucket(task):
+    try:
+        return int(float(str(task.progress()).strip("%")))
+    except Exception:
+        return 0
 
-    STATUS_LIMIT = Config.STATUS_LIMIT
-    tasks_no = len(tasks)
-    pages = (max(tasks_no, 1) + STATUS_LIMIT - 1) // STATUS_LIMIT
-    if page_no > pages:
-        page_no = (page_no - 1) % pages + 1
-        status_dict[sid]["page_no"] = page_no
-    elif page_no < 1:
-        page_no = pages - (abs(page_no) % pages)
-        status_dict[sid]["page_no"] = page_no
-    start_position = (page_no - 1) * STATUS_LIMIT
 
-    for index, task in enumerate(
-        tasks[start_position : STATUS_LIMIT + start_position], start=1
-    ):
+def _render_tasks(tasks, start_position, status):
+    msg = ""
+    signature = []
+    for index, (task, tstatus) in enumerate(tasks, start=1):
         if status != "All":
             tstatus = status
-        elif iscoroutinefunction(task.status):
-            tstatus = await task.status()
-        else:
-            tstatus = task.status()
+        position = task.queue_position() if hasattr(task, "queue_position") else None
+        signature.append((task.gid(), tstatus, _progress_bucket(task), position))
         msg += f"<b>{index + start_position}.</b> "
         msg += f"<b><code>{escape(f'{task.name()}')}</code></b>"
         if task.listener.subname:
@@ -296,14 +327,57 @@ async def get_readable_message(sid, is_user, page_no=1, status="All", page_step=
             msg += f"\n┊ <code>Past     :</code> <i>{get_readable_time(elapsed)}</i>"
         else:
             msg += f"\n┊ sɪᴢᴇ : <i>{task.size()}</i>"
+            if position:
+                msg += f"\n┊ ǫᴜᴇᴜᴇ : <i>#{position}</i>"
         msg += f"\n┊ ᴇɴɢɪɴᴇ : <i>{task.engine}</i>"
         msg += f"\n╰ ᴍᴏᴅᴇ : <i>{task.listener.mode[1]}</i></blockquote>"
         # TODO: Add Bt Sel
         msg += f"\n<blockquote>⋗ sᴛᴏᴘ : <i>/{BotCommands.CancelTaskCommand[1]}_{task.gid()}</i></blockquote>\n\n"
 
+    return msg, tuple(signature)
+
+
+async def get_readable_message(sid, is_user, page_no=1, status="All", page_step=1):
+    msg, button, _ = await render_status_page(sid, is_user, page_no, status, page_step)
+    return msg, button
+
+
+async def render_status_page(sid, is_user, page_no=1, status="All", page_step=1):
+    msg = ""
+    button = None
+
+    bot_header = Config.CUSTOM_BOT_HEADER or "𝐌ʀ𝐉ʜᴀᴘʟᴜ 𝐓ᴇʟᴇɢʀᴀᴍ"
+    bot_header_link = Config.CUSTOM_BOT_HEADER_LINK or "https://t.me/mrjhaplu"
+    msg += f"<blockquote><b><i><a href='{bot_header_link}'>ᴘᴏᴡᴇʀᴇᴅ ʙʏ {bot_header}</a></i></b>\n\n</blockquote>"
+
+    snapshot = await get_status_snapshot()
+    user_id = sid if is_user else None
+    tasks = _filter_snapshot(snapshot, status, user_id)
+
+    STATUS_LIMIT = Config.STATUS_LIMIT
+    tasks_no = len(tasks)
+    pages = (max(tasks_no, 1) + STATUS_LIMIT - 1) // STATUS_LIMIT
+    if page_no > pages:
+        page_no = (page_no - 1) % pages + 1
+        status_dict[sid]["page_no"] = page_no
+    elif page_no < 1:
+        page_no = pages - (abs(page_no) % pages)
+        status_dict[sid]["page_no"] = page_no
+    start_position = (page_no - 1) * STATUS_LIMIT
+
+    cache_key = (user_id, status, page_no, STATUS_LIMIT)
+    if cache_key not in _page_cache:
+        _page_cache[cache_key] = _render_tasks(
+            tasks[start_position : STATUS_LIMIT + start_position],
+            start_position,
+            status,
+        )
+    tasks_msg, signature = _page_cache[cache_key]
+    msg += tasks_msg
+
     if len(msg) == 0:
         if status == "All":
-            return None, None
+            return None, None, None
         else:
             msg = f"No Active {status} Tasks!\n\n"
 
@@ -325,10 +399,9 @@ async def get_readable_message(sid, is_user, page_no=1, status="All", page_step=
     button = buttons.build_menu(8)
     msg += "\n"
     msg += "⌬ <b><i>ʙᴏᴛ sᴛᴀᴛs</i></b>"
-    msg += f"\n<blockquote>╭ ᴄᴘᴜ : {cpu_percent()}%"
-    msg += f"\n┊ RAM : {virtual_memory().percent}%"
-    msg += (
-        f"\n┊ ғʀᴇᴇ : {get_readable_file_size(disk_usage(DOWNLOAD_DIR).free)}"
-    )
+    stats = snapshot["stats"]
+    msg += f"\n<blockquote>╭ ᴄᴘᴜ : {stats['cpu']}%"
+    msg += f"\n┊ RAM : {stats['ram']}%"
+    msg += f"\n┊ ғʀᴇᴇ : {get_readable_file_size(stats['free'])}"
     msg += f"\n╰ ᴜᴘ : {get_readable_time(time() - bot_start_time)}</blockquote>"
-    return msg, button
+    return msg, button, (page_no, pages, status, page_step, tasks_no, signature)
@@ -18,6 +18,7 @@ from ..telegram_helper.tg_utils import check_botpm, forcesub, verify_token
 from .bot_utils import get_telegraph_list, sync_to_async
 from .files_utils import get_base_name, check_storage_threshold
 from .links_utils import is_gdrive_id
+from .queue_scheduler import QueueScheduler
 from .status_utils import get_readable_time, get_readable_file_size, get_specific_tasks
 
 
@@ -59,7 +60,7 @@ async def stop_duplicate_check(listener):
     return False, None
 
 
-async def check_running_tasks(listener, state="dl"):
+async def check_running_tasks(listener, state="dl", engine=None):
     all_limit = Config.QUEUE_ALL
     state_limit = Config.QUEUE_DOWNLOAD if state == "dl" else Config.QUEUE_UPLOAD
     event = None
@@ -67,9 +68,9 @@ async def check_running_tasks(listener, state="dl"):
     async with queue_dict_lock:
         if state == "up" and listener.mid in non_queued_dl:
             non_queued_dl.remove(listener.mid)
+        QueueScheduler.register(listener, engine)
         if (
-            (all_limit or state_limit)
-            and not listener.force_run
+            not listener.force_run
             and not (listener.force_upload and state == "up")
             and not (listener.force_download and state == "dl")
         ):
@@ -81,6 +82,9 @@ async def check_running_tasks(listener, state="dl"):
                 and dl_count + up_count >= all_limit
                 and (not state_limit or t_count >= state_limit)
             ) or (state_limit and t_count >= state_limit)
+            is_over_limit = is_over_limit or QueueScheduler.engine_full(
+                engine, non_queued_dl if state == "dl" else non_queued_up
+            )
             if is_over_limit:
                 event = Event()
                 if state == "dl":
@@ -108,58 +112,45 @@ async def start_up_from_queued(mid: int):
     non_queued_up.add(mid)
 
 
-async def start_from_queued():
-    if all_limit := Config.QUEUE_ALL:
-        dl_limit = Config.QUEUE_DOWNLOAD
-        up_limit = Config.QUEUE_UPLOAD
-        async with queue_dict_lock:
-            dl = len(non_queued_dl)
-            up = len(non_queued_up)
-            all_ = dl + up
-            if all_ < all_limit:
-                f_tasks = all_limit - all_
-                if queued_up and (not up_limit or up < up_limit):
-                    for index, mid in enumerate(list(queued_up.keys()), start=1):
-                        await start_up_from_queued(mid)
-                        f_tasks -= 1
-                        if f_tasks == 0 or (up_limit and index >= up_limit - up):
-                            break
-                if queued_dl and (not dl_limit or dl < dl_limit) and f_tasks != 0:
-                    for index, mid in enumerate(list(queued_dl.keys()), start=1):
-                        await start_dl_from_queued(mid)
-                        if (dl_limit and index >= dl_limit - dl) or index == f_tasks:
-                            break
-        return
+async def _start_queued(state, slots):
+    queued, running, start = (
+        (queued_dl, non_queued_dl, start_dl_from_queued)
+        if state == "dl"
+        else (queued_up, non_queued_up, start_up_from_queued)
+    )
+    started = 0
+    for mid in QueueScheduler.order(queued, running):
+        if started >= slots:
+            break
+        if QueueScheduler.engine_full(
+            QueueScheduler.tasks.get(mid, {}).get("engine"), running
+        ):
+            continue
+        await start(mid)
+        started += 1
+    return started
 
-    if up_limit := Config.QUEUE_UPLOAD:
-        async with queue_dict_lock:
-            up = len(non_queued_up)
-            if queued_up and up < up_limit:
-                f_tasks = up_limit - up
-                for index, mid in enumerate(list(queued_up.keys()), start=1):
-                    await start_up_from_queued(mid)
-                    if index == f_tasks:
-                        break
-    else:
-        async with queue_dict_lock:
-            if queued_up:
-                for mid in list(queued_up.keys()):
-                    await start_up_from_queued(mid)
-
-    if dl_limit := Config.QUEUE_DOWNLOAD:
-        async with queue_dict_lock:
-            dl = len(non_queued_dl)
-            if queued_dl and dl < dl_limit:
-                f_tasks = dl_limit - dl
-                for index, mid in enumerate(list(queued_dl.keys()), start=1):
-                    await start_dl_from_queued(mid)
-                    if index == f_tasks:
-                        break
-    else:
-        async with queue_dict_lock:
-            if queued_dl:
-                for mid in list(queued_dl.keys()):
-                    await start_dl_from_queued(mid)
+
+async def start_from_queued():
+    all_limit = Config.QUEUE_ALL
+    dl_limit = Config.QUEUE_DOWNLOAD
+    up_limit = Config.QUEUE_UPLOAD
+    async with queue_dict_lock:
+        free = (
+            all_limit - len(non_queued_dl) - len(non_queued_up) if all_limit else None
+        )
+        if queued_up:
+            slots = up_limit - len(non_queued_up) if up_limit else len(queued_up)
+            if free is not None:
+                slots = min(slots, free)
+            started = await _start_queued("up", slots)
+            if free is not None:
+                free -= started
+        if queued_dl:
+            slots = dl_limit - len(non_queued_dl) if dl_limit else len(queued_dl)
+            if free is not None:
+                slots = min(slots, free)
+            await _start_queued("dl", slots)
 
 
 async def limit_checker(listener, yt_playlist=0):
@@ -239,6 +230,21 @@ async def user_interval_check(user_id):
     return None
 
 
+async def bulk_task_limit(message):
+    """How many bulk tasks the sender may still start, None when unlimited."""
+    if await CustomFilters.sudo("", message):
+        return None
+    user_id = (message.from_user or message.sender_chat).id
+    if Config.RSS_CHAT and user_id == int(Config.RSS_CHAT):
+        return None
+    left = []
+    if bmax_tasks := Config.BOT_MAX_TASKS:
+        left.append(int(bmax_tasks) - len(await get_specific_tasks("All", False)))
+    if maxtask := Config.USER_MAX_TASKS:
+        left.append(int(maxtask) - len(await get_specific_tasks("All", user_id)))
+    return max(min(left), 0) if left else None
+
+
 async def pre_task_check(message):
     LOGGER.info("Running Pre Task Checks ...")
     msg = []
@@ -11,6 +11,7 @@ from ..ext_utils.bot_utils import bt_selection_buttons
 from ..ext_utils.files_utils import clean_unwanted
 from ..ext_utils.status_utils import get_task_by_gid
 from ..ext_utils.task_manager import stop_duplicate_check, limit_checker
+from .direct_listener import DirectListener
 from ..mirror_leech_utils.status_utils.aria2_status import Aria2Status
 from ..telegram_helper.message_utils import (
     send_message,
@@ -70,6 +71,8 @@ async def _on_download_started(api, data):
 async def _on_download_complete(api, data):
     try:
         gid = data["params"][0]["gid"]
+        if DirectListener.notify(gid):
+            return
         download, options = await api.tellStatus(gid), await api.getOption(gid)
         if options.get("follow-torrent", "") == "false":
             return
@@ -171,6 +174,8 @@ async def _on_bt_download_complete(api, data):
 
 async def _on_download_stopped(_, data):
     gid = data["params"][0]["gid"]
+    if DirectListener.notify(gid):
+        return
     await sleep(4)
     if task := await get_task_by_gid(gid):
         await task.listener.on_download_error("Dead torrent!")
@@ -178,6 +183,8 @@ async def _on_download_stopped(_, data):
 
 async def _on_download_error(api, data):
     gid = data["params"][0]["gid"]
+    if DirectListener.notify(gid):
+        return
     await sleep(1)
     LOGGER.info(f"onDownloadError: {gid}")
     error = "None"
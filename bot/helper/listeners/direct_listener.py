@@ -1,75 +1,62 @@
-from asyncio import sleep, TimeoutError
+from asyncio import Queue, QueueEmpty, TimeoutError, gather, wait
 from aiohttp.client_exceptions import ClientError
 
-from ... import LOGGER
+from ... import LOGGER, bot_loop
+from ...core.config_manager import Config
 from ...core.torrent_manager import TorrentManager, aria2_name
 
 
 class DirectListener:
+    waiters = {}
+
     def __init__(self, path, listener, a2c_opt):
         self.listener = listener
         self._path = path
         self._a2c_opt = a2c_opt
         self._proc_bytes = 0
         self._failed = 0
-        self.download_task = None
+        self._active = {}
         self.name = self.listener.name
 
+    @classmethod
+    def notify(cls, gid):
+        """Wake the direct download waiting on ``gid``; aria2 websocket events
+        for gids that belong to a direct download are consumed here."""
+        if (future := cls.waiters.pop(gid, None)) is None:
+            return False
+        if not future.done():
+            future.set_result(gid)
+        return True
+
     @property
     def processed_bytes(self):
-        if self.download_task:
-            return self._proc_bytes + int(
-                self.download_task.get("completedLength", "0")
-            )
-        return self._proc_bytes
+        return self._proc_bytes + sum(
+            int(download.get("completedLength", "0"))
+            for download in self._active.values()
+        )
 
     @property
     def speed(self):
-        return (
-            int(self.download_task.get("downloadSpeed", "0"))
-            if self.download_task
-            else 0
+        return sum(
+            int(download.get("downloadSpeed", "0"))
+            for download in self._active.values()
+        )
+
+    @property
+    def is_waiting(self):
+        return bool(self._active) and all(
+            download.get("status", "") == "waiting"
+            for download in self._active.values()
         )
 
     async def download(self, contents):
         self.is_downloading = True
+        workers = min(max(Config.DIRECT_PARALLEL, 1), len(contents))
+        connections = min(max(Config.DIRECT_CONNECTIONS // workers, 1), 16)
+        queue = Queue()
         for content in contents:
-            if self.listener.is_cancelled:
-                break
-            if content["path"]:
-                self._a2c_opt["dir"] = f"{self._path}/{content['path']}"
-            else:
-                self._a2c_opt["dir"] = self._path
-            filename = content["filename"]
-            self._a2c_opt["out"] = filename
-            try:
-                gid = await TorrentManager.aria2.addUri(
-                    uris=[content["url"]], options=self._a2c_opt, position=0
-                )
-            except (TimeoutError, ClientError, Exception) as e:
-                self._failed += 1
-                LOGGER.error(f"Unable to download {filename} due to: {e}")
-                continue
-            self.download_task = await TorrentManager.aria2.tellStatus(gid)
-            while True:
-                if self.listener.is_cancelled:
-                    if self.download_task:
-                        await TorrentManager.aria2_remove(self.download_task)
-                    break
-                self.download_task = await TorrentManager.aria2.tellStatus(gid)
-                if error_message := self.download_task.get("errorMessage"):
-                    self._failed += 1
-                    LOGGER.error(
-                        f"Unable to download {aria2_name(self.download_task)} due to: {error_message}"
-                    )
-                    await TorrentManager.aria2_remove(self.download_task)
-                    break
-                elif self.download_task.get("status", "") == "complete":
-                    self._proc_bytes += int(self.download_task.get("totalLength", "0"))
-                    await TorrentManager.aria2_remove(self.download_task)
-                    break
-                await sleep(1)
-            self.download_task = None
+            queue.put_nowait(content)
+        await gather(*(self._worker(queue, connections) for _ in range(workers)))
         if self.listener.is_cancelled:
             return
         if self._failed == len(contents):
@@ -78,9 +65,73 @@ class DirectListener:
         await self.listener.on_download_complete()
         return
 
+    async def _worker(self, queue, connections):
+        while not self.listener.is_cancelled:
+            try:
+                content = queue.get_nowait()
+            except QueueEmpty:
+                return
+            await self._download_file(content, connections)
+
+    async def _download_file(self, content, connections):
+        options = self._a2c_opt.copy()
+        if content["path"]:
+            options["dir"] = f"{self._path}/{content['path']}"
+        else:
+            options["dir"] = self._path
+        filename = content["filename"]
+        options["out"] = filename
+        options["split"] = options["max-connection-per-server"] = str(connections)
+        future = bot_loop.create_future()
+        try:
+            gid = await TorrentManager.aria2.addUri(
+                uris=[content["url"]], options=options, position=0
+            )
+        except (TimeoutError, ClientError, Exception) as e:
+            self._failed += 1
+            LOGGER.error(f"Unable to download {filename} due to: {e}")
+            return
+        DirectListener.waiters[gid] = future
+        self._active[gid] = {"gid": gid, "status": "waiting"}
+        try:
+            while not self.listener.is_cancelled:
+                # The websocket notification ends the wait early; the timeout
+                # refreshes progress and covers events missed before we
+                # registered or across a reconnect.
+                await wait({future}, timeout=TorrentManager.poll_interval)
+                try:
+                    download = await TorrentManager.get_aria2_download(gid)
+                except Exception:
+                    continue
+                self._active[gid] = download
+                if future.done() or download.get("status", "") in (
+                    "complete",
+                    "error",
+                    "removed",
+                ):
+                    break
+            if self.listener.is_cancelled:
+                await TorrentManager.aria2_remove(self._active[gid])
+                return
+            download = await TorrentManager.aria2.tellStatus(gid)
+            if error_message := download.get("errorMessage"):
+                self._failed += 1
+                LOGGER.error(
+                    f"Unable to download {aria2_name(download)} due to: {error_message}"
+                )
+            elif download.get("status", "") == "complete":
+                self._proc_bytes += int(download.get("totalLength", "0"))
+            else:
+                self._failed += 1
+            await TorrentManager.aria2_remove(download)
+        except (TimeoutError, ClientError, Exception) as e:
+            self._failed += 1
+            LOGGER.error(f"Unable to download {filename} due to: {e}")
+        finally:
+            DirectListener.waiters.pop(gid, None)
+            self._active.pop(gid, None)
+
     async def cancel_task(self):
         self.listener.is_cancelled = True
         LOGGER.info(f"Cancelling Download: {self.listener.name}")
         await self.listener.on_download_error("Download Cancelled by User!")
-        if self.download_task:
-            await TorrentManager.aria2_remove(self.download_task)
@@ -1,4 +1,5 @@
-from asyncio import sleep, gather
+from asyncio import Event, TimeoutError, gather, wait_for
+from contextlib import suppress
 
 from ... import (
     intervals,
@@ -11,6 +12,14 @@ from ..ext_utils.bot_utils import new_task
 from ..ext_utils.status_utils import get_task_by_gid, get_raw_file_size
 from ..ext_utils.task_manager import stop_duplicate_check, limit_checker
 
+# poll every 3s while a job downloads or post-processes, back off to 30s when
+# every job is paused or already uploading, and to at most 6s while a queued
+# job still waits for its duplicate and size checks
+_POLL_INTERVAL = 3
+_QUEUED_INTERVAL = 6
+_IDLE_INTERVAL = 30
+_new_job = Event()
+
 
 async def _remove_job(nzo_id, mid):
     res1, _ = await gather(
@@ -65,14 +74,33 @@ async def _on_download_complete(nzo_id):
 
 @new_task
 async def _nzb_listener():
+    last_history_update = None
+    known_ids = set()
+    history_active = False
+    delay = _POLL_INTERVAL
     while not intervals["stopAll"]:
+        _new_job.clear()
         async with nzb_listener_lock:
+            if len(nzb_jobs) == 0:
+                intervals["nzb"] = ""
+                break
+            nzo_ids = list(nzb_jobs)
+            if not known_ids.issuperset(nzo_ids):
+                last_history_update = None
             try:
-                jobs = (await sabnzbd_client.get_history())["history"]["slots"]
-                downloads = (await sabnzbd_client.get_downloads())["queue"]["slots"]
-                if len(nzb_jobs) == 0:
-                    intervals["nzb"] = ""
-                    break
+                history, queue = await gather(
+                    sabnzbd_client.get_history(
+                        nzo_ids=nzo_ids, last_history_update=last_history_update
+                    ),
+                    sabnzbd_client.get_downloads(nzo_ids=nzo_ids),
+                )
+                # sabnzbd answers {"history": false} while nothing changed
+                jobs = history["history"]["slots"] if history["history"] else []
+                downloads = queue["queue"]["slots"]
+                if history["history"]:
+                    history_active = False
+                queue_active = False
+                unchecked = False
                 for job in jobs:
                     nzo_id = job["nzo_id"]
                     if nzo_id not in nzb_jobs:
@@ -84,6 +112,8 @@ async def _nzb_listener():
                             nzb_jobs[nzo_id]["status"] = "Completed"
                     elif job["status"] == "Failed":
                         await _on_download_error(job["fail_message"], nzo_id)
+                    else:
+                        history_active = True
                 for dl in downloads:
                     nzo_id = dl["nzo_id"]
                     if nzo_id not in nzb_jobs:
@@ -91,18 +121,31 @@ async def _nzb_listener():
                     if dl["labels"] and dl["labels"][0] == "ALTERNATIVE":
                         await _on_download_error("Duplicated Job!", nzo_id)
                         continue
-                    if dl["status"] == "Downloading" and not dl["filename"].startswith(
-                        "Trying"
-                    ):
+                    if dl["status"] != "Downloading":
+                        unchecked = unchecked or not nzb_jobs[nzo_id]["size_check"]
+                    else:
+                        queue_active = True
+                        if dl["filename"].startswith("Trying"):
+                            continue
                         if not nzb_jobs[nzo_id]["stop_dup_check"]:
                             nzb_jobs[nzo_id]["stop_dup_check"] = True
                             await _stop_duplicate(nzo_id)
                         if not nzb_jobs[nzo_id]["size_check"]:
                             nzb_jobs[nzo_id]["size_check"] = True
                             await _size_check(nzo_id)
+                if history["history"]:
+                    last_history_update = history["history"]["last_history_update"]
+                    known_ids = set(nzo_ids)
+                if history_active or queue_active:
+                    delay = _POLL_INTERVAL
+                else:
+                    delay = min(
+                        delay * 2, _QUEUED_INTERVAL if unchecked else _IDLE_INTERVAL
+                    )
             except Exception as e:
                 LOGGER.error(str(e))
-        await sleep(3)
+        with suppress(TimeoutError):
+            await wait_for(_new_job.wait(), delay)
 
 
 async def on_download_start(nzo_id):
@@ -115,3 +158,5 @@ async def on_download_start(nzo_id):
         }
         if not intervals["nzb"]:
             intervals["nzb"] = await _nzb_listener()
+        else:
+            _new_job.set()
@@ -122,7 +122,7 @@ async def _qb_listener():
     while True:
         async with qb_listener_lock:
             try:
-                torrents = await TorrentManager.qbittorrent.torrents.info()
+                torrents = await TorrentManager.get_qbit_torrents()
                 if len(torrents) == 0:
                     intervals["qb"] = ""
                     break
@@ -25,7 +25,7 @@ from ..common import TaskConfig
 from ...core.tg_client import TgClient
 from ...core.config_manager import Config
 from ...core.torrent_manager import TorrentManager
-from ..ext_utils.bot_utils import encode_slink, sync_to_async
+from ..ext_utils.bot_utils import encode_slink
 from ..ext_utils.db_handler import database
 from ..ext_utils.files_utils import (
     clean_download,
@@ -39,6 +39,9 @@ from ..ext_utils.files_utils import (
 from ..ext_utils.links_utils import is_gdrive_id
 from ..ext_utils.status_utils import get_readable_file_size, get_readable_time
 from ..ext_utils.task_manager import check_running_tasks, start_from_queued
+from ..mirror_leech_utils.download_utils.direct_link_resolver import (
+    DirectLinkResolver,
+)
 from ..mirror_leech_utils.gdrive_utils.upload import GoogleDriveUpload
 from ..mirror_leech_utils.rclone_utils.transfer import RcloneTransferHelper
 from ..mirror_leech_utils.status_utils.gdrive_status import GoogleDriveStatus
@@ -291,7 +294,13 @@ class TaskListener(TaskConfig):
 
         self.subproc = None
 
-        add_to_queue, event = await check_running_tasks(self, "up")
+        if self.is_leech:
+            engine = "telegram"
+        elif is_gdrive_id(self.up_dest):
+            engine = "gdrive"
+        else:
+            engine = "rclone"
+        add_to_queue, event = await check_running_tasks(self, "up", engine)
         await start_from_queued()
         if add_to_queue:
             LOGGER.info(f"Added to Queue/Upload: {self.name}")
@@ -321,7 +330,7 @@ class TaskListener(TaskConfig):
                 task_dict[self.mid] = GoogleDriveStatus(self, drive, gid, "up")
             await gather(
                 update_status_message(self.message.chat.id),
-                sync_to_async(drive.upload),
+                drive.upload(),
             )
             del drive
         else:
@@ -494,6 +503,8 @@ class TaskListener(TaskConfig):
             if self.mid in task_dict:
                 del task_dict[self.mid]
             count = len(task_dict)
+        # the generated link may be signed or one-shot, scrape again on retry
+        DirectLinkResolver.invalidate(self.source_link)
         await self.remove_from_same_dir()
         msg = (
             f"""〶 <b><i><u>Limit Breached:</u></i></b>
@@ -551,6 +562,7 @@ class TaskListener(TaskConfig):
             if self.mid in task_dict:
                 del task_dict[self.mid]
             count = len(task_dict)
+        DirectLinkResolver.invalidate(self.source_link)
         await send_message(self.message, f"{self.tag} {escape(str(error))}")
         if count == 0:
             await self.clean()
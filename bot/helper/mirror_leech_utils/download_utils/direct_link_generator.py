@@ -1,4 +1,6 @@
+from asyncio import get_running_loop
 from cloudscraper import create_scraper
+from concurrent.futures import ThreadPoolExecutor
 from hashlib import sha256
 from http.cookiejar import MozillaCookieJar
 from json import loads
@@ -7,11 +9,13 @@ from os import path as ospath
 from re import findall, match, search
 from requests import Session, post, get, RequestException
 from requests.adapters import HTTPAdapter
+from threading import Lock
 from time import sleep
 from urllib.parse import parse_qs, urlparse, quote
 from urllib3.util.retry import Retry
 from uuid import uuid4
 from base64 import b64decode, b64encode
+from collections import OrderedDict
 
 from ....core.config_manager import Config
 from ...ext_utils.exceptions import DirectDownloadLinkException
@@ -23,6 +27,104 @@ user_agent = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:122.0) Gecko/20100101 Firefox/122.0"
 )
 
+_host_adapters = OrderedDict()
+_host_adapters_lock = Lock()
+_MAX_HOST_ADAPTERS = 64
+
+
+class HostSession(Session):
+    """Session with its own cookies and headers on top of a keep-alive pool
+    shared by every resolve of the same host, so closing it keeps the pool."""
+
+    def close(self):
+        pass
+
+
+def host_session(url):
+    host = urlparse(url).hostname or ""
+    with _host_adapters_lock:
+        if (adapter := _host_adapters.get(host)) is None:
+            adapter = _host_adapters[host] = HTTPAdapter(
+                pool_maxsize=max(Config.DIRECT_LINK_HOST_LIMIT, 1)
+            )
+        _host_adapters.move_to_end(host)
+        # sessions already holding an evicted adapter keep using it
+        while len(_host_adapters) > _MAX_HOST_ADAPTERS:
+            _host_adapters.popitem(last=False)
+    session = HostSession()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class HostLimiter:
+    """``DIRECT_LINK_HOST_LIMIT`` request slots per host, shared by resolves
+    and their folder fan-out. Resolves wait for a slot on the event loop,
+    fan-out workers inside pool threads only take the free ones, so no thread
+    is ever parked on a busy host. Only hosts with slots in use are tracked."""
+
+    _used = {}
+    _waiters = {}
+    _lock = Lock()
+
+    @staticmethod
+    def _limit():
+        return max(Config.DIRECT_LINK_HOST_LIMIT, 1)
+
+    @classmethod
+    def acquire(cls, host):
+        with cls._lock:
+            if cls._used.get(host, 0) >= cls._limit():
+                return False
+            cls._used[host] = cls._used.get(host, 0) + 1
+            return True
+
+    @classmethod
+    async def wait_slot(cls, host):
+        while True:
+            with cls._lock:
+                if cls._used.get(host, 0) < cls._limit():
+                    cls._used[host] = cls._used.get(host, 0) + 1
+                    return
+                waiter = get_running_loop().create_future()
+                cls._waiters.setdefault(host, []).append(waiter)
+            await waiter
+
+    @classmethod
+    def release(cls, host):
+        with cls._lock:
+            if (used := cls._used.get(host, 0) - 1) > 0:
+                cls._used[host] = used
+            else:
+                cls._used.pop(host, None)
+            waiters = cls._waiters.pop(host, [])
+        # releases come from pool threads too, every waiter retries on its loop
+        for waiter in waiters:
+            waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+
+
+def _wake(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def map_concurrent(func, items, url):
+    """Runs func over items keeping the input order. The caller already holds
+    a slot of the url's host, extra workers only take the host's free slots."""
+    host = urlparse(url).hostname or ""
+    extra = 0
+    while extra < len(items) - 1 and HostLimiter.acquire(host):
+        extra += 1
+    if not extra:
+        return [func(item) for item in items]
+    try:
+        with ThreadPoolExecutor(max_workers=extra + 1) as pool:
+            return list(pool.map(func, items))
+    finally:
+        for _ in range(extra):
+            HostLimiter.release(host)
+
+
 debrid_link_sites = [
     "1fichier.com",
     "anonfiles.com",
@@ -390,7 +492,7 @@ def buzzheavier(url):
     @param link: URL from buzzheavier
     @return: Direct download link
     """
-    session = Session()
+    session = host_session(url)
     if "/download" not in url:
         url += "/download"
 
@@ -426,7 +528,7 @@ def fuckingfast_dl(url):
     @param url: URL from fuckingfast.co
     @return: Direct download link
     """
-    session = Session()
+    session = host_session(url)
     url = url.strip()
 
     try:
@@ -455,7 +557,7 @@ def devuploads(url):
     @param url: URL from devuploads.com
     @return: Direct download link
     """
-    session = Session()
+    session = host_session(url)
     res = session.get(url)
     html = HTML(res.text)
     if not html.xpath("//input[@name]"):
@@ -529,7 +631,7 @@ def lulacloud(url):
     @param url: URL from www.lulacloud.com
     @return: Direct download link
     """
-    session = Session()
+    session = host_session(url)
     try:
         res = session.post(url, headers={"Referer": url}, allow_redirects=False)
         return res.headers["location"]
@@ -650,7 +752,7 @@ def hxfile(url):
     except Exception as e:
         raise DirectDownloadLinkException(f"ERROR: {e.__class__.__name__}") from e
     cookies = {cookie.name: cookie.value for cookie in jar}
-    with Session() as session:
+    with host_session(url) as session:
         try:
             if url.strip().endswith(".html"):
                 url = url[:-5]
@@ -720,7 +822,7 @@ def streamtape(url):
     splitted_url = url.split("/")
     _id = splitted_url[4] if len(splitted_url) >= 6 else splitted_url[-1]
     try:
-        with Session() as session:
+        with host_session(url) as session:
             html = HTML(session.get(url).text)
     except Exception as e:
         raise DirectDownloadLinkException(f"ERROR: {e.__class__.__name__}") from e
@@ -863,7 +965,7 @@ def solidfiles(url):
 
 
 def krakenfiles(url):
-    with Session() as session:
+    with host_session(url) as session:
         try:
             _res = session.get(url)
         except Exception as e:
@@ -1234,7 +1336,7 @@ def linkBox(url: str):
                 details["contents"].append(item)
 
     try:
-        with Session() as session:
+        with host_session(url) as session:
             __fetch_links(session)
     except DirectDownloadLinkException as e:
         raise e
@@ -1328,7 +1430,7 @@ def gofile(url):
                 details["contents"].append(item)
 
     details = {"contents": [], "title": "", "total_size": 0}
-    with Session() as session:
+    with host_session(url) as session:
         try:
             token = __get_token(session)
         except Exception as e:
@@ -1471,9 +1573,12 @@ def mediafireFolder(url):
             __get_content(folderKey, folderPath, "files")
         else:
             files = _folder_content["files"]
-            for file in files:
+            links = map_concurrent(
+                lambda file: __scraper(file["links"]["normal_download"]), files, url
+            )
+            for file, _url in zip(files, links):
                 item = {}
-                if not (_url := __scraper(file["links"]["normal_download"])):
+                if not _url:
                     continue
                 item["filename"] = file["filename"]
                 if not folderPath:
@@ -1570,7 +1675,6 @@ def send_cm(url):
         details["title"] = splitted_url[5]
     else:
         details["title"] = splitted_url[-1]
-    session = Session()
 
     def __collectFolders(html):
         folders = []
@@ -1586,12 +1690,14 @@ def send_cm(url):
         return folders
 
     def __getFile_link(file_id):
+        # runs in map_concurrent threads, sessions aren't thread-safe
         try:
-            _res = session.post(
-                "https://send.cm/",
-                data={"op": "download2", "id": file_id},
-                allow_redirects=False,
-            )
+            with host_session(url) as session:
+                _res = session.post(
+                    "https://send.cm/",
+                    data={"op": "download2", "id": file_id},
+                    allow_redirects=False,
+                )
             if "Location" in _res.headers:
                 return _res.headers["Location"]
         except Exception:
@@ -1618,34 +1724,32 @@ def send_cm(url):
             _html = HTML(cf_bypass(folder["folder_link"]))
             __writeContents(_html, ospath.join(folderPath, folder["folder_name"]))
         files = __getFiles(html_text)
-        for file in files:
-            if not (link := __getFile_link(file["file_id"])):
+        links = map_concurrent(
+            lambda file: __getFile_link(file["file_id"]), files, url
+        )
+        for file, link in zip(files, links):
+            if not link:
                 continue
-            item = {"url": link, "filename": file["filename"], "path": folderPath}
+            item = {"url": link, "filename": file["file_name"], "path": folderPath}
             details["total_size"] += file["size"]
             details["contents"].append(item)
 
     try:
         mainHtml = HTML(cf_bypass(url))
     except DirectDownloadLinkException as e:
-        session.close()
         raise e
     except Exception as e:
-        session.close()
         raise DirectDownloadLinkException(
             f"ERROR: {e.__class__.__name__} While getting mainHtml"
         )
     try:
         __writeContents(mainHtml, details["title"])
     except DirectDownloadLinkException as e:
-        session.close()
         raise e
     except Exception as e:
-        session.close()
         raise DirectDownloadLinkException(
             f"ERROR: {e.__class__.__name__} While writing Contents"
         )
-    session.close()
     if len(details["contents"]) == 1:
         return (details["contents"][0]["url"], details["header"])
     return details
@@ -1783,7 +1887,7 @@ def filelions_and_streamwish(url):
         quality = spited_file_code[1]
         file_code = spited_file_code[0]
     url = f"{scheme}://{hostname}/{file_code}"
-    with Session() as session:
+    with host_session(url) as session:
         try:
             _res = session.get(
                 f"{apiUrl}/api/file/direct_link",
@@ -1922,7 +2026,7 @@ def tmpsend(url):
 def qiwi(url):
     """qiwi.gg link generator
     based on https://github.com/aenulrofik"""
-    with Session() as session:
+    with host_session(url) as session:
         file_id = url.split("/")[-1]
         try:
             res = session.get(url).text
@@ -1937,7 +2041,7 @@ def qiwi(url):
 
 
 def mp4upload(url):
-    with Session() as session:
+    with host_session(url) as session:
         try:
             url = url.replace("embed-", "")
             req = session.get(url).text
@@ -1973,7 +2077,7 @@ def mp4upload(url):
 def berkasdrive(url):
     """berkasdrive.com link generator
     by https://github.com/aenulrofik"""
-    with Session() as session:
+    with host_session(url) as session:
         try:
             sesi = session.get(url).text
         except Exception as e:
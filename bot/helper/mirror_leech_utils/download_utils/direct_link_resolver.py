@@ -0,0 +1,70 @@
+from asyncio import shield
+from collections import OrderedDict
+from copy import deepcopy
+from time import monotonic
+from urllib.parse import urlparse
+
+from .... import bot_loop
+from ....core.config_manager import Config
+from ...ext_utils.bot_utils import sync_to_async
+from .direct_link_generator import HostLimiter, direct_link_generator
+
+
+class DirectLinkResolver:
+    """Async front of ``direct_link_generator``.
+
+    Resolves wait on the event loop for a ``HostLimiter`` slot of their host
+    before reaching the thread pool, so bulk jobs never park pool threads.
+    Concurrent resolves of the same url wait for one scrape, and results are kept for
+    ``DIRECT_LINK_CACHE_TTL`` seconds so bulk jobs don't hit the host again.
+    Errors are never cached and a failed download drops its entry, so retries
+    of signed or one-shot links scrape a fresh one.
+    """
+
+    cache = OrderedDict()
+    max_size = 512
+    _inflight = {}
+
+    @classmethod
+    def _cached(cls, url):
+        if (entry := cls.cache.get(url)) is None:
+            return None
+        expires, result = entry
+        if expires < monotonic():
+            del cls.cache[url]
+            return None
+        cls.cache.move_to_end(url)
+        return result
+
+    @classmethod
+    def _store(cls, url, result):
+        if Config.DIRECT_LINK_CACHE_TTL <= 0:
+            return
+        cls.cache[url] = (monotonic() + Config.DIRECT_LINK_CACHE_TTL, result)
+        cls.cache.move_to_end(url)
+        while len(cls.cache) > cls.max_size:
+            cls.cache.popitem(last=False)
+
+    @classmethod
+    async def _resolve(cls, url):
+        host = urlparse(url).hostname or ""
+        await HostLimiter.wait_slot(host)
+        try:
+            result = await sync_to_async(direct_link_generator, url)
+        finally:
+            HostLimiter.release(host)
+        cls._store(url, result)
+        return result
+
+    @classmethod
+    async def resolve(cls, url):
+        if (result := cls._cached(url)) is not None:
+            return deepcopy(result)
+        if (task := cls._inflight.get(url)) is None:
+            task = cls._inflight[url] = bot_loop.create_task(cls._resolve(url))
+            task.add_done_callback(lambda _: cls._inflight.pop(url, None))
+        return deepcopy(await shield(task))
+
+    @classmethod
+    def invalidate(cls, url):
+        cls.cache.pop(url, None)
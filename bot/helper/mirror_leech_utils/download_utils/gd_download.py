@@ -16,8 +16,8 @@ from ...telegram_helper.message_utils import send_status_message
 
 async def add_gd_download(listener, path):
     drive = GoogleDriveCount()
-    name, mime_type, listener.size, _, _ = await sync_to_async(
-        drive.count, listener.link, listener.user_id
+    name, mime_type, listener.size, _, _ = await drive.count(
+        listener.link, listener.user_id
     )
     if mime_type is None:
         await listener.on_download_error(name)
@@ -35,7 +35,7 @@ async def add_gd_download(listener, path):
         await listener.on_download_error(limit_exceeded, is_limit=True)
         return
 
-    add_to_queue, event = await check_running_tasks(listener)
+    add_to_queue, event = await check_running_tasks(listener, engine="gdrive")
     if add_to_queue:
         LOGGER.info(f"Added to Queue/Download: {listener.name}")
         async with task_dict_lock:
@@ -76,7 +76,7 @@ async def add_mega_download(listener, path):
         await async_api.logout()
         return
 
-    added_to_queue, event = await check_running_tasks(listener)
+    added_to_queue, event = await check_running_tasks(listener, engine="mega")
     if added_to_queue:
         LOGGER.info(f"Added to Queue/Download: {listener.name}")
         async with task_dict_lock:
@@ -86,14 +86,18 @@ class TelegramDownloadHelper:
         try:
             # TODO : Add support for user session ( Huh ??)
             if self._hyper_dl:
+                hyper_dl = HyperTGDownload()
                 try:
-                    download = await HyperTGDownload().download_media(
+                    download = await hyper_dl.download_media(
                         message,
                         file_name=path,
                         progress=self._on_download_progress,
                         dump_chat=Config.LEECH_DUMP_CHAT,
                     )
+                except (FloodWait, FloodPremiumWait):
+                    raise
                 except Exception:
+                    await hyper_dl.discard_partial()
                     if getattr(Config, "USER_TRANSMISSION", False):
                         try:
                             user_message = await TgClient.user.get_messages(
@@ -175,7 +179,9 @@ class TelegramDownloadHelper:
                     await self._listener.on_download_error(msg, button)
                     return
 
-                add_to_queue, event = await check_running_tasks(self._listener)
+                add_to_queue, event = await check_running_tasks(
+                    self._listener, engine="telegram"
+                )
                 if add_to_queue:
                     LOGGER.info(f"Added to Queue/Download: {self._listener.name}")
                     async with task_dict_lock:
@@ -1,12 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from copy import deepcopy
 from logging import getLogger
 from os import path as ospath, listdir
 from re import search as re_search
-from contextlib import suppress
 from secrets import token_hex
+from threading import Lock
+from time import monotonic
 from yt_dlp import YoutubeDL, DownloadError
 
 from .... import task_dict_lock, task_dict, user_data
-from ....core.config_manager import BinConfig
+from ....core.config_manager import BinConfig, Config
 from ...ext_utils.bot_utils import sync_to_async, async_to_sync
 from ...ext_utils.task_manager import (
     check_running_tasks,
@@ -47,8 +51,15 @@ class MyLogger:
 
 
 class YoutubeDLHelper:
-    def __init__(self, listener):
-        self._last_downloaded = 0
+    # format urls in a reused extraction go stale, re-extract after this long
+    INFO_MAX_AGE = 3600
+
+    def __init__(self, listener, info=None):
+        self._info = info
+        self._info_time = monotonic()
+        self._lock = Lock()
+        self._active = {}
+        self._done_bytes = 0
         self._progress = 0
         self._downloaded_bytes = 0
         self._download_speed = 0
@@ -116,27 +127,34 @@ class YoutubeDLHelper:
     def _on_download_progress(self, d):
         if self._listener.is_cancelled:
             raise ValueError("Cancelling...")
-        if d["status"] == "finished":
-            if self.is_playlist:
-                self._last_downloaded = 0
+        if self.is_playlist:
+            # entries download in parallel, sum what every file has so far.
+            # "finished" carries no tmpfilename, key both events on the entry
+            key = (d.get("info_dict") or {}).get("id") or d.get("filename")
+            with self._lock:
+                if d["status"] == "finished":
+                    done = self._active.pop(key, (0, 0))[0]
+                    self._done_bytes += d.get("downloaded_bytes") or done
+                elif d["status"] == "downloading":
+                    self._active[key] = (d["downloaded_bytes"] or 0, d["speed"] or 0)
+                self._downloaded_bytes = self._done_bytes + sum(
+                    done for done, _ in self._active.values()
+                )
+                self._download_speed = sum(speed for _, speed in self._active.values())
         elif d["status"] == "downloading":
             self._download_speed = d["speed"] or 0
-            if self.is_playlist:
-                downloadedBytes = d["downloaded_bytes"] or 0
-                chunk_size = downloadedBytes - self._last_downloaded
-                self._last_downloaded = downloadedBytes
-                self._downloaded_bytes += chunk_size
-            else:
-                if d.get("total_bytes"):
-                    self._listener.size = d["total_bytes"] or 0
-                elif d.get("total_bytes_estimate"):
-                    self._listener.size = d["total_bytes_estimate"] or 0
-                self._downloaded_bytes = d["downloaded_bytes"] or 0
-                self._eta = d.get("eta", "-") or "-"
-            try:
-                self._progress = (self._downloaded_bytes / self._listener.size) * 100
-            except ZeroDivisionError:
-                pass
+            if d.get("total_bytes"):
+                self._listener.size = d["total_bytes"] or 0
+            elif d.get("total_bytes_estimate"):
+                self._listener.size = d["total_bytes_estimate"] or 0
+            self._downloaded_bytes = d["downloaded_bytes"] or 0
+            self._eta = d.get("eta", "-") or "-"
+        else:
+            return
+        try:
+            self._progress = (self._downloaded_bytes / self._listener.size) * 100
+        except ZeroDivisionError:
+            pass
 
     async def _on_download_start(self, from_queue=False):
         async with task_dict_lock:
@@ -155,11 +173,20 @@ class YoutubeDLHelper:
             self.opts["external_downloader"] = BinConfig.FFMPEG_NAME
         with YoutubeDL(self.opts) as ydl:
             try:
-                result = ydl.extract_info(self._listener.link, download=False)
+                # the format picker's extraction is reused for single videos,
+                # playlists were only listed there and get extracted here once
+                if self._info is not None and "entries" not in self._info:
+                    result = ydl.process_ie_result(
+                        deepcopy(self._info), download=False
+                    )
+                else:
+                    result = ydl.extract_info(self._listener.link, download=False)
                 if result is None:
                     raise ValueError("Info result is None")
             except Exception as e:
                 return self._on_download_error(str(e))
+            self._info = result
+            self._info_time = monotonic()
             if self.is_playlist:
                 self.playlist_count = result.get("playlist_count", 0)
             if "entries" in result:
@@ -187,15 +214,48 @@ class YoutubeDLHelper:
                 if not self._ext:
                     self._ext = ext
 
+    def _download_entry(self, entry):
+        if self._listener.is_cancelled:
+            return True
+        # playlists set ignoreerrors, which would only log a failed entry
+        with YoutubeDL({**self.opts, "ignoreerrors": False}) as ydl:
+            try:
+                ydl.process_ie_result(entry, download=True)
+            except Exception as e:
+                if not self._listener.is_cancelled:
+                    LOGGER.error(f"{entry.get('title')}: {e}")
+                return False
+        return True
+
     def _download(self, path):
+        if monotonic() - self._info_time > self.INFO_MAX_AGE:
+            self._info = None
         with suppress(Exception):
-            with YoutubeDL(self.opts) as ydl:
-                try:
-                    ydl.download([self._listener.link])
-                except DownloadError as e:
+            if self.is_playlist and self._info is not None:
+                entries = [entry for entry in self._info.get("entries") or [] if entry]
+                with ThreadPoolExecutor(
+                    max_workers=max(Config.YT_DLP_PLAYLIST_CONCURRENCY, 1)
+                ) as pool:
+                    failed = list(pool.map(self._download_entry, entries)).count(
+                        False
+                    )
+                if entries and failed == len(entries):
                     if not self._listener.is_cancelled:
-                        self._on_download_error(str(e))
+                        self._on_download_error(
+                            f"All {failed} playlist entries failed to download. Check logs for more details"
+                        )
                     return
+            else:
+                with YoutubeDL(self.opts) as ydl:
+                    try:
+                        if self._info is not None:
+                            ydl.process_ie_result(self._info, download=True)
+                        else:
+                            ydl.download([self._listener.link])
+                    except DownloadError as e:
+                        if not self._listener.is_cancelled:
+                            self._on_download_error(str(e))
+                        return
             if self.is_playlist and (
                 not ospath.exists(path) or len(listdir(path)) == 0
             ):
@@ -340,7 +400,9 @@ class YoutubeDLHelper:
             await self._listener.on_download_error(limit_exceeded, is_limit=True)
             return
 
-        add_to_queue, event = await check_running_tasks(self._listener)
+        add_to_queue, event = await check_running_tasks(
+            self._listener, engine="ytdlp"
+        )
         if add_to_queue:
             LOGGER.info(f"Added to Queue/Download: {self._listener.name}")
             async with task_dict_lock:
@@ -0,0 +1,226 @@
+from aiofiles import open as aiopen
+from aiohttp import ClientError, ClientSession, ClientTimeout, TCPConnector
+from asyncio import Lock, TimeoutError as AsyncTimeoutError, sleep
+from google.auth.transport.requests import Request
+from logging import getLogger
+from os import path as ospath
+from random import uniform
+
+from ...ext_utils.bot_utils import sync_to_async
+
+LOGGER = getLogger(__name__)
+
+DRIVE_API = "https://www.googleapis.com/drive/v3"
+UPLOAD_API = "https://www.googleapis.com/upload/drive/v3"
+RETRY_STATUS = {429, 500, 502, 503, 504}
+RETRY_REASONS = {"rateLimitExceeded", "backendError", "internalError"}
+
+
+class DriveError(Exception):
+    def __init__(self, status, reason, message):
+        self.status = status
+        self.reason = reason
+        super().__init__(f"<HttpError {status}: {message} (reason: {reason})>")
+
+
+class AsyncDrive:
+    """Thin coroutine client for the Drive v3 endpoints used by the bot.
+
+    All clients share one pooled session, so concurrent Drive tasks reuse
+    keep-alive connections instead of holding a thread and socket each.
+    """
+
+    _session = None
+    max_retries = 5
+
+    def __init__(self, credentials):
+        self._credentials = credentials
+        self._token_lock = Lock()
+
+    @classmethod
+    def session(cls):
+        if cls._session is None or cls._session.closed:
+            cls._session = ClientSession(
+                connector=TCPConnector(
+                    limit=100, ttl_dns_cache=300, enable_cleanup_closed=True
+                ),
+                timeout=ClientTimeout(total=None, sock_connect=30, sock_read=300),
+            )
+        return cls._session
+
+    @classmethod
+    async def close(cls):
+        if cls._session is not None and not cls._session.closed:
+            await cls._session.close()
+        cls._session = None
+
+    async def _auth_headers(self):
+        if self._credentials is None:
+            raise DriveError(401, "authError", "No Drive credentials available")
+        if not self._credentials.valid:
+            async with self._token_lock:
+                if not self._credentials.valid:
+                    await sync_to_async(self._credentials.refresh, Request())
+        return {"Authorization": f"Bearer {self._credentials.token}"}
+
+    @staticmethod
+    async def _error_from(resp):
+        reason, message = "", resp.reason
+        try:
+            error = (await resp.json(content_type=None)).get("error", {})
+            message = error.get("message", message)
+            if errors := error.get("errors"):
+                reason = errors[0].get("reason", "")
+        except Exception:
+            pass
+        return DriveError(resp.status, reason, message)
+
+    async def _request(
+        self, method, url, params=None, json=None, headers=None, return_headers=False
+    ):
+        """Send one request with backoff on 429/5xx and transient quota errors."""
+        attempt = 0
+        while True:
+            req_headers = await self._auth_headers()
+            if headers:
+                req_headers.update(headers)
+            try:
+                async with self.session().request(
+                    method, url, params=params, json=json, headers=req_headers
+                ) as resp:
+                    if resp.status < 300:
+                        if return_headers:
+                            return resp.headers
+                        if resp.status == 204:
+                            return {}
+                        return await resp.json(content_type=None)
+                    err = await self._error_from(resp)
+                    if resp.status == 401 and attempt == 0:
+                        self._credentials.token = None
+                        self._credentials.expiry = None
+                    elif (
+                        resp.status not in RETRY_STATUS
+                        and err.reason not in RETRY_REASONS
+                    ):
+                        raise err
+            except (ClientError, AsyncTimeoutError) as e:
+                err = e
+            attempt += 1
+            if attempt >= self.max_retries:
+                raise err
+            delay = min(2**attempt, 32) + uniform(0, 1)
+            LOGGER.warning(f"Drive {method} retry {attempt} in {delay:.1f}s: {err}")
+            await sleep(delay)
+
+    async def files_get(self, file_id, fields="name, id, mimeType, size"):
+        return await self._request(
+            "GET",
+            f"{DRIVE_API}/files/{file_id}",
+            params={"supportsAllDrives": "true", "fields": fields},
+        )
+
+    async def files_list(self, **params):
+        params.setdefault("supportsAllDrives", "true")
+        params.setdefault("includeItemsFromAllDrives", "true")
+        return await self._request("GET", f"{DRIVE_API}/files", params=params)
+
+    async def files_create(self, body):
+        return await self._request(
+            "POST",
+            f"{DRIVE_API}/files",
+            params={"supportsAllDrives": "true"},
+            json=body,
+        )
+
+    async def files_copy(self, file_id, body):
+        return await self._request(
+            "POST",
+            f"{DRIVE_API}/files/{file_id}/copy",
+            params={"supportsAllDrives": "true"},
+            json=body,
+        )
+
+    async def files_delete(self, file_id):
+        return await self._request(
+            "DELETE",
+            f"{DRIVE_API}/files/{file_id}",
+            params={"supportsAllDrives": "true"},
+        )
+
+    async def permissions_create(self, file_id, body):
+        return await self._request(
+            "POST",
+            f"{DRIVE_API}/files/{file_id}/permissions",
+            params={"supportsAllDrives": "true"},
+            json=body,
+        )
+
+    async def upload_file(
+        self, file_path, metadata, chunk_size=100 * 1024 * 1024, on_progress=None
+    ):
+        """Resumable upload; ``on_progress(uploaded, total)`` runs after each chunk.
+
+        Returns ``None`` when ``on_progress`` returns ``False`` to cancel.
+        """
+        total = ospath.getsize(file_path)
+        if total == 0:
+            return await self.files_create(metadata)
+        resp_headers = await self._request(
+            "POST",
+            f"{UPLOAD_API}/files",
+            params={"uploadType": "resumable", "supportsAllDrives": "true"},
+            json=metadata,
+            headers={
+                "X-Upload-Content-Type": metadata.get(
+                    "mimeType", "application/octet-stream"
+                ),
+                "X-Upload-Content-Length": str(total),
+            },
+            return_headers=True,
+        )
+        session_url = resp_headers["Location"]
+        offset = 0
+        retries = 0
+        async with aiopen(file_path, "rb") as f:
+            while True:
+                await f.seek(offset)
+                data = await f.read(chunk_size)
+                end = offset + len(data) - 1
+                headers = await self._auth_headers()
+                headers["Content-Range"] = f"bytes {offset}-{end}/{total}"
+                try:
+                    async with self.session().put(
+                        session_url, data=data, headers=headers
+                    ) as resp:
+                        if resp.status in (200, 201):
+                            if on_progress is not None:
+                                on_progress(total, total)
+                            return await resp.json(content_type=None)
+                        if resp.status == 308:
+                            rng = resp.headers.get("Range")
+                            offset = int(rng.rsplit("-", 1)[1]) + 1 if rng else 0
+                            retries = 0
+                            if on_progress is not None and (
+                                on_progress(offset, total) is False
+                            ):
+                                return None
+                            continue
+                        err = await self._error_from(resp)
+                        if resp.status not in RETRY_STATUS or retries >= 10:
+                            raise err
+                except (ClientError, AsyncTimeoutError) as e:
+                    if retries >= 10:
+                        raise
+                    err = e
+                retries += 1
+                LOGGER.warning(f"Drive upload chunk retry {retries}: {err}")
+                await sleep(min(2**retries, 32))
+                offset = await self._upload_offset(session_url, total)
+
+    async def _upload_offset(self, session_url, total):
+        headers = await self._auth_headers()
+        headers["Content-Range"] = f"bytes */{total}"
+        async with self.session().put(session_url, headers=headers) as resp:
+            if resp.status == 308 and (rng := resp.headers.get("Range")):
+                return int(rng.rsplit("-", 1)[1]) + 1
+        return 0
@@ -1,5 +1,5 @@
+from asyncio import Semaphore, gather
 from logging import getLogger
-from tenacity import RetryError
 
 from ...mirror_leech_utils.gdrive_utils.helper import GoogleDriveHelper
 
@@ -9,8 +9,9 @@ LOGGER = getLogger(__name__)
 class GoogleDriveCount(GoogleDriveHelper):
     def __init__(self):
         super().__init__()
+        self._walk_limit = Semaphore(8)
 
-    def count(self, link, user_id):
+    async def count(self, link, user_id):
         try:
             file_id = self.get_id_from_url(link, user_id)
         except (KeyError, IndexError):
@@ -21,33 +22,30 @@ class GoogleDriveCount(GoogleDriveHelper):
                 None,
                 None,
             )
-        self.service = self.authorize()
+        self.drive = self.authorize_async()
         LOGGER.info(f"File ID: {file_id}")
         try:
-            return self._proceed_count(file_id)
+            return await self._proceed_count(file_id)
         except Exception as err:
-            if isinstance(err, RetryError):
-                LOGGER.info(f"Total Attempts: {err.last_attempt.attempt_number}")
-                err = err.last_attempt.exception()
             err = str(err).replace(">", "").replace("<", "")
             if "File not found" in err:
                 if not self.alt_auth and self.use_sa:
                     self.alt_auth = True
                     self.use_sa = False
                     LOGGER.error("File not found. Trying with token.pickle...")
-                    return self.count(link, user_id)
+                    return await self.count(link, user_id)
                 msg = "File not found."
             else:
                 msg = f"Error.\n{err}"
         return msg, None, None, None, None
 
-    def _proceed_count(self, file_id):
-        meta = self.get_file_metadata(file_id)
+    async def _proceed_count(self, file_id):
+        meta = await self.get_file_metadata_async(file_id)
         name = meta["name"]
         LOGGER.info(f"Counting: {name}")
         mime_type = meta.get("mimeType")
         if mime_type == self.G_DRIVE_DIR_MIME_TYPE:
-            self._gdrive_directory(meta)
+            await self._gdrive_directory(meta)
             mime_type = "Folder"
         else:
             if mime_type is None:
@@ -60,21 +58,23 @@ class GoogleDriveCount(GoogleDriveHelper):
         size = int(filee.get("size", 0))
         self.proc_bytes += size
 
-    def _gdrive_directory(self, drive_folder):
-        files = self.get_files_by_folder_id(drive_folder["id"])
-        if len(files) == 0:
-            return
+    async def _gdrive_directory(self, drive_folder):
+        async with self._walk_limit:
+            files = await self.get_files_by_folder_id_async(drive_folder["id"])
+        subfolders = []
         for filee in files:
             shortcut_details = filee.get("shortcutDetails")
             if shortcut_details is not None:
                 mime_type = shortcut_details["targetMimeType"]
                 file_id = shortcut_details["targetId"]
-                filee = self.get_file_metadata(file_id)
+                filee = await self.get_file_metadata_async(file_id)
             else:
                 mime_type = filee.get("mimeType")
             if mime_type == self.G_DRIVE_DIR_MIME_TYPE:
                 self.total_folders += 1
-                self._gdrive_directory(filee)
+                subfolders.append(filee)
             else:
                 self.total_files += 1
                 self._gdrive_file(filee)
+        if subfolders:
+            await gather(*(self._gdrive_directory(f) for f in subfolders))
@@ -17,6 +17,7 @@ from tenacity import (
 
 from ....core.config_manager import Config
 from ...ext_utils.links_utils import is_gdrive_id
+from .aio_drive import AsyncDrive
 
 LOGGER = getLogger(__name__)
 getLogger("googleapiclient.discovery").setLevel(ERROR)
@@ -39,6 +40,7 @@ class GoogleDriveHelper:
         self.sa_number = 100
         self.alt_auth = False
         self.service = None
+        self.drive = None
         self.total_files = 0
         self.total_folders = 0
         self.file_processed_bytes = 0
@@ -69,7 +71,7 @@ class GoogleDriveHelper:
             self.proc_bytes += chunk_size
             self.total_time += self.update_interval
 
-    def authorize(self):
+    def _get_credentials(self):
         credentials = None
         if self.use_sa:
             json_files = listdir("accounts")
@@ -85,10 +87,17 @@ class GoogleDriveHelper:
                 credentials = pload(f)
         else:
             LOGGER.error("token.pickle not found!")
+        return credentials
+
+    def authorize(self):
+        credentials = self._get_credentials()
         authorized_http = AuthorizedHttp(credentials, http=build_http())
         authorized_http.http.disable_ssl_certificate_validation = True
         return build("drive", "v3", http=authorized_http, cache_discovery=False)
 
+    def authorize_async(self):
+        return AsyncDrive(self._get_credentials())
+
     def switch_service_account(self):
         if self.sa_index == self.sa_number - 1:
             self.sa_index = 0
@@ -96,7 +105,10 @@ class GoogleDriveHelper:
             self.sa_index += 1
         self.sa_count += 1
         LOGGER.info(f"Switching to {self.sa_index} index")
-        self.service = self.authorize()
+        if self.drive is not None:
+            self.drive = self.authorize_async()
+        else:
+            self.service = self.authorize()
 
     def get_id_from_url(self, link, user_id=""):
         if user_id and link.startswith("mtp:"):
@@ -213,6 +225,55 @@ class GoogleDriveHelper:
         LOGGER.info(f"Created G-Drive Folder:\nName: {file.get('name')}\nID: {file_id}")
         return file_id
 
+    async def set_permission_async(self, file_id):
+        return await self.drive.permissions_create(
+            file_id, {"role": "reader", "type": "anyone"}
+        )
+
+    async def get_file_metadata_async(self, file_id):
+        return await self.drive.files_get(file_id)
+
+    async def get_files_by_folder_id_async(self, folder_id, item_type=""):
+        page_token = None
+        files = []
+        if not item_type:
+            q = f"'{folder_id}' in parents and trashed = false"
+        elif item_type == "folders":
+            q = f"'{folder_id}' in parents and mimeType = '{self.G_DRIVE_DIR_MIME_TYPE}' and trashed = false"
+        else:
+            q = f"'{folder_id}' in parents and mimeType != '{self.G_DRIVE_DIR_MIME_TYPE}' and trashed = false"
+        while True:
+            params = {
+                "q": q,
+                "spaces": "drive",
+                "pageSize": 200,
+                "fields": "nextPageToken, files(id, name, mimeType, size, shortcutDetails)",
+                "orderBy": "folder, name",
+            }
+            if page_token:
+                params["pageToken"] = page_token
+            response = await self.drive.files_list(**params)
+            files.extend(response.get("files", []))
+            page_token = response.get("nextPageToken")
+            if page_token is None:
+                break
+        return files
+
+    async def create_directory_async(self, directory_name, dest_id):
+        file_metadata = {
+            "name": directory_name,
+            "description": "Uploaded by Mirror-leech-telegram-bot",
+            "mimeType": self.G_DRIVE_DIR_MIME_TYPE,
+        }
+        if dest_id is not None:
+            file_metadata["parents"] = [dest_id]
+        file = await self.drive.files_create(file_metadata)
+        file_id = file.get("id")
+        if not Config.IS_TEAM_DRIVE:
+            await self.set_permission_async(file_id)
+        LOGGER.info(f"Created G-Drive Folder:\nName: {file.get('name')}\nID: {file_id}")
+        return file_id
+
     def escapes(self, estr):
         chars = ["\\", "'", '"', r"\a", r"\b", r"\f", r"\n", r"\r", r"\t"]
         for char in chars:
@@ -12,7 +12,7 @@ from ...ext_utils.status_utils import (
 
 async def get_download(gid, old_info=None):
     try:
-        res = await TorrentManager.aria2.tellStatus(gid)
+        res = await TorrentManager.get_aria2_download(gid)
         return res or old_info
     except Exception as e:
         LOGGER.error(f"{e}: Aria2c, Error while getting torrent info")
@@ -1,4 +1,5 @@
 from .... import LOGGER
+from ...ext_utils.cpu_scheduler import CpuScheduler
 from ...ext_utils.status_utils import (
     get_readable_file_size,
     EngineStatus,
@@ -46,6 +47,9 @@ class FFmpegStatus:
         else:
             return MirrorStatus.STATUS_FFMPEG
 
+    def queue_position(self):
+        return CpuScheduler.position(self.listener.mid)
+
     def task(self):
         return self
 
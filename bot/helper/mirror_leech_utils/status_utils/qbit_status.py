@@ -12,7 +12,7 @@ from ...ext_utils.status_utils import (
 
 async def get_download(tag, old_info=None):
     try:
-        res = (await TorrentManager.qbittorrent.torrents.info(tag=tag))[0]
+        res = await TorrentManager.get_qbit_torrent(tag)
         return res or old_info
     except Exception as e:
         LOGGER.error(f"{e}: Qbittorrent, while getting torrent info. Tag: {tag}")
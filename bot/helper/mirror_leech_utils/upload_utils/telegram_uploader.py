@@ -1,13 +1,14 @@
-from asyncio import sleep, Semaphore, create_task, gather
+from asyncio import Condition, Lock, Queue, QueueEmpty, create_task, gather, sleep
 from logging import getLogger
-from os import path as ospath, walk
+from os import path as ospath
 from re import match as re_match, sub as re_sub
 from time import time
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Optional, Tuple
 
 from aioshutil import rmtree
 from natsort import natsorted
 from PIL import Image
+from pyrogram.enums import ChatMemberStatus
 from pyrogram.errors import BadRequest, FloodWait, RPCError
 
 try:
@@ -28,6 +29,7 @@ from tenacity import (
     RetryError,
     retry,
     retry_if_exception_type,
+    retry_if_not_exception_type,
     stop_after_attempt,
     wait_exponential,
 )
@@ -35,7 +37,8 @@ from tenacity import (
 from ....core.config_manager import Config
 from ....core.tg_client import TgClient
 from ...ext_utils.bot_utils import sync_to_async
-from ...ext_utils.files_utils import get_base_name, is_archive
+from ...ext_utils.files_utils import FileSlice, get_base_name, get_tree, is_archive
+from ...ext_utils.leech_cache import LeechCache
 from ...ext_utils.status_utils import get_readable_file_size, get_readable_time
 from ...ext_utils.media_utils import (
     get_audio_thumbnail,
@@ -50,9 +53,117 @@ from ...telegram_helper.message_utils import delete_message
 LOGGER = getLogger(__name__)
 
 
+class SessionLimiter:
+    """AIMD concurrency limit for one Telegram session, shared by all uploads."""
+
+    def __init__(self, limit=4, max_limit=8):
+        self.limit = limit
+        self.max_limit = max_limit
+        self._active = 0
+        self._successes = 0
+        self._cond = Condition()
+
+    async def __aenter__(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self.limit)
+            self._active += 1
+        return self
+
+    async def __aexit__(self, *_):
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def on_success(self):
+        self._successes += 1
+        if self._successes >= self.limit and self.limit < self.max_limit:
+            self.limit += 1
+            self._successes = 0
+
+    def on_flood(self):
+        self.limit = max(1, self.limit // 2)
+        self._successes = 0
+
+
+_session_limiters: Dict[str, SessionLimiter] = {}
+
+
+def get_session_limiter(key):
+    if key not in _session_limiters:
+        _session_limiters[key] = SessionLimiter()
+    return _session_limiters[key]
+
+
+_dump_admins: Dict[Tuple[int, str], Tuple[bool, float]] = {}
+_dump_chat_ids: Dict[str, int] = {}
+# helpers that failed the admin check are asked again after this long
+_DUMP_RECHECK = 300
+
+_GROUP_PART = r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+$)"
+
+
+def upload_units(file_list):
+    """Group ``(dirpath, file_, f_path)`` entries so parts of one split or
+    media group stay together, in order, and every other file is its own unit.
+    """
+    units = {}
+    for file_info in file_list:
+        match = re_match(_GROUP_PART, file_info[2])
+        units.setdefault(match.group(0) if match else file_info[2], []).append(
+            file_info
+        )
+    return list(units.values())
+
+
+async def get_upload_helpers():
+    """Helper bots that can post in LEECH_DUMP_CHAT, admins are cached for good
+    while failed checks expire after ``_DUMP_RECHECK``"""
+    if not (TgClient.helper_bots and Config.LEECH_DUMP_CHAT):
+        return []
+    helpers = []
+    for index, hbot in list(TgClient.helper_bots.items()):
+        key = (index, str(Config.LEECH_DUMP_CHAT))
+        is_admin, checked = _dump_admins.get(key, (False, 0))
+        if not is_admin and time() - checked > _DUMP_RECHECK:
+            try:
+                member = await hbot.get_chat_member(Config.LEECH_DUMP_CHAT, hbot.me.id)
+                is_admin = member.status in (
+                    ChatMemberStatus.ADMINISTRATOR,
+                    ChatMemberStatus.OWNER,
+                )
+            except Exception as e:
+                LOGGER.warning(
+                    f"Helper @{hbot.me.username} can't access LEECH_DUMP_CHAT: {e}"
+                )
+            _dump_admins[key] = (is_admin, time())
+        if is_admin:
+            helpers.append(index)
+    return helpers
+
+
+async def get_dump_chat_id():
+    """LEECH_DUMP_CHAT as a chat id, @usernames resolved once"""
+    key = str(Config.LEECH_DUMP_CHAT)
+    if key not in _dump_chat_ids:
+        try:
+            chat = await TgClient.bot.get_chat(Config.LEECH_DUMP_CHAT)
+        except Exception as e:
+            LOGGER.warning(f"Unable to resolve LEECH_DUMP_CHAT: {e}")
+            return None
+        _dump_chat_ids[key] = chat.id
+    return _dump_chat_ids[key]
+
+
+_rpc_retry = retry(
+    wait=wait_exponential(multiplier=1.5, min=2, max=6),
+    stop=stop_after_attempt(2),
+    retry=retry_if_exception_type(RPCError)
+    & retry_if_not_exception_type((FloodWait, FloodPremiumWait)),
+)
+
+
 class TelegramUploader:
     def __init__(self, listener, path):
-        self._last_uploaded = 0
         self._processed_bytes = 0
         self._listener = listener
         self._path = path
@@ -63,10 +174,8 @@ class TelegramUploader:
         self._thumb = self._listener.thumb or f"thumbnails/{listener.user_id}.jpg"
         self._msgs_dict = {}
         self._corrupted = 0
-        self._is_corrupted = False
         self._media_dict = {"videos": {}, "documents": {}}
         self._last_msg_in_group = False
-        self._up_path = ""
         self._lprefix = ""
         self._lsuffix = ""
         self._lcaption = ""
@@ -78,28 +187,25 @@ class TelegramUploader:
         self._log_msg = None
         self._user_session = self._listener.user_transmission
         self._error = ""
-        
-        # Hardcoded optimization values
-        self._upload_semaphore = Semaphore(4)  # 4 concurrent uploads
         self._thumbnail_cache: Dict[str, Optional[str]] = {}
-        self._last_progress_update = 0
-        self._progress_update_interval = 1048576  # 1MB
-        self._batch_size = 6  # Files per batch
-        self._file_queue: List[Tuple[str, str, str]] = []
+        self._anchors = {}
+        self._virtual = {}
+        self._virtual_left = {}
+        self._group_lock = Lock()
+        self._pipeline_workers = 8
+        self._is_log_del = False
 
-    async def _upload_progress(self, current, total):
-        if self._listener.is_cancelled:
-            if self._user_session:
-                TgClient.user.stop_transmission()
-            else:
-                self._listener.client.stop_transmission()
-        
-        # Throttle progress updates to reduce overhead
-        chunk_size = current - self._last_uploaded
-        if chunk_size >= self._progress_update_interval or current == total:
-            self._last_uploaded = current
-            self._processed_bytes += chunk_size
-            self._last_progress_update = time()
+    def _upload_progress(self, client):
+        last_uploaded = 0
+
+        async def _progress(current, _):
+            nonlocal last_uploaded
+            if self._listener.is_cancelled:
+                client.stop_transmission()
+            self._processed_bytes += current - last_uploaded
+            last_uploaded = current
+
+        return _progress
 
     async def _user_settings(self):
         settings_map = {
@@ -201,7 +307,7 @@ class TelegramUploader:
             LOGGER.warning(f"Thumbnail generation failed for {file_path}: {e}")
             return None
 
-    async def _prepare_file(self, pre_file_, dirpath):
+    async def _prepare_file(self, pre_file_, dirpath, up_path):
         cap_file_ = file_ = pre_file_
 
         if self._lprefix:
@@ -234,16 +340,21 @@ class TelegramUploader:
             parts[0] = re_sub(
                 r"\{([^}]+)\}", lambda m: f"{{{m.group(1).lower()}}}", parts[0]
             )
-            up_path = ospath.join(dirpath, pre_file_)
-            dur, qual, lang, subs = await get_media_info(up_path, True)
+            if virtual := self._virtual.get(up_path):
+                media_path, f_size = virtual[0], virtual[2]
+                md5_args = virtual
+            else:
+                media_path, f_size = up_path, await aiopath.getsize(up_path)
+                md5_args = (up_path,)
+            dur, qual, lang, subs = await get_media_info(media_path, True)
             cap_mono = parts[0].format(
                 filename=cap_file_,
-                size=get_readable_file_size(await aiopath.getsize(up_path)),
+                size=get_readable_file_size(f_size),
                 duration=get_readable_time(dur),
                 quality=qual,
                 languages=lang,
                 subtitles=subs,
-                md5_hash=await sync_to_async(get_md5_hash, up_path),
+                md5_hash=await sync_to_async(get_md5_hash, *md5_args),
                 mime_type=self._listener.file_details.get("mime_type", "text/plain"),
                 prefilename=self._listener.file_details.get("filename", ""),
                 precaption=self._listener.file_details.get("caption", ""),
@@ -285,10 +396,13 @@ class TelegramUploader:
 
         if pre_file_ != file_:
             new_path = ospath.join(dirpath, file_)
-            await rename(self._up_path, new_path)
-            self._up_path = new_path
+            if up_path in self._virtual:
+                self._virtual[new_path] = self._virtual.pop(up_path)
+            else:
+                await rename(up_path, new_path)
+            up_path = new_path
 
-        return cap_mono
+        return cap_mono, up_path
 
     def _get_input_media(self, subkey, key):
         rlist = []
@@ -356,13 +470,13 @@ class TelegramUploader:
         except Exception as e:
             LOGGER.error(f"Failed to send media group: {e}")
 
-    async def _copy_media(self):
+    async def _copy_media(self, sent_msg):
         try:
             if self._bot_pm:
                 await TgClient.bot.copy_message(
                     chat_id=self._listener.user_id,
-                    from_chat_id=self._sent_msg.chat.id,
-                    message_id=self._sent_msg.id,
+                    from_chat_id=sent_msg.chat.id,
+                    message_id=sent_msg.id,
                     reply_to_message_id=(
                         self._listener.pm_msg.id if self._listener.pm_msg else None
                     ),
@@ -376,146 +490,215 @@ class TelegramUploader:
         file_list = []
         total_size = 0
         
-        for dirpath, _, files in natsorted(await sync_to_async(walk, self._path)):
-            if dirpath.strip().endswith(("/yt-dlp-thumb", "_mltbss")):
+        _, files = await get_tree(self._path)
+        for entry in natsorted(files, key=lambda e: (e.dirpath, e.name)):
+            if entry.dirpath.strip().endswith(("/yt-dlp-thumb", "_mltbss")):
                 continue
-            
-            for file_ in natsorted(files):
-                f_path = ospath.join(dirpath, file_)
-                if await aiopath.exists(f_path):
-                    f_size = await aiopath.getsize(f_path)
-                    if f_size > 0:
-                        file_list.append((dirpath, file_, f_path))
-                        total_size += f_size
-                    else:
-                        LOGGER.warning(f"Skipping zero-size file: {f_path}")
-                        self._corrupted += 1
-        
+            if split_size := self._listener.virtual_splits.get(entry.path):
+                file_list.extend(
+                    self._virtual_parts(
+                        entry.dirpath, entry.name, entry.size, split_size
+                    )
+                )
+                total_size += entry.size
+            elif entry.size > 0:
+                file_list.append((entry.dirpath, entry.name, entry.path))
+                total_size += entry.size
+            else:
+                LOGGER.warning(f"Skipping zero-size file: {entry.path}")
+                self._corrupted += 1
+
         self._total_size = total_size
         return file_list
 
+    def _virtual_parts(self, dirpath, file_, f_size, split_size):
+        """List ``file_`` as ``.001``, ``.002``, ... parts read in place."""
+        f_path = ospath.join(dirpath, file_)
+        parts = []
+        for index, offset in enumerate(range(0, f_size, split_size), start=1):
+            part = f"{file_}.{index:03d}"
+            part_path = ospath.join(dirpath, part)
+            self._virtual[part_path] = (
+                f_path,
+                offset,
+                min(split_size, f_size - offset),
+            )
+            parts.append((dirpath, part, part_path))
+        self._virtual_left[f_path] = len(parts)
+        return parts
+
+    async def _release_part(self, up_path):
+        f_path = self._virtual.pop(up_path)[0]
+        self._virtual_left[f_path] -= 1
+        if self._virtual_left[f_path] == 0 and not self._listener.is_cancelled:
+            await remove(f_path)
+
+    async def _reply_target(self, user_session):
+        key = "user" if user_session else "bot"
+        if key not in self._anchors:
+            client = TgClient.user if user_session else self._listener.client
+            anchor = next(iter(self._anchors.values()))
+            self._anchors[key] = await client.get_messages(
+                chat_id=anchor.chat.id, message_ids=anchor.id
+            )
+        return self._anchors[key]
+
     async def _upload_file_worker(self, file_info):
-        """Worker function for concurrent file uploads"""
+        """Prepare and upload one file, keeping all per-file state local"""
         dirpath, file_, f_path = file_info
-        
-        async with self._upload_semaphore:
-            try:
-                if self._listener.is_cancelled:
-                    return False
-                
-                self._up_path = f_path
+        up_path = f_path
+
+        try:
+            if self._listener.is_cancelled:
+                return False
+
+            if virtual := self._virtual.get(f_path):
+                f_size = virtual[2]
+            else:
                 f_size = await aiopath.getsize(f_path)
-                self._total_files += 1
-                
-                # Optimize session selection based on file size
-                if self._listener.hybrid_leech and self._listener.user_transmission:
-                    use_user_session = f_size > 1073741824  # 1GB threshold
-                    if use_user_session != self._user_session:
-                        self._user_session = use_user_session
-                        if self._user_session:
-                            self._sent_msg = await TgClient.user.get_messages(
-                                chat_id=self._sent_msg.chat.id,
-                                message_ids=self._sent_msg.id,
-                            )
-                        else:
-                            self._sent_msg = await self._listener.client.get_messages(
-                                chat_id=self._sent_msg.chat.id,
-                                message_ids=self._sent_msg.id,
+            self._total_files += 1
+
+            user_session = self._user_session
+            if self._listener.hybrid_leech and self._listener.user_transmission:
+                user_session = f_size > 1073741824
+
+            cap_mono, up_path = await self._prepare_file(file_, dirpath, f_path)
+            helper_index = None
+            if not user_session and (helpers := await get_upload_helpers()):
+                helper_index = min(helpers, key=lambda i: TgClient.helper_loads[i])
+            if user_session:
+                limiter = get_session_limiter("user")
+            elif helper_index is not None:
+                limiter = get_session_limiter(f"helper{helper_index}")
+                TgClient.helper_loads[helper_index] += 1
+            else:
+                limiter = get_session_limiter("bot")
+            helper = TgClient.helper_bots.get(helper_index)
+            # one tracker per file, so retries replace the bytes already counted
+            progress = self._upload_progress(
+                helper or (TgClient.user if user_session else self._listener.client)
+            )
+            try:
+                while True:
+                    try:
+                        async with limiter:
+                            if self._listener.is_cancelled:
+                                return False
+                            sent_msg = await self._upload_file(
+                                cap_mono,
+                                file_,
+                                up_path,
+                                user_session,
+                                progress,
+                                helper,
                             )
-                
-                cap_mono = await self._prepare_file(file_, dirpath)
-                self._last_uploaded = 0
-                
-                await self._upload_file(cap_mono, file_, f_path)
-                
-                if (
-                    not self._is_corrupted
-                    and (self._listener.is_super_chat or self._listener.up_dest)
-                    and not self._is_private
-                ):
-                    self._msgs_dict[self._sent_msg.link] = file_
-                
-                # Reduced sleep for better performance
-                await sleep(0.05)
-                return True
-                
-            except Exception as err:
-                if isinstance(err, RetryError):
-                    LOGGER.info(f"Total Attempts: {err.last_attempt.attempt_number}")
-                    err = err.last_attempt.exception()
-                
-                LOGGER.error(f"{err}. Path: {f_path}", exc_info=True)
-                self._error = str(err)
-                self._corrupted += 1
-                return False
-            
+                        break
+                    except (FloodWait, FloodPremiumWait) as f:
+                        # wait outside the session slot so other files can go on
+                        LOGGER.warning(f"Rate limited: {f}")
+                        limiter.on_flood()
+                        await sleep(f.value * 1.05)
             finally:
-                # Clean up uploaded file
-                if not self._listener.is_cancelled and await aiopath.exists(f_path):
-                    await remove(f_path)
+                if helper_index in TgClient.helper_loads:
+                    TgClient.helper_loads[helper_index] -= 1
+            if sent_msg is None:
+                return False
+            limiter.on_success()
+            self._sent_msg = sent_msg
+
+            if (
+                self._listener.is_super_chat or self._listener.up_dest
+            ) and not self._is_private:
+                self._msgs_dict[sent_msg.link] = file_
+
+            if (
+                not self._is_log_del
+                and self._log_msg
+                and getattr(Config, "CLEAN_LOG_MSG", True)
+            ):
+                self._is_log_del = True
+                await delete_message(self._log_msg)
+            return True
+
+        except Exception as err:
+            if isinstance(err, RetryError):
+                LOGGER.info(f"Total Attempts: {err.last_attempt.attempt_number}")
+                err = err.last_attempt.exception()
+
+            LOGGER.error(f"{err}. Path: {up_path}", exc_info=True)
+            self._error = str(err)
+            self._corrupted += 1
+            return False
+
+        finally:
+            if up_path in self._virtual:
+                await self._release_part(up_path)
+            elif not self._listener.is_cancelled and await aiopath.exists(up_path):
+                await remove(up_path)
+
+    async def _pipeline_worker(self, queue):
+        successful = 0
+        while not self._listener.is_cancelled:
+            try:
+                unit = queue.get_nowait()
+            except QueueEmpty:
+                break
+            # parts of one split go up in order so groups and replies keep it
+            for file_info in unit:
+                if self._listener.is_cancelled:
+                    break
+                if await self._upload_file_worker(file_info):
+                    successful += 1
+        return successful
 
     async def upload(self):
         await self._user_settings()
         res = await self._msg_to_reply()
         if not res:
             return
-        
-        is_log_del = False
-        successful_uploads = 0
-        
+
         # Handle special directories first
-        for dirpath, _, files in natsorted(await sync_to_async(walk, self._path)):
-            if dirpath.strip().endswith("/yt-dlp-thumb"):
-                continue
+        dirs, files = await get_tree(self._path)
+        for dirpath in natsorted(dirs):
             if dirpath.strip().endswith("_mltbss"):
-                await self._send_screenshots(dirpath, files)
+                await self._send_screenshots(
+                    dirpath, [e.name for e in files if e.dirpath == dirpath]
+                )
                 await rmtree(dirpath, ignore_errors=True)
-                continue
-        
+
         # Collect all files for upload
         file_list = await self._collect_files()
-        
+
         if not file_list:
             await self._listener.on_upload_error(
                 "No files to upload. In case you have filled EXCLUDED_EXTENSIONS, then check if all files have those extensions or not."
             )
             return
-        
+
         total_files = len(file_list)
         LOGGER.info(f"Starting upload of {total_files} files with total size: {get_readable_file_size(self._total_size)}")
-        
-        # Process files in batches for better performance
-        for i in range(0, len(file_list), self._batch_size):
-            if self._listener.is_cancelled:
-                return
-            
-            batch = file_list[i:i + self._batch_size]
-            
-            # Create upload tasks for current batch
-            upload_tasks = [
-                create_task(self._upload_file_worker(file_info))
-                for file_info in batch
-            ]
-            
-            # Wait for batch completion
-            results = await gather(*upload_tasks, return_exceptions=True)
-            
-            # Count successful uploads
-            for result in results:
-                if result is True:
-                    successful_uploads += 1
-                elif isinstance(result, Exception):
-                    LOGGER.error(f"Upload task failed: {result}")
-            
-            # Delete log message after first successful batch
-            if not is_log_del and successful_uploads > 0 and self._log_msg and getattr(Config, 'CLEAN_LOG_MSG', True):
-                await delete_message(self._log_msg)
-                is_log_del = True
-            
-            # Small delay between batches
-            if i + self._batch_size < len(file_list):
-                await sleep(0.1)
-        
+
+        # Units are pulled by a fixed set of workers, no barrier between them;
+        # the real concurrency is bounded by each session's adaptive limiter
+        self._anchors = {"user" if self._user_session else "bot": self._sent_msg}
+        units = upload_units(file_list)
+        queue = Queue()
+        for unit in units:
+            queue.put_nowait(unit)
+        results = await gather(
+            *(
+                create_task(self._pipeline_worker(queue))
+                for _ in range(min(self._pipeline_workers, len(units)))
+            ),
+            return_exceptions=True,
+        )
+        successful_uploads = 0
+        for result in results:
+            if isinstance(result, Exception):
+                LOGGER.error(f"Upload worker failed: {result}")
+            else:
+                successful_uploads += result
+
         # Handle remaining media groups
         for key, value in list(self._media_dict.items()):
             for subkey, msgs in list(value.items()):
@@ -524,33 +707,139 @@ class TelegramUploader:
                         await self._send_media_group(subkey, key, msgs)
                     except Exception as e:
                         LOGGER.error(f"Failed to send remaining media group: {e}")
-        
+
         if self._listener.is_cancelled:
             return
-        
+
         if successful_uploads == 0:
             await self._listener.on_upload_error(
                 f"No files uploaded successfully. {self._error or 'Check logs!'}"
             )
             return
-        
+
         if successful_uploads <= self._corrupted:
             await self._listener.on_upload_error(
                 f"Most files corrupted or unable to upload. Successful: {successful_uploads}, Corrupted: {self._corrupted}. {self._error or 'Check logs!'}"
             )
             return
-        
+
         LOGGER.info(f"Leech Completed: {self._listener.name} - {successful_uploads}/{total_files} files uploaded")
         await self._listener.on_upload_complete(
             None, self._msgs_dict, successful_uploads, self._corrupted
         )
 
-    @retry(
-        wait=wait_exponential(multiplier=1.5, min=2, max=6),
-        stop=stop_after_attempt(2),
-        retry=retry_if_exception_type((FloodWait, FloodPremiumWait, RPCError)),
-    )
-    async def _upload_file(self, cap_mono, file, o_path, force_document=False):
+    async def _register_sent(self, sent_msg, up_path):
+        if (
+            not self._listener.is_cancelled
+            and self._media_group
+            and (sent_msg.video or sent_msg.document)
+        ):
+            key = "documents" if sent_msg.document else "videos"
+            if match := re_match(_GROUP_PART, up_path):
+                pname = match.group(0)
+                async with self._group_lock:
+                    self._media_dict[key].setdefault(pname, []).append(
+                        [sent_msg.chat.id, sent_msg.id]
+                    )
+                    msgs = self._media_dict[key][pname]
+                    if len(msgs) == 10:
+                        await self._send_media_group(pname, key, msgs)
+                    else:
+                        self._last_msg_in_group = True
+
+        if sent_msg:
+            await self._copy_media(sent_msg)
+
+    async def _send_cached(self, cache_key, reply_to, cap_mono):
+        """Resend a previously leeched copy of this file, or None on a miss.
+
+        Always replayed by the bot: a user or helper session may not reach the
+        recorded chat, and the file_id is only tried when the bot received it.
+        """
+        if (entry := await LeechCache.get(cache_key)) is None:
+            return None
+        client = self._listener.client
+        try:
+            return await client.copy_message(
+                chat_id=reply_to.chat.id,
+                from_chat_id=entry["chat_id"],
+                message_id=entry["message_id"],
+                caption=cap_mono,
+                reply_to_message_id=reply_to.id,
+                disable_notification=True,
+            )
+        except (FloodWait, FloodPremiumWait):
+            raise
+        except Exception as e:
+            LOGGER.warning(f"Cached message copy failed: {e}")
+        if entry.get("client", "bot") == "bot":
+            try:
+                return await client.send_cached_media(
+                    chat_id=reply_to.chat.id,
+                    file_id=entry["file_id"],
+                    caption=cap_mono,
+                    reply_to_message_id=reply_to.id,
+                    disable_notification=True,
+                )
+            except (FloodWait, FloodPremiumWait):
+                raise
+            except Exception as e:
+                LOGGER.warning(f"Cached file_id send failed: {e}")
+        await LeechCache.remove(cache_key)
+        return None
+
+    async def _send_media(self, method, reply_to, helper, **kwargs):
+        """Send the file, returns ``(sent_msg, stored_msg)``.
+
+        ``stored_msg`` is the message that keeps the upload: the dump chat post
+        when a helper went through LEECH_DUMP_CHAT, the sent message otherwise.
+        """
+        if helper is None:
+            sent_msg = await self._reply_media(method, reply_to, **kwargs)
+            return sent_msg, sent_msg
+        if reply_to.chat.id == await get_dump_chat_id():
+            sent_msg = await self._post_media(
+                method,
+                helper,
+                chat_id=reply_to.chat.id,
+                reply_to_message_id=reply_to.id,
+                **kwargs,
+            )
+            return sent_msg, sent_msg
+        dump_msg = await self._post_media(
+            method, helper, chat_id=Config.LEECH_DUMP_CHAT, **kwargs
+        )
+        # retried on its own so a failed copy doesn't upload the file again
+        return await self._copy_from_dump(dump_msg, reply_to), dump_msg
+
+    @_rpc_retry
+    async def _reply_media(self, method, reply_to, **kwargs):
+        return await getattr(reply_to, f"reply_{method}")(quote=True, **kwargs)
+
+    @_rpc_retry
+    async def _post_media(self, method, client, **kwargs):
+        return await getattr(client, f"send_{method}")(**kwargs)
+
+    @_rpc_retry
+    async def _copy_from_dump(self, dump_msg, reply_to):
+        return await self._listener.client.copy_message(
+            chat_id=reply_to.chat.id,
+            from_chat_id=dump_msg.chat.id,
+            message_id=dump_msg.id,
+            reply_to_message_id=reply_to.id,
+            disable_notification=True,
+        )
+
+    async def _upload_file(
+        self,
+        cap_mono,
+        file,
+        up_path,
+        user_session,
+        progress,
+        helper=None,
+        force_document=False,
+    ):
         if (
             self._thumb is not None
             and not await aiopath.exists(self._thumb)
@@ -559,10 +848,32 @@ class TelegramUploader:
             self._thumb = None
         
         thumb = self._thumb
-        self._is_corrupted = False
-        
+        key = "documents"
+
         try:
-            is_video, is_audio, is_image = await get_document_type(self._up_path)
+            reply_to = await self._reply_target(user_session)
+            virtual = self._virtual.get(up_path)
+            cache_key = None
+            if (
+                virtual is None
+                and LeechCache.enabled()
+                and self._thumb is None
+                and not self._listener.thumbnail_layout
+            ):
+                cache_key = await LeechCache.key(
+                    up_path, self._listener.as_doc or force_document
+                )
+                if sent_msg := await self._send_cached(cache_key, reply_to, cap_mono):
+                    LOGGER.info(f"Leech cache hit: {up_path}")
+                    size = await aiopath.getsize(up_path)
+                    await progress(size, size)
+                    await self._register_sent(sent_msg, up_path)
+                    return sent_msg
+
+            if virtual is None:
+                is_video, is_audio, is_image = await get_document_type(up_path)
+            else:
+                is_video = is_audio = is_image = False
 
             if not is_image and thumb is None:
                 file_name = ospath.splitext(file)[0]
@@ -570,9 +881,9 @@ class TelegramUploader:
                 if await aiopath.isfile(thumb_path):
                     thumb = thumb_path
                 elif is_audio and not is_video:
-                    thumb = await self._get_cached_thumbnail(self._up_path, "audio")
+                    thumb = await self._get_cached_thumbnail(up_path, "audio")
                 elif is_video:
-                    thumb = await self._get_cached_thumbnail(self._up_path, "video")
+                    thumb = await self._get_cached_thumbnail(up_path, "video")
 
             if (
                 self._listener.as_doc
@@ -581,32 +892,43 @@ class TelegramUploader:
             ):
                 key = "documents"
                 if is_video and thumb is None:
-                    thumb = await self._get_cached_thumbnail(self._up_path, "document")
+                    thumb = await self._get_cached_thumbnail(up_path, "document")
 
                 if self._listener.is_cancelled:
                     return
                 if thumb == "none":
                     thumb = None
-                self._sent_msg = await self._sent_msg.reply_document(
-                    document=self._up_path,
-                    quote=True,
-                    thumb=thumb,
-                    caption=cap_mono,
-                    force_document=True,
-                    disable_notification=True,
-                    progress=self._upload_progress,
+                document = (
+                    FileSlice(*virtual, name=ospath.basename(up_path))
+                    if virtual
+                    else up_path
                 )
+                try:
+                    sent_msg, stored_msg = await self._send_media(
+                        "document",
+                        reply_to,
+                        helper,
+                        document=document,
+                        thumb=thumb,
+                        caption=cap_mono,
+                        force_document=True,
+                        disable_notification=True,
+                        progress=progress,
+                    )
+                finally:
+                    if virtual:
+                        document.close()
             elif is_video:
                 key = "videos"
-                duration = (await get_media_info(self._up_path))[0]
+                duration = (await get_media_info(up_path))[0]
                 if thumb is None and self._listener.thumbnail_layout:
                     thumb = await get_multiple_frames_thumbnail(
-                        self._up_path,
+                        up_path,
                         self._listener.thumbnail_layout,
                         self._listener.screen_shots,
                     )
                 if thumb is None:
-                    thumb = await self._get_cached_thumbnail(self._up_path, "video")
+                    thumb = await self._get_cached_thumbnail(up_path, "video")
                 
                 if thumb is not None and thumb != "none":
                     try:
@@ -622,9 +944,11 @@ class TelegramUploader:
                     return
                 if thumb == "none":
                     thumb = None
-                self._sent_msg = await self._sent_msg.reply_video(
-                    video=self._up_path,
-                    quote=True,
+                sent_msg, stored_msg = await self._send_media(
+                    "video",
+                    reply_to,
+                    helper,
+                    video=up_path,
                     caption=cap_mono,
                     duration=duration,
                     width=width,
@@ -632,62 +956,49 @@ class TelegramUploader:
                     thumb=thumb,
                     supports_streaming=True,
                     disable_notification=True,
-                    progress=self._upload_progress,
+                    progress=progress,
                 )
             elif is_audio:
                 key = "audios"
-                duration, artist, title = await get_media_info(self._up_path)
+                duration, artist, title = await get_media_info(up_path)
                 if self._listener.is_cancelled:
                     return
                 if thumb == "none":
                     thumb = None
-                self._sent_msg = await self._sent_msg.reply_audio(
-                    audio=self._up_path,
-                    quote=True,
+                sent_msg, stored_msg = await self._send_media(
+                    "audio",
+                    reply_to,
+                    helper,
+                    audio=up_path,
                     caption=cap_mono,
                     duration=duration,
                     performer=artist,
                     title=title,
                     thumb=thumb,
                     disable_notification=True,
-                    progress=self._upload_progress,
+                    progress=progress,
                 )
             else:
                 key = "photos"
                 if self._listener.is_cancelled:
                     return
-                self._sent_msg = await self._sent_msg.reply_photo(
-                    photo=self._up_path,
-                    quote=True,
+                sent_msg, stored_msg = await self._send_media(
+                    "photo",
+                    reply_to,
+                    helper,
+                    photo=up_path,
                     caption=cap_mono,
                     disable_notification=True,
-                    progress=self._upload_progress,
+                    progress=progress,
                 )
 
-            if (
-                not self._listener.is_cancelled
-                and self._media_group
-                and (self._sent_msg.video or self._sent_msg.document)
-            ):
-                key = "documents" if self._sent_msg.document else "videos"
-                if match := re_match(r".+(?=\.0*\d+$)|.+(?=\.part\d+\..+$)", o_path):
-                    pname = match.group(0)
-                    if pname in self._media_dict[key].keys():
-                        self._media_dict[key][pname].append(
-                            [self._sent_msg.chat.id, self._sent_msg.id]
-                        )
-                    else:
-                        self._media_dict[key][pname] = [
-                            [self._sent_msg.chat.id, self._sent_msg.id]
-                        ]
-                    msgs = self._media_dict[key][pname]
-                    if len(msgs) == 10:
-                        await self._send_media_group(pname, key, msgs)
-                    else:
-                        self._last_msg_in_group = True
-
-            if self._sent_msg:
-                await self._copy_media()
+            if stored_msg and cache_key is not None:
+                await LeechCache.put(
+                    cache_key,
+                    stored_msg,
+                    "helper" if helper else "user" if user_session else "bot",
+                )
+            await self._register_sent(sent_msg, up_path)
 
             if (
                 self._thumb is None
@@ -696,17 +1007,17 @@ class TelegramUploader:
                 and not thumb.startswith(f"{self._path}/yt-dlp-thumb/")
             ):
                 await remove(thumb)
-                
-        except (FloodWait, FloodPremiumWait) as f:
-            LOGGER.warning(f"Rate limited: {f}")
-            await sleep(f.value * 1.05)  # Reduced multiplier
+
+            return sent_msg
+
+        except (FloodWait, FloodPremiumWait):
             if (
                 self._thumb is None
                 and thumb is not None
                 and await aiopath.exists(thumb)
             ):
                 await remove(thumb)
-            return await self._upload_file(cap_mono, file, o_path)
+            raise
         except Exception as err:
             if (
                 self._thumb is None
@@ -715,10 +1026,12 @@ class TelegramUploader:
             ):
                 await remove(thumb)
             err_type = "RPCError: " if isinstance(err, RPCError) else ""
-            LOGGER.error(f"{err_type}{err}. Path: {self._up_path}", exc_info=True)
+            LOGGER.error(f"{err_type}{err}. Path: {up_path}", exc_info=True)
             if isinstance(err, BadRequest) and key != "documents":
-                LOGGER.error(f"Retrying As Document. Path: {self._up_path}")
-                return await self._upload_file(cap_mono, file, o_path, True)
+                LOGGER.error(f"Retrying As Document. Path: {up_path}")
+                return await self._upload_file(
+                    cap_mono, file, up_path, user_session, progress, helper, True
+                )
             raise err
 
     @property
@@ -1,4 +1,5 @@
-from asyncio import sleep, gather
+from asyncio import Lock, sleep, gather
+from collections import defaultdict
 from re import match as re_match
 from time import time
 
@@ -25,7 +26,9 @@ from ...core.config_manager import Config
 from ...core.tg_client import TgClient
 from ..ext_utils.bot_utils import SetInterval
 from ..ext_utils.exceptions import TgLinkException
-from ..ext_utils.status_utils import get_readable_message
+from ..ext_utils.status_utils import get_readable_message, render_status_page
+
+status_locks = defaultdict(Lock)
 
 
 async def send_message(message, text, buttons=None, block=True, photo=None, **kwargs):
@@ -170,7 +173,7 @@ async def send_rss(text, chat_id, thread_id):
     except (FloodWait, FloodPremiumWait) as f:
         LOGGER.warning(str(f))
         await sleep(f.value * 1.2)
-        return await send_rss(text)
+        return await send_rss(text, chat_id, thread_id)
     except Exception as e:
         LOGGER.error(str(e), exc_info=True)
         return str(e)
@@ -285,35 +288,42 @@ async def get_tg_link_message(link):
 async def update_status_message(sid, force=False):
     if intervals["stopAll"]:
         return
-    async with task_dict_lock:
-        if not status_dict.get(sid):
+    async with status_locks[sid]:
+        if not (state := status_dict.get(sid)):
             if obj := intervals["status"].get(sid):
                 obj.cancel()
                 del intervals["status"][sid]
             return
-        if not force and time() - status_dict[sid]["time"] < 3:
+        if not force and time() - state["time"] < 3:
             return
-        status_dict[sid]["time"] = time()
-        page_no = status_dict[sid]["page_no"]
-        status = status_dict[sid]["status"]
-        is_user = status_dict[sid]["is_user"]
-        page_step = status_dict[sid]["page_step"]
-        text, buttons = await get_readable_message(
-            sid, is_user, page_no, status, page_step
+        state["time"] = time()
+        text, buttons, signature = await render_status_page(
+            sid,
+            state["is_user"],
+            state["page_no"],
+            state["status"],
+            state["page_step"],
         )
         if text is None:
-            del status_dict[sid]
+            status_dict.pop(sid, None)
             if obj := intervals["status"].get(sid):
                 obj.cancel()
                 del intervals["status"][sid]
             return
-        if text != status_dict[sid]["message"].text:
-            message = await edit_message(
-                status_dict[sid]["message"], text, buttons, block=False
-            )
+        # Only speed/eta/stats moved and no task crossed a whole percent:
+        # skip the edit unless the message has gone stale
+        if (
+            not force
+            and signature == state.get("signature")
+            and time() - state.get("edited", 0)
+            < max(60, Config.STATUS_UPDATE_INTERVAL * 4)
+        ):
+            return
+        if text != state["message"].text:
+            message = await edit_message(state["message"], text, buttons, block=False)
             if isinstance(message, str):
                 if message.startswith("Telegram says: [40"):
-                    del status_dict[sid]
+                    status_dict.pop(sid, None)
                     if obj := intervals["status"].get(sid):
                         obj.cancel()
                         del intervals["status"][sid]
@@ -322,8 +332,9 @@ async def update_status_message(sid, force=False):
                         f"Status with id: {sid} haven't been updated. Error: {message}"
                     )
                 return
-            status_dict[sid]["message"].text = text
-            status_dict[sid]["time"] = time()
+            state["message"].text = text
+            state["time"] = state["edited"] = time()
+            state["signature"] = signature
 
 
 async def send_status_message(msg, user_id=0):
@@ -331,7 +342,7 @@ async def send_status_message(msg, user_id=0):
         return
     sid = user_id or msg.chat.id
     is_user = bool(user_id)
-    async with task_dict_lock:
+    async with status_locks[sid]:
         if sid in status_dict:
             page_no = status_dict[sid]["page_no"]
             status = status_dict[sid]["status"]
@@ -354,7 +365,9 @@ async def send_status_message(msg, user_id=0):
                 return
             await delete_message(old_message)
             message.text = text
-            status_dict[sid].update({"message": message, "time": time()})
+            status_dict[sid].update(
+                {"message": message, "time": time(), "edited": time()}
+            )
         else:
             text, buttons = await get_readable_message(sid, is_user)
             if text is None:
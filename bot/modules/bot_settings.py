@@ -66,6 +66,8 @@ DEFAULT_VALUES = {
     "SEARCH_LIMIT": 0,
     "UPSTREAM_BRANCH": "master",
     "DEFAULT_UPLOAD": "rc",
+    "QUEUE_POLICY": "fair",
+    "QUEUE_ENGINE_LIMITS": {},
 }
 
 
@@ -365,7 +367,14 @@ async def edit_variable(_, message, pre_message, key):
     await database.update_config({key: value})
     if key in ["SEARCH_PLUGINS", "SEARCH_API_LINK"]:
         await initiate_search_tools()
-    elif key in ["QUEUE_ALL", "QUEUE_DOWNLOAD", "QUEUE_UPLOAD"]:
+    elif key in [
+        "QUEUE_ALL",
+        "QUEUE_DOWNLOAD",
+        "QUEUE_UPLOAD",
+        "QUEUE_POLICY",
+        "QUEUE_SUDO_PRIORITY",
+        "QUEUE_ENGINE_LIMITS",
+    ]:
         await start_from_queued()
     elif key in [
         "RCLONE_SERVE_URL",
@@ -705,7 +714,14 @@ async def edit_bot_settings(client, query):
         await database.update_config({data[2]: value})
         if data[2] in ["SEARCH_PLUGINS", "SEARCH_API_LINK"]:
             await initiate_search_tools()
-        elif data[2] in ["QUEUE_ALL", "QUEUE_DOWNLOAD", "QUEUE_UPLOAD"]:
+        elif data[2] in [
+            "QUEUE_ALL",
+            "QUEUE_DOWNLOAD",
+            "QUEUE_UPLOAD",
+            "QUEUE_POLICY",
+            "QUEUE_SUDO_PRIORITY",
+            "QUEUE_ENGINE_LIMITS",
+        ]:
             await start_from_queued()
         elif data[2] in [
             "RCLONE_SERVE_URL",
@@ -31,6 +31,20 @@ async def cancel(_, message):
         gid = cmd_data[0]
         if len(gid) == 6:
             multi_tags.discard(gid)
+            async with task_dict_lock:
+                tasks = [
+                    task
+                    for task in task_dict.values()
+                    if task.listener.multi_tag == gid
+                ]
+            for task in tasks:
+                if (
+                    Config.OWNER_ID == user_id
+                    or task.listener.user_id == user_id
+                    or (user_id in user_data and user_data[user_id].get("SUDO"))
+                ):
+                    obj = task.task()
+                    await obj.cancel_task()
             return
         else:
             task = await get_task_by_gid(gid)
@@ -10,7 +10,6 @@ from ..helper.ext_utils.bot_utils import (
     COMMAND_USAGE,
     arg_parser,
     cmd_exec,
-    sync_to_async,
 )
 from ..helper.ext_utils.exceptions import DirectDownloadLinkException
 from ..helper.ext_utils.links_utils import (
@@ -26,8 +25,8 @@ from ..helper.ext_utils.task_manager import (
 )
 from ..helper.ext_utils.status_utils import get_readable_file_size
 from ..helper.listeners.task_listener import TaskListener
-from ..helper.mirror_leech_utils.download_utils.direct_link_generator import (
-    direct_link_generator,
+from ..helper.mirror_leech_utils.download_utils.direct_link_resolver import (
+    DirectLinkResolver,
 )
 from ..helper.mirror_leech_utils.gdrive_utils.clone import GoogleDriveClone
 from ..helper.mirror_leech_utils.gdrive_utils.count import GoogleDriveCount
@@ -68,17 +67,19 @@ class Clone(TaskListener):
         super().__init__()
         self.is_clone = True
 
-    async def new_event(self):
+    async def new_event(self, bulk_child=False):
         text = self.message.text.split("\n")
         input_list = text[0].split(" ")
 
-        check_msg, check_button = await pre_task_check(self.message)
-        if check_msg:
-            await delete_links(self.message)
-            await auto_delete_message(
-                await send_message(self.message, check_msg, check_button)
-            )
-            return
+        # bulk children were checked once with their parent
+        if not bulk_child:
+            check_msg, check_button = await pre_task_check(self.message)
+            if check_msg:
+                await delete_links(self.message)
+                await auto_delete_message(
+                    await send_message(self.message, check_msg, check_button)
+                )
+                return
 
         args = {
             "link": "",
@@ -146,8 +147,9 @@ class Clone(TaskListener):
 
     async def _proceed_to_clone(self, sync):
         if is_share_link(self.link):
+            self.source_link = self.link
             try:
-                self.link = await sync_to_async(direct_link_generator, self.link)
+                self.link = await DirectLinkResolver.resolve(self.link)
                 LOGGER.info(f"Generated link: {self.link}")
             except DirectDownloadLinkException as e:
                 LOGGER.error(str(e))
@@ -155,8 +157,8 @@ class Clone(TaskListener):
                     await send_message(self.message, str(e))
                     return
         if is_gdrive_link(self.link) or is_gdrive_id(self.link):
-            self.name, mime_type, self.size, files, _ = await sync_to_async(
-                GoogleDriveCount().count, self.link, self.user_id
+            self.name, mime_type, self.size, files, _ = await GoogleDriveCount().count(
+                self.link, self.user_id
             )
             if mime_type is None:
                 await send_message(self.message, self.name)
@@ -190,7 +192,7 @@ class Clone(TaskListener):
                     task_dict[self.mid] = GoogleDriveStatus(self, drive, gid, "cl")
                 if self.multi <= 1:
                     await send_status_message(self.message)
-            flink, mime_type, files, folders, dir_id = await sync_to_async(drive.clone)
+            flink, mime_type, files, folders, dir_id = await drive.clone()
             if msg:
                 await delete_message(msg)
             if not flink:
@@ -1,5 +1,5 @@
 from .. import LOGGER
-from ..helper.ext_utils.bot_utils import sync_to_async, new_task
+from ..helper.ext_utils.bot_utils import new_task
 from ..helper.ext_utils.links_utils import is_gdrive_link
 from ..helper.mirror_leech_utils.gdrive_utils.delete import GoogleDriveDelete
 from ..helper.telegram_helper.message_utils import auto_delete_message, send_message
@@ -17,7 +17,7 @@ async def delete_file(_, message):
         link = ""
     if is_gdrive_link(link):
         LOGGER.info(link)
-        msg = await sync_to_async(GoogleDriveDelete().deletefile, link, user.id)
+        msg = await GoogleDriveDelete().deletefile(link, user.id)
     else:
         msg = (
             "Send Gdrive link along with command or by replying to the link by command"
@@ -9,7 +9,6 @@ from ..helper.ext_utils.bot_utils import (
     COMMAND_USAGE,
     arg_parser,
     get_content_type,
-    sync_to_async,
 )
 from ..helper.ext_utils.exceptions import DirectDownloadLinkException
 from ..helper.ext_utils.links_utils import (
@@ -29,8 +28,8 @@ from ..helper.mirror_leech_utils.download_utils.aria2_download import (
 from ..helper.mirror_leech_utils.download_utils.direct_downloader import (
     add_direct_download,
 )
-from ..helper.mirror_leech_utils.download_utils.direct_link_generator import (
-    direct_link_generator,
+from ..helper.mirror_leech_utils.download_utils.direct_link_resolver import (
+    DirectLinkResolver,
 )
 from ..helper.mirror_leech_utils.download_utils.gd_download import add_gd_download
 from ..helper.mirror_leech_utils.download_utils.jd_download import add_jd_download
@@ -81,17 +80,19 @@ class Mirror(TaskListener):
         self.is_jd = is_jd
         self.is_nzb = is_nzb
 
-    async def new_event(self):
+    async def new_event(self, bulk_child=False):
         text = self.message.text.split("\n")
         input_list = text[0].split(" ")
 
-        check_msg, check_button = await pre_task_check(self.message)
-        if check_msg:
-            await delete_links(self.message)
-            await auto_delete_message(
-                await send_message(self.message, check_msg, check_button)
-            )
-            return
+        # bulk children were checked once with their parent
+        if not bulk_child:
+            check_msg, check_button = await pre_task_check(self.message)
+            if check_msg:
+                await delete_links(self.message)
+                await auto_delete_message(
+                    await send_message(self.message, check_msg, check_button)
+                )
+                return
 
         args = {
             "-doc": False,
@@ -274,29 +275,8 @@ class Mirror(TaskListener):
 
         if isinstance(reply_to, list):
             self.bulk = reply_to
-            b_msg = input_list[:1]
             self.options = " ".join(input_list[1:])
-            b_msg.append(f"{self.bulk[0]} -i {len(self.bulk)} {self.options}")
-            nextmsg = await send_message(self.message, " ".join(b_msg))
-            nextmsg = await self.client.get_messages(
-                chat_id=self.message.chat.id, message_ids=nextmsg.id
-            )
-            if self.message.from_user:
-                nextmsg.from_user = self.user
-            else:
-                nextmsg.sender_chat = self.user
-            await Mirror(
-                self.client,
-                nextmsg,
-                self.is_qbit,
-                self.is_leech,
-                self.is_jd,
-                self.is_nzb,
-                self.same_dir,
-                self.bulk,
-                self.multi_tag,
-                self.options,
-            ).new_event()
+            await self.start_bulk(input_list[0], Mirror)
             return
 
         if reply_to:
@@ -373,8 +353,9 @@ class Mirror(TaskListener):
         ):
             content_type = await get_content_type(self.link)
             if content_type is None or re_match(r"text/html|text/plain", content_type):
+                self.source_link = self.link
                 try:
-                    self.link = await sync_to_async(direct_link_generator, self.link)
+                    self.link = await DirectLinkResolver.resolve(self.link)
                     if isinstance(self.link, tuple):
                         self.link, headers = self.link
                     elif isinstance(self.link, str):
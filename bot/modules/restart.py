@@ -17,6 +17,7 @@ from ..core.torrent_manager import TorrentManager
 from ..helper.ext_utils.bot_utils import new_task
 from ..helper.ext_utils.db_handler import database
 from ..helper.ext_utils.files_utils import clean_all
+from ..helper.mirror_leech_utils.gdrive_utils.aio_drive import AsyncDrive
 from ..helper.telegram_helper import button_build
 from ..helper.telegram_helper.message_utils import (
     delete_message,
@@ -137,6 +138,7 @@ async def confirm_restart(_, query):
                 intvl.cancel()
         await clean_all()
         await TorrentManager.close_all()
+        await AsyncDrive.close()
         if sabnzbd_client.LOGGED_IN:
             await gather(
                 sabnzbd_client.pause_all(),
@@ -1,6 +1,6 @@
-from httpx import AsyncClient
+from httpx import AsyncClient, Limits
 from apscheduler.triggers.interval import IntervalTrigger
-from asyncio import Lock, sleep
+from asyncio import Lock, Queue, Semaphore, create_task, gather, sleep
 from datetime import datetime, timedelta
 from feedparser import parse as feed_parse
 from functools import partial
@@ -12,10 +12,14 @@ from re import compile, I
 
 from .. import scheduler, rss_dict, LOGGER
 from ..core.config_manager import Config
-from ..helper.ext_utils.bot_utils import new_task, arg_parser, get_size_bytes
+from ..helper.ext_utils.bot_utils import (
+    new_task,
+    arg_parser,
+    get_size_bytes,
+    sync_to_async,
+)
 from ..helper.ext_utils.status_utils import get_readable_file_size
 from ..helper.ext_utils.db_handler import database
-from ..helper.ext_utils.exceptions import RssShutdownException
 from ..helper.ext_utils.help_messages import RSS_HELP_MESSAGE
 from ..helper.telegram_helper.button_build import ButtonMaker
 from ..helper.telegram_helper.filters import CustomFilters
@@ -133,10 +137,7 @@ async def rss_sub(_, message, pre_event):
             cmd = None
             stv = False
         try:
-            async with AsyncClient(
-                headers=headers, follow_redirects=True, timeout=60, verify=False
-            ) as client:
-                res = await client.get(feed_link)
+            res = await RssFeeds.get_client().get(feed_link)
             html = res.text
             rss_d = feed_parse(html)
             last_title = rss_d.entries[0]["title"]
@@ -346,10 +347,7 @@ async def rss_get(_, message, pre_event):
                 msg = await send_message(
                     message, f"Getting the last <b>{count}</b> item(s) from {title}"
                 )
-                async with AsyncClient(
-                    headers=headers, follow_redirects=True, timeout=60, verify=False
-                ) as client:
-                    res = await client.get(data["link"])
+                res = await RssFeeds.get_client().get(data["link"])
                 html = res.text
                 rss_d = feed_parse(html)
                 item_info = ""
@@ -657,6 +655,175 @@ Timeout: 60 sec. Argument -c for command and arguments
             await query.answer(text="Already Running!", show_alert=True)
 
 
+class RssFeeds:
+    """One pooled client for all feed requests, with conditional GETs."""
+
+    client = None
+    validators = {}
+    concurrency = 10
+
+    @classmethod
+    def get_client(cls):
+        if cls.client is None or cls.client.is_closed:
+            cls.client = AsyncClient(
+                headers=headers,
+                follow_redirects=True,
+                timeout=60,
+                verify=False,
+                limits=Limits(max_connections=50, max_keepalive_connections=20),
+            )
+        return cls.client
+
+    @classmethod
+    async def fetch(cls, url):
+        """Parsed feed, or None when the server reports it unchanged."""
+        req_headers = {}
+        if validators := cls.validators.get(url):
+            etag, modified = validators
+            if etag:
+                req_headers["If-None-Match"] = etag
+            if modified:
+                req_headers["If-Modified-Since"] = modified
+        tries = 0
+        while True:
+            try:
+                res = await cls.get_client().get(url, headers=req_headers)
+                break
+            except Exception:
+                tries += 1
+                if tries > 3:
+                    raise
+        if res.status_code == 304:
+            return None
+        res.raise_for_status()
+        rss_d = await sync_to_async(feed_parse, res.text)
+        if rss_d.entries:
+            cls.validators[url] = (
+                res.headers.get("ETag"),
+                res.headers.get("Last-Modified"),
+            )
+        return rss_d
+
+
+class RssSender:
+    """Sends feed messages one by one so fetching never waits on Telegram."""
+
+    queue = Queue()
+    worker = None
+    interval = 3
+
+    @classmethod
+    def put(cls, text, chat_id, thread_id):
+        cls.queue.put_nowait((text, chat_id, thread_id))
+        if cls.worker is None or cls.worker.done():
+            cls.worker = create_task(cls._run())
+
+    @classmethod
+    async def _run(cls):
+        while not cls.queue.empty():
+            text, chat_id, thread_id = cls.queue.get_nowait()
+            await send_rss(text, chat_id, thread_id)
+            await sleep(cls.interval)
+
+
+def _feed_item_link(entry):
+    try:
+        return entry["links"][1]["href"]
+    except IndexError:
+        return entry["link"]
+
+
+def _new_feed_messages(rss_d, user, title, data):
+    messages = []
+    feed_count = 0
+    while True:
+        try:
+            item_title = rss_d.entries[feed_count]["title"]
+            url = _feed_item_link(rss_d.entries[feed_count])
+            if data["last_feed"] == url or data["last_title"] == item_title:
+                break
+            if rss_d.entries[feed_count].get("size"):
+                size = int(rss_d.entries[feed_count]["size"])
+            elif rss_d.entries[feed_count].get("summary"):
+                summary = rss_d.entries[feed_count]["summary"]
+                matches = size_regex.findall(summary)
+                sizes = [match[0] for match in matches]
+                size = get_size_bytes(sizes[0])
+            else:
+                size = 0
+        except IndexError:
+            LOGGER.warning(
+                f"Reached Max index no. {feed_count} for this feed: {title}. Maybe you need to use less RSS_DELAY to not miss some torrents"
+            )
+            break
+        feed_count += 1
+        sensitive = data.get("sensitive", False)
+        if any(
+            sensitive
+            and all(x.lower() not in item_title.lower() for x in flist)
+            or not sensitive
+            and all(x not in item_title for x in flist)
+            for flist in data["inf"]
+        ):
+            continue
+        if any(
+            sensitive
+            and any(x.lower() in item_title.lower() for x in flist)
+            or not sensitive
+            and any(x in item_title for x in flist)
+            for flist in data["exf"]
+        ):
+            continue
+        if command := data["command"]:
+            if size and Config.RSS_SIZE_LIMIT and Config.RSS_SIZE_LIMIT < size:
+                continue
+            cmd = command.split(maxsplit=1)
+            cmd.insert(1, url)
+            feed_msg = " ".join(cmd)
+            if not feed_msg.startswith("/"):
+                feed_msg = f"/{feed_msg}"
+        else:
+            feed_msg = f"<b>Name: </b><code>{item_title.replace('>', '').replace('<', '')}</code>"
+            feed_msg += f"\n\n<b>Link: </b><code>{url}</code>"
+            if size:
+                feed_msg += f"\n<b>Size: </b>{get_readable_file_size(size)}"
+        feed_msg += f"\n<b>Tag: </b><code>{data['tag']}</code> <code>{user}</code>"
+        messages.append(feed_msg)
+    return messages
+
+
+async def _check_feed(link, subscribers, semaphore, rss_chat_id, rss_topic_id):
+    try:
+        async with semaphore:
+            rss_d = await RssFeeds.fetch(link)
+        if rss_d is None or not rss_d.entries:
+            return set()
+        last_link = _feed_item_link(rss_d.entries[0])
+        last_title = rss_d.entries[0]["title"]
+    except Exception as e:
+        LOGGER.error(f"{e} - Feed Link: {link}")
+        return set()
+    updated = set()
+    for user, title, data in subscribers:
+        try:
+            if data["last_feed"] == last_link or data["last_title"] == last_title:
+                continue
+            for feed_msg in _new_feed_messages(rss_d, user, title, data):
+                RssSender.put(feed_msg, rss_chat_id, rss_topic_id)
+            async with rss_dict_lock:
+                if user not in rss_dict or not rss_dict[user].get(title, False):
+                    continue
+                rss_dict[user][title].update(
+                    {"last_feed": last_link, "last_title": last_title}
+                )
+            updated.add(user)
+            LOGGER.info(f"Feed Name: {title}")
+            LOGGER.info(f"Last item: {last_link}")
+        except Exception as e:
+            LOGGER.error(f"{e} - Feed Name: {title} - Feed Link: {link}")
+    return updated
+
+
 async def rss_monitor():
     chat = Config.RSS_CHAT
     if not chat:
@@ -666,7 +833,6 @@ async def rss_monitor():
     if len(rss_dict) == 0:
         scheduler.pause()
         return
-    all_paused = True
     rss_topic_id = rss_chat_id = None
     if isinstance(chat, int):
         rss_chat_id = chat
@@ -679,133 +845,23 @@ async def rss_monitor():
         )
     elif chat.lstrip("-").isdigit():
         rss_chat_id = int(chat)
+    feeds = {}
     for user, items in list(rss_dict.items()):
-        for title, data in items.items():
-            try:
-                if data["paused"]:
-                    continue
-                tries = 0
-                while True:
-                    try:
-                        async with AsyncClient(
-                            headers=headers,
-                            follow_redirects=True,
-                            timeout=60,
-                            verify=False,
-                        ) as client:
-                            res = await client.get(data["link"])
-                        html = res.text
-                        break
-                    except Exception:
-                        tries += 1
-                        if tries > 3:
-                            raise
-                        continue
-                rss_d = feed_parse(html)
-                try:
-                    last_link = rss_d.entries[0]["links"][1]["href"]
-                except IndexError:
-                    last_link = rss_d.entries[0]["link"]
-                finally:
-                    all_paused = False
-                last_title = rss_d.entries[0]["title"]
-                if data["last_feed"] == last_link or data["last_title"] == last_title:
-                    continue
-                feed_count = 0
-                while True:
-                    try:
-                        await sleep(10)
-                    except Exception:
-                        raise RssShutdownException("Rss Monitor Stopped!")
-                    try:
-                        item_title = rss_d.entries[feed_count]["title"]
-                        try:
-                            url = rss_d.entries[feed_count]["links"][1]["href"]
-                        except IndexError:
-                            url = rss_d.entries[feed_count]["link"]
-                        if data["last_feed"] == url or data["last_title"] == item_title:
-                            break
-                        if rss_d.entries[feed_count].get("size"):
-                            size = int(rss_d.entries[feed_count]["size"])
-                        elif rss_d.entries[feed_count].get("summary"):
-                            summary = rss_d.entries[feed_count]["summary"]
-                            matches = size_regex.findall(summary)
-                            sizes = [match[0] for match in matches]
-                            size = get_size_bytes(sizes[0])
-                        else:
-                            size = 0
-                    except IndexError:
-                        LOGGER.warning(
-                            f"Reached Max index no. {feed_count} for this feed: {title}. Maybe you need to use less RSS_DELAY to not miss some torrents"
-                        )
-                        break
-                    parse = True
-                    for flist in data["inf"]:
-                        if (
-                            data.get("sensitive", False)
-                            and all(x.lower() not in item_title.lower() for x in flist)
-                        ) or (
-                            not data.get("sensitive", False)
-                            and all(x not in item_title for x in flist)
-                        ):
-                            parse = False
-                            feed_count += 1
-                            break
-                    if not parse:
-                        continue
-                    for flist in data["exf"]:
-                        if (
-                            data.get("sensitive", False)
-                            and any(x.lower() in item_title.lower() for x in flist)
-                        ) or (
-                            not data.get("sensitive", False)
-                            and any(x in item_title for x in flist)
-                        ):
-                            parse = False
-                            feed_count += 1
-                            break
-                    if not parse:
-                        continue
-                    if command := data["command"]:
-                        if (
-                            size
-                            and Config.RSS_SIZE_LIMIT
-                            and Config.RSS_SIZE_LIMIT < size
-                        ):
-                            feed_count += 1
-                            continue
-                        cmd = command.split(maxsplit=1)
-                        cmd.insert(1, url)
-                        feed_msg = " ".join(cmd)
-                        if not feed_msg.startswith("/"):
-                            feed_msg = f"/{feed_msg}"
-                    else:
-                        feed_msg = f"<b>Name: </b><code>{item_title.replace('>', '').replace('<', '')}</code>"
-                        feed_msg += f"\n\n<b>Link: </b><code>{url}</code>"
-                        if size:
-                            feed_msg += f"\n<b>Size: </b>{get_readable_file_size(size)}"
-                    feed_msg += (
-                        f"\n<b>Tag: </b><code>{data['tag']}</code> <code>{user}</code>"
-                    )
-                    await send_rss(feed_msg, rss_chat_id, rss_topic_id)
-                    feed_count += 1
-                async with rss_dict_lock:
-                    if user not in rss_dict or not rss_dict[user].get(title, False):
-                        continue
-                    rss_dict[user][title].update(
-                        {"last_feed": last_link, "last_title": last_title}
-                    )
-                await database.rss_update(user)
-                LOGGER.info(f"Feed Name: {title}")
-                LOGGER.info(f"Last item: {last_link}")
-            except RssShutdownException as ex:
-                LOGGER.info(ex)
-                break
-            except Exception as e:
-                LOGGER.error(f"{e} - Feed Name: {title} - Feed Link: {data['link']}")
-                continue
-    if all_paused:
+        for title, data in list(items.items()):
+            if not data["paused"]:
+                feeds.setdefault(data["link"], []).append((user, title, data))
+    if not feeds:
         scheduler.pause()
+        return
+    semaphore = Semaphore(RssFeeds.concurrency)
+    results = await gather(
+        *(
+            _check_feed(link, subscribers, semaphore, rss_chat_id, rss_topic_id)
+            for link, subscribers in feeds.items()
+        )
+    )
+    for user in set().union(*results):
+        await database.rss_update(user)
 
 
 def add_job():
@@ -284,18 +284,20 @@ class YtDlp(TaskListener):
         self.is_ytdlp = True
         self.is_leech = is_leech
 
-    async def new_event(self):
+    async def new_event(self, bulk_child=False):
         text = self.message.text.split("\n")
         input_list = text[0].split(" ")
         qual = ""
 
-        check_msg, check_button = await pre_task_check(self.message)
-        if check_msg:
-            await delete_links(self.message)
-            await auto_delete_message(
-                await send_message(self.message, check_msg, check_button)
-            )
-            return
+        # bulk children were checked once with their parent
+        if not bulk_child:
+            check_msg, check_button = await pre_task_check(self.message)
+            if check_msg:
+                await delete_links(self.message)
+                await auto_delete_message(
+                    await send_message(self.message, check_msg, check_button)
+                )
+                return
 
         args = {
             "-doc": False,
@@ -489,7 +491,7 @@ class YtDlp(TaskListener):
         LOGGER.info(f"Downloading with YT-DLP: {self.link}")
         playlist = "entries" in result
 
-        ydl = YoutubeDLHelper(self)
+        ydl = YoutubeDLHelper(self, result)
         await delete_links(self.message)
         await ydl.add_download(path, qual, playlist, opt)
 
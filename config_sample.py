@@ -19,9 +19,12 @@ DEFAULT_UPLOAD = "rc"
 STATUS_UPDATE_INTERVAL = 15
 FILELION_API = ""
 STREAMWISH_API = ""
+DIRECT_LINK_CACHE_TTL = 300
+DIRECT_LINK_HOST_LIMIT = 4
 EXCLUDED_EXTENSIONS = ""
 INCOMPLETE_TASK_NOTIFIER = False
 YT_DLP_OPTIONS = ""
+YT_DLP_PLAYLIST_CONCURRENCY = 3
 USE_SERVICE_ACCOUNTS = False
 NAME_SWAP = ""
 FFMPEG_CMDS = {}
@@ -157,6 +160,7 @@ LEECH_SPLIT_SIZE = 0
 AS_DOCUMENT = False
 EQUAL_SPLITS = False
 MEDIA_GROUP = False
+LEECH_CACHE = False
 USER_TRANSMISSION = True
 HYBRID_LEECH = True
 LEECH_PREFIX = ""
@@ -172,6 +176,8 @@ MIRROR_LOG_ID = ""
 
 # qBittorrent/Aria2c
 TORRENT_TIMEOUT = 0
+DIRECT_PARALLEL = 4
+DIRECT_CONNECTIONS = 16
 BASE_URL = ""
 BASE_URL_PORT = 0
 WEB_PINCODE = True
@@ -180,6 +186,9 @@ WEB_PINCODE = True
 QUEUE_ALL = 0
 QUEUE_DOWNLOAD = 0
 QUEUE_UPLOAD = 0
+QUEUE_POLICY = "fair"  # fifo, fair or sjf
+QUEUE_SUDO_PRIORITY = False
+QUEUE_ENGINE_LIMITS = {}  # e.g. {"aria2": 4, "qbit": 2, "ytdlp": 2, "telegram": 3}
 
 # RSS
 RSS_DELAY = 600
@@ -0,0 +1,9 @@
+import pytest
+
+from bot import bot_loop
+
+
+@pytest.fixture
+def run():
+    """Runs a coroutine on the bot loop, where the code under test schedules."""
+    return bot_loop.run_until_complete
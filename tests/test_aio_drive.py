@@ -0,0 +1,99 @@
+import pytest
+
+from bot.helper.mirror_leech_utils.gdrive_utils import aio_drive
+from bot.helper.mirror_leech_utils.gdrive_utils.aio_drive import AsyncDrive, DriveError
+
+
+class FakeResponse:
+    def __init__(self, status, body=None, reason=""):
+        self.status = status
+        self.reason = "status"
+        self.headers = {}
+        self._body = body if body is not None else {}
+        if reason:
+            self._body = {"error": {"message": reason, "errors": [{"reason": reason}]}}
+
+    async def json(self, content_type=None):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        pass
+
+
+class FakeSession:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.tokens = []
+
+    def request(self, method, url, params=None, json=None, headers=None):
+        self.tokens.append(headers["Authorization"])
+        return self.responses.pop(0)
+
+
+class FakeCredentials:
+    def __init__(self):
+        self.token = "first"
+        self.expiry = None
+        self.refreshed = 0
+
+    @property
+    def valid(self):
+        return self.token is not None
+
+    def refresh(self, request):
+        self.refreshed += 1
+        self.token = "fresh"
+
+
+@pytest.fixture
+def drive(monkeypatch):
+    delays = []
+
+    async def no_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(aio_drive, "sleep", no_sleep)
+
+    def make(*responses):
+        session = FakeSession(responses)
+        monkeypatch.setattr(AsyncDrive, "session", classmethod(lambda cls: session))
+        return AsyncDrive(FakeCredentials()), session, delays
+
+    return make
+
+
+def test_transient_errors_back_off_then_succeed(drive, run):
+    client, session, delays = drive(
+        FakeResponse(503),
+        FakeResponse(403, reason="rateLimitExceeded"),
+        FakeResponse(200, {"id": "x"}),
+    )
+    assert run(client.files_get("x")) == {"id": "x"}
+    assert len(delays) == 2
+    assert 2 <= delays[0] < 3 and 4 <= delays[1] < 5
+
+
+def test_permanent_errors_raise_at_once(drive, run):
+    client, session, delays = drive(FakeResponse(404, reason="notFound"))
+    with pytest.raises(DriveError) as err:
+        run(client.files_get("x"))
+    assert err.value.status == 404 and err.value.reason == "notFound"
+    assert not delays
+
+
+def test_expired_token_is_refreshed_once(drive, run):
+    client, session, _ = drive(FakeResponse(401), FakeResponse(200, {"id": "x"}))
+    assert run(client.files_get("x")) == {"id": "x"}
+    assert session.tokens == ["Bearer first", "Bearer fresh"]
+    assert client._credentials.refreshed == 1
+
+
+def test_retries_are_bounded(drive, run, monkeypatch):
+    monkeypatch.setattr(AsyncDrive, "max_retries", 3)
+    client, _, delays = drive(*(FakeResponse(500) for _ in range(3)))
+    with pytest.raises(DriveError):
+        run(client.files_get("x"))
+    assert len(delays) == 2
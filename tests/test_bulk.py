@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import pytest
+from pyrogram.enums import ChatType
+
+from bot import multi_tags, task_dict
+from bot.helper import common
+from bot.helper.common import TaskConfig
+
+
+class FakeMessage:
+    def __init__(self, mid, text):
+        self.id = mid
+        self.text = text
+        self.from_user = SimpleNamespace(id=7, username="user")
+        self.sender_chat = None
+        self.chat = SimpleNamespace(id=-100, type=ChatType.SUPERGROUP)
+
+
+class Parent(TaskConfig):
+    def __init__(self, message, links, folder_name=""):
+        self.message = message
+        self.client = None
+        super().__init__()
+        self.bulk = links
+        self.options = ""
+        self.same_dir = {}
+        self.folder_name = folder_name
+
+
+class Child(Parent):
+    def __init__(
+        self, client, message, qbit, leech, jd, nzb, same_dir, bulk, multi_tag, opts
+    ):
+        super().__init__(message, bulk)
+        self.same_dir = same_dir
+        self.multi_tag = multi_tag
+
+    async def new_event(self, bulk_child=False):
+        assert bulk_child
+        link = self.message.text.split()[1]
+        if link.startswith("bad"):
+            return
+        task_dict[self.mid] = SimpleNamespace(listener=self)
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    sent = []
+
+    async def send_message(message, text, *_, **__):
+        sent.append(text)
+        return FakeMessage(1000 + len(sent), text)
+
+    async def no_limit(_):
+        return None
+
+    async def no_sleep(_):
+        return None
+
+    monkeypatch.setattr(common, "send_message", send_message)
+    monkeypatch.setattr(common, "bulk_task_limit", no_limit)
+    monkeypatch.setattr(common, "sleep", no_sleep)
+    yield sent
+    task_dict.clear()
+
+
+def test_start_bulk_dedups_and_fixes_folder_total(run, sent):
+    parent = Parent(
+        FakeMessage(1, "/leech -b -m f"),
+        ["good1", "", "bad1", "good2", "good1", "good3"],
+        "/f",
+    )
+    run(parent.start_bulk("/leech", Child))
+    commands = [text for text in sent if text.startswith("/leech")]
+    assert commands == ["/leech good1", "/leech bad1", "/leech good2", "/leech good3"]
+    folder = parent.same_dir["/f"]
+    assert folder["total"] == 3
+    assert folder["total"] == len(folder["tasks"])
+    assert parent.multi_tag not in multi_tags
+
+
+def test_start_bulk_cancel_stops_remaining_links(run, sent, monkeypatch):
+    parent = Parent(FakeMessage(1, "/leech -b -m f"), ["a", "b", "c"], "/f")
+    send = common.send_message
+
+    async def cancel_after_first(message, text, *args, **kwargs):
+        msg = await send(message, text, *args, **kwargs)
+        if text == "/leech a":
+            multi_tags.discard(parent.multi_tag)
+        return msg
+
+    monkeypatch.setattr(common, "send_message", cancel_after_first)
+    run(parent.start_bulk("/leech", Child))
+    assert [text for text in sent if text.startswith("/leech")] == ["/leech a"]
+    assert parent.same_dir["/f"]["total"] == 1
+    assert any("cancelled" in text for text in sent)
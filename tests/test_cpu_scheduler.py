@@ -0,0 +1,55 @@
+from asyncio import sleep
+from collections import defaultdict
+from types import SimpleNamespace
+
+import pytest
+
+from bot import bot_loop
+from bot.helper.ext_utils.cpu_scheduler import CpuScheduler, ffmpeg_job_kind
+
+
+@pytest.fixture
+def cpu(monkeypatch):
+    monkeypatch.setattr(CpuScheduler, "total", 8)
+    monkeypatch.setattr(CpuScheduler, "used", 0)
+    monkeypatch.setattr(CpuScheduler, "waiting", [])
+    monkeypatch.setattr(CpuScheduler, "user_slots", defaultdict(int))
+
+
+def _listener(mid, user_id):
+    return SimpleNamespace(mid=mid, user_id=user_id)
+
+
+def test_ffmpeg_job_kind():
+    assert ffmpeg_job_kind(["-i", "a", "-c", "copy", "b"]) == "copy"
+    assert ffmpeg_job_kind(["-i", "a", "-c", "copy", "-vf", "x", "b"]) == "encode"
+    assert ffmpeg_job_kind(["-i", "a", "-c:v", "libx264", "b"]) == "encode"
+    assert ffmpeg_job_kind(["-i", "a", "b"]) == "encode"
+
+
+def test_slots_are_shared_fairly_between_users(cpu, run):
+    running = [_listener(mid, 10) for mid in (1, 2, 3, 4)]
+    assert CpuScheduler.weight("encode") == 2
+    assert CpuScheduler.weight("copy") == 1
+
+    async def scenario():
+        for listener in running:
+            await CpuScheduler.acquire(listener)
+        assert CpuScheduler.used == 8
+        queued = [
+            bot_loop.create_task(CpuScheduler.acquire(listener))
+            for listener in (_listener(5, 10), _listener(6, 20), _listener(7, 10))
+        ]
+        await sleep(0)
+        assert [CpuScheduler.position(mid) for mid in (5, 6, 7)] == [2, 1, 3]
+        CpuScheduler.release(running[0], 2)
+        await sleep(0)
+        assert [task.done() for task in queued] == [False, True, False]
+        assert CpuScheduler.user_slots == {10: 6, 20: 2}
+        for task in queued:
+            task.cancel()
+        await sleep(0)
+        assert not CpuScheduler.waiting
+
+    run(scenario())
+    assert CpuScheduler.used == 8
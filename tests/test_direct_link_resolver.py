@@ -0,0 +1,151 @@
+from asyncio import gather, sleep as asyncio_sleep
+from collections import OrderedDict
+from threading import Lock
+from time import sleep
+
+import pytest
+
+from bot.core.config_manager import Config
+from bot.helper.mirror_leech_utils.download_utils import direct_link_resolver
+from bot.helper.mirror_leech_utils.download_utils.direct_link_generator import (
+    HostLimiter,
+    map_concurrent,
+)
+from bot.helper.mirror_leech_utils.download_utils.direct_link_resolver import (
+    DirectLinkResolver,
+)
+
+
+@pytest.fixture
+def generator(monkeypatch):
+    calls = []
+
+    def fake_generator(url):
+        calls.append(url)
+        sleep(0.05)
+        if "bad" in url:
+            raise ValueError("no link")
+        return (f"{url}/dl/{len(calls)}", ["Referer: x"])
+
+    monkeypatch.setattr(direct_link_resolver, "direct_link_generator", fake_generator)
+    monkeypatch.setattr(Config, "DIRECT_LINK_CACHE_TTL", 300)
+    monkeypatch.setattr(DirectLinkResolver, "cache", OrderedDict())
+    return calls
+
+
+def test_concurrent_resolves_share_one_scrape_and_cache(generator, run):
+    url = "https://host.example/f/1"
+
+    async def resolve_many():
+        return await gather(*(DirectLinkResolver.resolve(url) for _ in range(3)))
+
+    results = run(resolve_many())
+    assert generator == [url]
+    assert results[0] == results[1] == results[2]
+    results[0][1].append("mutated")
+    assert run(DirectLinkResolver.resolve(url)) == results[1]
+    assert generator == [url]
+
+
+def test_errors_are_not_cached_and_invalidate_rescrapes(generator, run):
+    with pytest.raises(ValueError):
+        run(DirectLinkResolver.resolve("https://host.example/bad"))
+    with pytest.raises(ValueError):
+        run(DirectLinkResolver.resolve("https://host.example/bad"))
+    assert len(generator) == 2
+
+    url = "https://host.example/f/2"
+    first = run(DirectLinkResolver.resolve(url))
+    DirectLinkResolver.invalidate(url)
+    assert run(DirectLinkResolver.resolve(url)) != first
+
+
+def test_expired_entries_and_disabled_cache(generator, run, monkeypatch):
+    url = "https://host.example/f/3"
+    run(DirectLinkResolver.resolve(url))
+    _, result = DirectLinkResolver.cache[url]
+    DirectLinkResolver.cache[url] = (0, result)
+    run(DirectLinkResolver.resolve(url))
+    monkeypatch.setattr(Config, "DIRECT_LINK_CACHE_TTL", 0)
+    DirectLinkResolver.invalidate(url)
+    run(DirectLinkResolver.resolve(url))
+    assert generator == [url] * 3
+    assert url not in DirectLinkResolver.cache
+
+
+def test_fan_out_shares_the_host_limit(generator, run, monkeypatch):
+    monkeypatch.setattr(Config, "DIRECT_LINK_HOST_LIMIT", 3)
+    lock, running, peak = Lock(), [0], [0]
+
+    def fetch(item):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return item * 2
+
+    def folder_scrape(url):
+        return map_concurrent(fetch, list(range(10)), url)
+
+    monkeypatch.setattr(direct_link_resolver, "direct_link_generator", folder_scrape)
+
+    async def bulk():
+        urls = [f"https://folder.example/f/{i}" for i in range(4)]
+        return await gather(*(DirectLinkResolver.resolve(url) for url in urls))
+
+    assert run(bulk()) == [[i * 2 for i in range(10)]] * 4
+    assert peak[0] == 3
+    assert not HostLimiter._used
+
+
+def test_resolves_wait_for_host_slots_on_the_loop(generator, run, monkeypatch):
+    monkeypatch.setattr(Config, "DIRECT_LINK_HOST_LIMIT", 2)
+    lock, running, peak = Lock(), [0], [0]
+    plain = direct_link_resolver.direct_link_generator
+
+    def counting(url):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        try:
+            return plain(url)
+        finally:
+            with lock:
+                running[0] -= 1
+
+    calls = []
+    real_sync = direct_link_resolver.sync_to_async
+
+    async def sync_to_async(func, *args):
+        calls.append(args)
+        return await real_sync(func, *args)
+
+    monkeypatch.setattr(direct_link_resolver, "direct_link_generator", counting)
+    monkeypatch.setattr(direct_link_resolver, "sync_to_async", sync_to_async)
+
+    async def bulk():
+        urls = [f"https://one.example/f/{i}" for i in range(6)]
+        pending = gather(*(DirectLinkResolver.resolve(url) for url in urls))
+        await asyncio_sleep(0.01)
+        # only the admitted resolves reached the thread pool
+        assert len(calls) == 2
+        return await pending
+
+    assert len(run(bulk())) == 6
+    assert peak[0] == 2
+    assert not HostLimiter._used
+    assert not HostLimiter._waiters
+
+
+def test_fan_out_only_takes_free_slots(monkeypatch):
+    monkeypatch.setattr(Config, "DIRECT_LINK_HOST_LIMIT", 2)
+    assert HostLimiter.acquire("h")
+    assert HostLimiter.acquire("h")
+    assert not HostLimiter.acquire("h")
+    HostLimiter.release("h")
+    assert HostLimiter.acquire("h")
+    HostLimiter.release("h")
+    HostLimiter.release("h")
+    assert not HostLimiter._used
@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+import pytest
+
+from bot import bot_loop
+from bot.core.config_manager import Config
+from bot.core.torrent_manager import TorrentManager
+from bot.helper.listeners.direct_listener import DirectListener
+
+
+class FakeAria2:
+    def __init__(self):
+        self.options = []
+        self.running = 0
+        self.peak = 0
+        self.downloads = {}
+
+    async def addUri(self, uris, options, position):
+        if "bad" in uris[0]:
+            raise ValueError("rejected")
+        gid = f"gid{len(self.options)}"
+        self.options.append(options)
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        self.downloads[gid] = {"gid": gid, "status": "active", "totalLength": "10"}
+        bot_loop.call_later(0.02, self._finish, gid)
+        return gid
+
+    def _finish(self, gid):
+        self.running -= 1
+        self.downloads[gid]["status"] = "complete"
+        DirectListener.notify(gid)
+
+    async def tellStatus(self, gid):
+        return self.downloads[gid]
+
+
+@pytest.fixture
+def aria2(monkeypatch):
+    aria2 = FakeAria2()
+
+    async def get_download(gid):
+        return aria2.downloads[gid]
+
+    async def remove(download):
+        pass
+
+    monkeypatch.setattr(TorrentManager, "aria2", aria2)
+    monkeypatch.setattr(TorrentManager, "get_aria2_download", get_download)
+    monkeypatch.setattr(TorrentManager, "aria2_remove", remove)
+    monkeypatch.setattr(Config, "DIRECT_PARALLEL", 2)
+    monkeypatch.setattr(Config, "DIRECT_CONNECTIONS", 8)
+    return aria2
+
+
+def _listener():
+    events = []
+
+    async def on_complete():
+        events.append("complete")
+
+    async def on_error(error):
+        events.append(error)
+
+    listener = SimpleNamespace(
+        name="folder",
+        is_cancelled=False,
+        on_download_complete=on_complete,
+        on_download_error=on_error,
+    )
+    return listener, events
+
+
+def _contents(*urls):
+    return [{"url": url, "filename": url, "path": ""} for url in urls]
+
+
+def test_files_download_in_parallel_with_shared_connections(aria2, run):
+    listener, events = _listener()
+    direct = DirectListener("/downloads/1", listener, {})
+    run(direct.download(_contents("a", "b", "bad", "c", "d")))
+    assert events == ["complete"]
+    assert aria2.peak == 2
+    assert {opts["split"] for opts in aria2.options} == {"4"}
+    assert direct.processed_bytes == 40
+    assert not DirectListener.waiters
+
+
+def test_all_failed_files_report_error(aria2, run):
+    listener, events = _listener()
+    direct = DirectListener("/downloads/1", listener, {})
+    run(direct.download(_contents("bad1", "bad2")))
+    assert events == ["All files are failed to download!"]
@@ -0,0 +1,138 @@
+from asyncio import sleep
+from collections import OrderedDict
+from io import SEEK_CUR, SEEK_END
+from os import makedirs, path as ospath, symlink
+from types import SimpleNamespace
+
+from bot.helper.ext_utils import files_utils
+from bot.helper.ext_utils.files_utils import (
+    FileSlice,
+    MimeTypes,
+    SevenZ,
+    clean_unwanted,
+    scan_tree,
+)
+
+
+def _tree(root):
+    makedirs(root / "a" / "b")
+    makedirs(root / "outside")
+    (root / "a" / "one.MKV").write_bytes(b"x" * 10)
+    (root / "a" / "b" / "two.txt").write_bytes(b"x" * 3)
+    (root / "outside" / "big.bin").write_bytes(b"x" * 100)
+    symlink(root / "outside", root / "a" / "linked_dir")
+    symlink(root / "outside" / "big.bin", root / "a" / "linked.bin")
+
+
+def test_scan_tree_lists_deepest_first_and_skips_linked_dirs(tmp_path):
+    _tree(tmp_path)
+    dirs, files = scan_tree(str(tmp_path / "a"))
+    assert dirs == [str(tmp_path / "a" / "b")]
+    by_name = {entry.name: entry for entry in files}
+    assert set(by_name) == {"one.MKV", "two.txt", "linked.bin"}
+    assert by_name["one.MKV"].ext == ".mkv"
+    assert by_name["linked.bin"].is_link
+    assert by_name["linked.bin"].size == 100
+    assert files[0].name == "two.txt"
+
+
+def test_clean_unwanted_leaves_linked_dirs_alone(tmp_path, run):
+    _tree(tmp_path)
+    makedirs(tmp_path / "a" / "empty")
+    makedirs(tmp_path / "a" / "junk.unwanted")
+    run(clean_unwanted(str(tmp_path / "a")))
+    assert not (tmp_path / "a" / "empty").exists()
+    assert not (tmp_path / "a" / "junk.unwanted").exists()
+    assert (tmp_path / "a" / "linked_dir").is_symlink()
+    assert (tmp_path / "outside" / "big.bin").exists()
+
+
+def test_extract_all_runs_same_folder_archives_concurrently(tmp_path, run, monkeypatch):
+    monkeypatch.setattr(files_utils, "DOWNLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(files_utils, "cpu_count", lambda: 8)
+    makedirs(tmp_path / "x" / "sub")
+    (tmp_path / "x" / "sub" / "old.txt").write_bytes(b"old")
+    archives = []
+    for name, target in (("a", "x"), ("b", "x"), ("c", "y"), ("d", "x/")):
+        (tmp_path / f"{name}.zip").write_bytes(b"x")
+        archives.append((str(tmp_path / f"{name}.zip"), str(tmp_path / target)))
+    running = []
+    peak = [0]
+
+    async def fake_extract(f_path, t_path, pswd):
+        running.append(t_path)
+        peak[0] = max(peak[0], len(running))
+        name = ospath.basename(f_path)
+        makedirs(ospath.join(t_path, "sub"))
+        with open(ospath.join(t_path, "sub", "old.txt"), "w") as f:
+            f.write(name)
+        with open(ospath.join(t_path, name), "w") as f:
+            f.write(name)
+        await sleep(0.02)
+        running.remove(t_path)
+        return 0
+
+    listener = SimpleNamespace(
+        is_cancelled=False, proceed_count=0, subname="", subsize=0
+    )
+    sevenz = SevenZ(listener)
+    monkeypatch.setattr(sevenz, "extract", fake_extract)
+    assert run(sevenz.extract_all(archives, "")) == [0, 0, 0, 0]
+    assert peak[0] == 4
+    assert listener.proceed_count == 4
+    assert sorted(p.name for p in (tmp_path / "x").iterdir()) == [
+        "a.zip",
+        "b.zip",
+        "d.zip",
+        "sub",
+    ]
+    sub = tmp_path / "x" / "sub"
+    assert sorted(p.name for p in sub.iterdir()) == [
+        "old.txt",
+        "old_1.txt",
+        "old_2.txt",
+        "old_3.txt",
+    ]
+    assert (sub / "old.txt").read_text() == "old"
+    assert (sub / "old_1.txt").read_text() == "a.zip"
+    assert (sub / "old_3.txt").read_text() == "d.zip"
+    assert sorted(p.name for p in (tmp_path / "y").iterdir()) == ["c.zip", "sub"]
+
+
+def test_file_slice_reads_only_its_range(tmp_path):
+    source = tmp_path / "big.bin"
+    source.write_bytes(bytes(range(100)))
+    with FileSlice(str(source), 10, 20, "big.bin.001") as part:
+        assert part.name == "big.bin.001"
+        assert part.read(5) == bytes(range(10, 15))
+        assert part.tell() == 5
+        assert part.read() == bytes(range(15, 30))
+        assert part.read() == b""
+        part.seek(-4, SEEK_END)
+        buffer = bytearray(10)
+        assert part.readinto(buffer) == 4
+        assert bytes(buffer[:4]) == bytes(range(26, 30))
+        part.seek(0)
+        assert part.seek(3, SEEK_CUR) == 3
+    assert part.closed
+
+
+def test_mime_types_use_signatures_and_cache_by_version(tmp_path, monkeypatch):
+    monkeypatch.setattr(MimeTypes, "entries", OrderedDict())
+    media = tmp_path / "a.mkv"
+    media.write_bytes(b"\x1a\x45\xdf\xa3" + b"\0" * 60)
+    link = tmp_path / "link.mkv"
+    symlink(media, link)
+    assert MimeTypes.get(str(link)) == "video/x-matroska"
+    assert len(MimeTypes.entries) == 1
+
+    sniffed = []
+    monkeypatch.setattr(
+        MimeTypes, "_from_signature", classmethod(lambda cls, p: sniffed.append(p))
+    )
+    assert MimeTypes.get(str(media)) == "video/x-matroska"
+    assert not sniffed
+
+    media.write_bytes(b"%PDF-1.4\n" + b"\0" * 60)
+    assert MimeTypes.get(str(media)) == "application/pdf"
+    assert sniffed == [str(media)]
@@ -0,0 +1,75 @@
+from asyncio import Lock, Semaphore, sleep
+from types import SimpleNamespace
+
+import pytest
+
+from bot.helper.mirror_leech_utils.gdrive_utils.aio_drive import DriveError
+from bot.helper.mirror_leech_utils.gdrive_utils.clone import GoogleDriveClone
+
+FOLDER = "application/vnd.google-apps.folder"
+
+
+class FakeDrive:
+    def __init__(self):
+        self.copied = []
+
+    async def files_copy(self, file_id, body):
+        if file_id == "broken":
+            raise DriveError(500, "backendError", "boom")
+        if file_id == "locked":
+            raise DriveError(403, "cannotCopyFile", "no copy")
+        await sleep(0.05 if file_id.startswith("slow") else 0)
+        self.copied.append(file_id)
+        return {"id": f"copy-{file_id}"}
+
+
+def _clone(tree):
+    clone = object.__new__(GoogleDriveClone)
+    clone.listener = SimpleNamespace(is_cancelled=False, excluded_extensions=[])
+    clone.drive = FakeDrive()
+    clone.G_DRIVE_DIR_MIME_TYPE = FOLDER
+    clone.use_sa = False
+    clone.total_files = clone.total_folders = clone.proc_bytes = 0
+    clone._start_time = 0
+    clone._copy_limit = Semaphore(10)
+    clone._switch_lock = Lock()
+
+    async def get_files(folder_id):
+        return tree[folder_id]
+
+    async def create_directory(name, dest_id):
+        return f"{dest_id}/{name}"
+
+    clone.get_files_by_folder_id_async = get_files
+    clone.create_directory_async = create_directory
+    return clone
+
+
+def _file(file_id, size=1):
+    return {"id": file_id, "name": file_id, "mimeType": "video/mp4", "size": size}
+
+
+def test_failed_copy_cancels_sibling_and_nested_copies(run):
+    tree = {
+        "root": [
+            _file("slow-a"),
+            {"id": "sub", "name": "sub", "mimeType": FOLDER},
+            _file("broken"),
+        ],
+        "sub": [_file("slow-b")],
+    }
+    clone = _clone(tree)
+    with pytest.raises(DriveError):
+        run(clone._clone_folder("root", "root", "dest"))
+    run(sleep(0.1))
+    assert clone.drive.copied == []
+    assert clone.total_files == 0
+
+
+def test_files_that_cannot_be_copied_are_not_counted(run):
+    tree = {"root": [_file("ok", 5), _file("locked", 7)]}
+    clone = _clone(tree)
+    run(clone._clone_folder("root", "root", "dest"))
+    assert clone.drive.copied == ["ok"]
+    assert clone.total_files == 1
+    assert clone.proc_bytes == 5
@@ -0,0 +1,196 @@
+from asyncio import Event, sleep
+from collections import OrderedDict
+from os import path as ospath
+from types import SimpleNamespace
+
+import pytest
+from pyrogram.errors import FloodWait
+
+from bot.helper.ext_utils import hyperdl_utils
+from bot.helper.ext_utils.hyperdl_utils import (
+    FileRefCache,
+    HyperTGDownload,
+    MediaSessionPool,
+)
+
+
+def _downloader(tmp_path, size):
+    hyper_dl = HyperTGDownload()
+    hyper_dl.clients = {0: None}
+    hyper_dl.work_loads = {0: 0}
+    hyper_dl.directory = str(tmp_path)
+    hyper_dl.file_name = "file.bin"
+    hyper_dl.file_size = size
+    return hyper_dl
+
+
+def _fake_transport(hyper_dl, monkeypatch, data, fetch=None):
+    async def get_file_id(client, index):
+        return None
+
+    async def generate_media_session(client, file_id, index):
+        return index
+
+    async def get_location(file_id):
+        return None
+
+    async def fetch_chunk(media_session, location, chunk_index):
+        start = chunk_index * hyper_dl.chunk_size
+        return data[start : start + hyper_dl.chunk_size]
+
+    monkeypatch.setattr(hyper_dl, "get_file_id", get_file_id)
+    monkeypatch.setattr(hyper_dl, "generate_media_session", generate_media_session)
+    monkeypatch.setattr(hyper_dl, "get_location", get_location)
+    monkeypatch.setattr(hyper_dl, "_fetch_chunk", fetch or fetch_chunk)
+    return fetch_chunk
+
+
+def test_chunks_land_in_one_preallocated_file(tmp_path, run, monkeypatch):
+    data = bytes(range(256)) * 4 + b"tail"
+    hyper_dl = _downloader(tmp_path, len(data))
+    hyper_dl.chunk_size = 64
+    _fake_transport(hyper_dl, monkeypatch, data)
+    path = run(hyper_dl.handle_download(None, ()))
+    assert path == str(tmp_path / "file.bin")
+    with open(path, "rb") as f:
+        assert f.read() == data
+    assert not ospath.exists(hyper_dl._temp_path)
+    assert not ospath.exists(hyper_dl._manifest_path)
+
+
+def test_ranges_merge_and_report_gaps(tmp_path):
+    hyper_dl = _downloader(tmp_path, 100)
+    hyper_dl._mark_done(0, 10)
+    hyper_dl._mark_done(20, 30)
+    hyper_dl._mark_done(10, 20)
+    hyper_dl._mark_done(50, 60)
+    assert hyper_dl._done_ranges == [(0, 30), (50, 60)]
+    assert hyper_dl._missing_ranges(0, 100) == [(30, 50), (60, 100)]
+    assert hyper_dl._missing_ranges(5, 25) == []
+
+
+def test_manifest_roundtrip_checks_media(tmp_path):
+    hyper_dl = _downloader(tmp_path, 100)
+    hyper_dl._media_id = 7
+    hyper_dl._manifest_path = str(tmp_path / "file.bin.temp.parts")
+    hyper_dl._write_manifest([(0, 30)])
+    assert hyper_dl._load_manifest() == [(0, 30)]
+    hyper_dl._media_id = 8
+    assert hyper_dl._load_manifest() == []
+
+
+def test_errors_reach_caller_and_partial_is_discardable(tmp_path, run):
+    hyper_dl = _downloader(tmp_path, 4 * 1024 * 1024)
+
+    async def failing_worker(index, queue):
+        hyper_dl._mark_done(0, hyper_dl.chunk_size)
+        raise ValueError("helper lost")
+
+    hyper_dl._chunk_worker = failing_worker
+    with pytest.raises(ValueError):
+        run(hyper_dl.handle_download(None, ()))
+    assert hyper_dl._fd is None
+    assert ospath.exists(hyper_dl._temp_path)
+    assert ospath.exists(hyper_dl._manifest_path)
+    run(hyper_dl.discard_partial())
+    assert not ospath.exists(hyper_dl._temp_path)
+    assert not ospath.exists(hyper_dl._manifest_path)
+
+
+def test_flood_parks_a_helper_while_others_drain_the_queue(tmp_path, run, monkeypatch):
+    data = bytes(range(200))
+    hyper_dl = _downloader(tmp_path, len(data))
+    hyper_dl.clients = {
+        index: SimpleNamespace(me=SimpleNamespace(username=f"helper{index}"))
+        for index in (0, 1)
+    }
+    hyper_dl.work_loads = {0: 0, 1: 0}
+    hyper_dl.num_parts = 2
+    hyper_dl.chunk_size = 10
+    served = {0: 0, 1: 0}
+    flooded = []
+
+    async def fetch_chunk(media_session, location, chunk_index):
+        if media_session == 0 and not flooded:
+            flooded.append(chunk_index)
+            raise FloodWait(value=0)
+        served[media_session] += 1
+        await sleep(0)
+        return await plain_fetch(media_session, location, chunk_index)
+
+    plain_fetch = _fake_transport(hyper_dl, monkeypatch, data, fetch_chunk)
+    path = run(hyper_dl.handle_download(None, ()))
+    with open(path, "rb") as f:
+        assert f.read() == data
+    assert flooded
+    assert served[1] == 20 - served[0]
+    assert served[1] > served[0]
+
+
+class FakeSession:
+    def __init__(self):
+        self.is_started = Event()
+        self.is_started.set()
+        self.stopped = False
+
+    async def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    created = []
+
+    async def create(client, dc_id):
+        created.append((client, dc_id))
+        return FakeSession()
+
+    monkeypatch.setattr(MediaSessionPool, "_create", staticmethod(create))
+    monkeypatch.setattr(MediaSessionPool, "sessions", {})
+    monkeypatch.setattr(MediaSessionPool, "last_used", {})
+    monkeypatch.setattr(MediaSessionPool, "_key_locks", {})
+    return created
+
+
+def test_media_sessions_are_reused_per_helper_and_dc(pool, run):
+    client = object()
+    first = run(MediaSessionPool.get(client, 0, 4))
+    assert run(MediaSessionPool.get(client, 0, 4)) is first
+    assert run(MediaSessionPool.get(client, 1, 4)) is not first
+    assert len(pool) == 2
+
+    first.is_started.clear()
+    replaced = run(MediaSessionPool.get(client, 0, 4))
+    assert replaced is not first and first.stopped
+
+    new_client = object()
+    assert run(MediaSessionPool.get(new_client, 0, 4)) is not replaced
+    assert replaced.stopped
+
+
+def test_idle_media_sessions_are_stopped(pool, run):
+    idle = run(MediaSessionPool.get(object(), 0, 2))
+    MediaSessionPool.last_used[(0, 2)] -= MediaSessionPool.idle_timeout + 1
+    run(MediaSessionPool.get(object(), 1, 2))
+    assert idle.stopped
+    assert (0, 2) not in MediaSessionPool.sessions
+    run(MediaSessionPool.stop_all())
+    assert not MediaSessionPool.sessions
+
+
+def test_file_ref_cache_expires_and_evicts(monkeypatch):
+    monkeypatch.setattr(FileRefCache, "entries", OrderedDict())
+    monkeypatch.setattr(FileRefCache, "max_size", 2)
+    now = [1000.0]
+    monkeypatch.setattr(hyperdl_utils, "time", lambda: now[0])
+    FileRefCache.put("a", 1)
+    FileRefCache.put("b", 2)
+    assert FileRefCache.get("a") == 1
+    FileRefCache.put("c", 3)
+    assert FileRefCache.get("b") is None
+    assert FileRefCache.get("a") == 1
+    FileRefCache.invalidate("a")
+    assert FileRefCache.get("a") is None
+    now[0] += FileRefCache.ttl + 1
+    assert FileRefCache.get("c") is None
+    assert not FileRefCache.entries
@@ -0,0 +1,61 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+from bot.helper.ext_utils.db_handler import database
+from bot.helper.ext_utils.leech_cache import LeechCache
+from bot.helper.ext_utils.media_utils import get_sample_hash
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(database, "db", None)
+    monkeypatch.setattr(LeechCache, "entries", OrderedDict())
+    monkeypatch.setattr(LeechCache, "max_size", 2)
+
+
+def _sent(chat_type="SUPERGROUP", mid=1):
+    return SimpleNamespace(
+        chat=SimpleNamespace(id=-100, type=SimpleNamespace(name=chat_type)),
+        id=mid,
+        document=SimpleNamespace(file_id=f"file-{mid}"),
+        video=None,
+        audio=None,
+        photo=None,
+    )
+
+
+def test_sample_hash_tracks_content_and_size(tmp_path):
+    first = tmp_path / "a.bin"
+    first.write_bytes(b"a" * 5000)
+    same = tmp_path / "b.bin"
+    same.write_bytes(b"a" * 5000)
+    assert get_sample_hash(str(first), 4, 100) == get_sample_hash(str(same), 4, 100)
+    assert get_sample_hash(str(first)).startswith("5000-")
+    same.write_bytes(b"a" * 4999 + b"b")
+    assert get_sample_hash(str(first), 4, 100) != get_sample_hash(str(same), 4, 100)
+
+
+def test_key_separates_upload_modes(tmp_path, run):
+    media = tmp_path / "a.mkv"
+    media.write_bytes(b"x" * 10)
+    assert run(LeechCache.key(str(media), True)) != run(
+        LeechCache.key(str(media), False)
+    )
+
+
+def test_memory_cache_skips_private_chats_and_stays_bounded(cache, run):
+    run(LeechCache.put("private", _sent("PRIVATE")))
+    assert run(LeechCache.get("private")) is None
+    for mid, key in enumerate(("a", "b", "c"), 1):
+        run(LeechCache.put(key, _sent(mid=mid)))
+    assert run(LeechCache.get("a")) is None
+    assert run(LeechCache.get("b")) == {
+        "chat_id": -100,
+        "message_id": 2,
+        "file_id": "file-2",
+        "client": "bot",
+    }
+    run(LeechCache.remove("b"))
+    assert run(LeechCache.get("b")) is None
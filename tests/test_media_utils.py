@@ -0,0 +1,69 @@
+from asyncio import gather, sleep
+
+import pytest
+
+from bot.helper.ext_utils.media_utils import FFMpeg, MediaInfo, MediaProbe
+
+
+def _keyframes(count, step=100):
+    return [(float(i), i * step) for i in range(count)]
+
+
+def test_plan_cuts_keeps_parts_under_split_size():
+    cuts = FFMpeg._plan_cuts(_keyframes(10), 0, 1000, 350)
+    assert cuts == [2.5, 5.5, 8.5]
+
+
+def test_plan_cuts_is_relative_to_the_start_time():
+    cuts = FFMpeg._plan_cuts(_keyframes(10), 1.0, 1000, 350)
+    assert cuts == [1.5, 4.5, 7.5]
+
+
+def test_plan_cuts_gives_up_on_gops_larger_than_a_part():
+    assert FFMpeg._plan_cuts([(0.0, 0), (1.0, 500)], 0, 1000, 350) == []
+
+
+def test_plan_cuts_without_need_to_split():
+    assert FFMpeg._plan_cuts(_keyframes(10), 0, 1000, 2000) == []
+
+
+@pytest.fixture
+def probe(monkeypatch):
+    calls = []
+    results = []
+
+    async def fake_probe(path):
+        calls.append(path)
+        await sleep(0.01)
+        return results.pop(0) if results else MediaInfo(True, duration=5)
+
+    monkeypatch.setattr(MediaProbe, "_probe", staticmethod(fake_probe))
+    monkeypatch.setattr(MediaProbe, "entries", MediaProbe.entries.__class__())
+    return calls, results
+
+
+def test_media_probe_runs_ffprobe_once_per_file_version(probe, tmp_path, run):
+    calls, _ = probe
+    media = tmp_path / "a.mkv"
+    media.write_bytes(b"x")
+
+    async def probe_many():
+        return await gather(*(MediaProbe.get(str(media)) for _ in range(3)))
+
+    assert all(info.duration == 5 for info in run(probe_many()))
+    assert run(MediaProbe.get(str(media))).ok
+    assert len(calls) == 1
+    media.write_bytes(b"xy")
+    run(MediaProbe.get(str(media)))
+    assert len(calls) == 2
+
+
+def test_media_probe_does_not_cache_failures(probe, tmp_path, run):
+    calls, results = probe
+    media = tmp_path / "a.mkv"
+    media.write_bytes(b"x")
+    results.append(MediaInfo(False))
+    assert not run(MediaProbe.get(str(media))).ok
+    assert run(MediaProbe.get(str(media))).ok
+    assert len(calls) == 2
+    assert not run(MediaProbe.get(str(tmp_path / "missing.mkv"))).ok
@@ -0,0 +1,120 @@
+from asyncio import sleep
+
+import pytest
+
+from bot import bot_loop, intervals, nzb_jobs
+from bot.helper.listeners import nzb_listener
+
+
+class FakeSabnzbd:
+    """Answers like sabnzbd: history is ``false`` until it changes."""
+
+    def __init__(self):
+        self.history = [{"nzo_id": "other", "status": "Completed"}]
+        self.queue = []
+        self.stamp = 1
+        self.history_calls = []
+        self.queue_calls = []
+
+    async def get_history(self, nzo_ids=None, last_history_update=None):
+        self.history_calls.append((list(nzo_ids), last_history_update))
+        if last_history_update == self.stamp:
+            return {"history": False}
+        return {
+            "history": {
+                "slots": [job for job in self.history if job["nzo_id"] in nzo_ids],
+                "last_history_update": self.stamp,
+            }
+        }
+
+    async def get_downloads(self, nzo_ids=None):
+        self.queue_calls.append(bot_loop.time())
+        return {
+            "queue": {"slots": [dl for dl in self.queue if dl["nzo_id"] in nzo_ids]}
+        }
+
+
+def _slot(nzo_id, status, filename="file.nzb"):
+    return {"nzo_id": nzo_id, "status": status, "labels": [], "filename": filename}
+
+
+@pytest.fixture
+def sab(monkeypatch, run):
+    sab = FakeSabnzbd()
+    sab.completed = []
+
+    async def on_complete(nzo_id):
+        sab.completed.append(nzo_id)
+
+    async def noop(*_):
+        pass
+
+    monkeypatch.setattr(nzb_listener, "sabnzbd_client", sab)
+    monkeypatch.setattr(nzb_listener, "_on_download_complete", on_complete)
+    monkeypatch.setattr(nzb_listener, "_stop_duplicate", noop)
+    monkeypatch.setattr(nzb_listener, "_size_check", noop)
+    monkeypatch.setattr(nzb_listener, "_POLL_INTERVAL", 0.05)
+    monkeypatch.setattr(nzb_listener, "_QUEUED_INTERVAL", 0.1)
+    monkeypatch.setattr(nzb_listener, "_IDLE_INTERVAL", 0.4)
+    nzb_jobs.clear()
+    intervals["nzb"] = ""
+    yield sab
+    nzb_jobs.clear()
+    run(sleep(0.5))
+    assert intervals["nzb"] == ""
+
+
+def _max_gap(calls):
+    return max(b - a for a, b in zip(calls, calls[1:]))
+
+
+def test_history_is_fetched_in_full_once(sab, run):
+    sab.queue = [_slot("a", "Downloading", "Trying to fetch")]
+    run(nzb_listener.on_download_start("a"))
+    run(sleep(0.3))
+    markers = [marker for _, marker in sab.history_calls]
+    assert markers[0] is None
+    assert len(markers) > 2
+    assert set(markers[1:]) == {1}
+
+
+def test_idle_backoff_and_queued_cap(sab, run):
+    sab.queue = [_slot("a", "Paused")]
+    run(nzb_listener.on_download_start("a"))
+    nzb_jobs["a"]["size_check"] = True
+    run(sleep(1))
+    assert _max_gap(sab.queue_calls) > 0.3
+
+    # a queued job that wasn't checked yet keeps the poll under the cap
+    sab.queue = [_slot("a", "Queued")]
+    nzb_jobs["a"]["size_check"] = False
+    run(sleep(0.5))
+    sab.queue_calls.clear()
+    run(sleep(0.6))
+    assert _max_gap(sab.queue_calls) < 0.2
+
+
+def test_new_job_wakes_listener_and_resets_marker(sab, run):
+    sab.queue = [_slot("a", "Paused")]
+    run(nzb_listener.on_download_start("a"))
+    nzb_jobs["a"]["size_check"] = True
+    run(sleep(1))
+    sab.history_calls.clear()
+    run(nzb_listener.on_download_start("b"))
+    run(sleep(0.02))
+    nzo_ids, marker = sab.history_calls[0]
+    assert marker is None
+    assert "b" in nzo_ids
+
+
+def test_completed_job_is_picked_up(sab, run):
+    sab.queue = [_slot("a", "Downloading")]
+    run(nzb_listener.on_download_start("a"))
+    run(sleep(0.2))
+    assert not sab.completed
+    sab.queue = []
+    sab.history.append({"nzo_id": "a", "status": "Completed"})
+    sab.stamp = 2
+    run(sleep(0.2))
+    assert sab.completed == ["a"]
+    assert nzb_jobs["a"]["uploaded"]
@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import pytest
+
+from bot.core.config_manager import Config
+from bot.helper.ext_utils.queue_scheduler import QueueScheduler
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setattr(QueueScheduler, "tasks", {})
+    monkeypatch.setattr(Config, "QUEUE_SUDO_PRIORITY", False)
+    monkeypatch.setattr(Config, "QUEUE_ENGINE_LIMITS", {})
+    monkeypatch.setattr(Config, "OWNER_ID", 1)
+
+    def add(mid, user_id, size=0, engine="aria2"):
+        QueueScheduler.tasks[mid] = {
+            "listener": SimpleNamespace(mid=mid, user_id=user_id, size=size),
+            "engine": engine,
+            "order": mid,
+        }
+
+    return add
+
+
+def test_fifo_keeps_arrival_order(scheduler, monkeypatch):
+    monkeypatch.setattr(Config, "QUEUE_POLICY", "fifo")
+    for mid, user_id in ((1, 10), (2, 10), (3, 20)):
+        scheduler(mid, user_id)
+    assert QueueScheduler.order([3, 1, 2, 99], []) == [1, 2, 3, 99]
+
+
+def test_fair_interleaves_users_by_running_load(scheduler, monkeypatch):
+    monkeypatch.setattr(Config, "QUEUE_POLICY", "fair")
+    scheduler(100, 10)
+    for mid, user_id in ((1, 10), (2, 10), (3, 10), (4, 20), (5, 20)):
+        scheduler(mid, user_id)
+    assert QueueScheduler.order([1, 2, 3, 4, 5], [100]) == [4, 1, 5, 2, 3]
+
+
+def test_sjf_prefers_small_known_sizes(scheduler, monkeypatch):
+    monkeypatch.setattr(Config, "QUEUE_POLICY", "sjf")
+    scheduler(1, 10, size=0)
+    scheduler(2, 10, size=500)
+    scheduler(3, 10, size=100)
+    assert QueueScheduler.order([1, 2, 3], []) == [3, 2, 1]
+
+
+def test_sudo_priority_and_engine_limits(scheduler, monkeypatch):
+    monkeypatch.setattr(Config, "QUEUE_POLICY", "fifo")
+    monkeypatch.setattr(Config, "QUEUE_SUDO_PRIORITY", True)
+    monkeypatch.setattr(Config, "QUEUE_ENGINE_LIMITS", {"qbit": 1})
+    scheduler(1, 10, engine="qbit")
+    scheduler(2, 1, engine="qbit")
+    assert QueueScheduler.order([1, 2], []) == [2, 1]
+    assert not QueueScheduler.engine_full("qbit", [])
+    assert QueueScheduler.engine_full("qbit", [1])
+    assert not QueueScheduler.engine_full("aria2", [1])
+
+
+def test_engine_limits_parse_env_and_ignore_bad_values(scheduler, monkeypatch):
+    assert Config._convert_env_type("QUEUE_ENGINE_LIMITS", '{"qbit": 1}') == {"qbit": 1}
+    assert Config._convert_env_type("QUEUE_ENGINE_LIMITS", "qbit=1") == {}
+    scheduler(1, 10, engine="qbit")
+    monkeypatch.setattr(Config, "QUEUE_ENGINE_LIMITS", "qbit=1")
+    assert not QueueScheduler.engine_full("qbit", [1])
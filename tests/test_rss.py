@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient, MockTransport, Response
+
+pytest.importorskip("mega")
+
+from bot.modules.rss import RssFeeds, _new_feed_messages  # noqa: E402
+
+FEED = """<?xml version="1.0"?>
+<rss version="2.0"><channel><title>feed</title>
+<item><title>Show S01E03 1080p</title><link>https://t.example/3</link></item>
+<item><title>Show S01E02 720p</title><link>https://t.example/2</link></item>
+<item><title>Show S01E01 1080p</title><link>https://t.example/1</link></item>
+</channel></rss>"""
+
+
+@pytest.fixture
+def feed_server(monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return Response(304)
+        return Response(200, text=FEED, headers={"ETag": '"v1"'})
+
+    monkeypatch.setattr(
+        RssFeeds, "client", AsyncClient(transport=MockTransport(handler))
+    )
+    monkeypatch.setattr(RssFeeds, "validators", {})
+    return requests
+
+
+def test_unchanged_feeds_are_not_parsed_again(feed_server, run):
+    url = "https://t.example/rss"
+    rss_d = run(RssFeeds.fetch(url))
+    assert len(rss_d.entries) == 3
+    assert run(RssFeeds.fetch(url)) is None
+    assert feed_server[1].headers["If-None-Match"] == '"v1"'
+
+
+def test_new_items_stop_at_the_last_seen_one_and_respect_filters(
+    feed_server, run, monkeypatch
+):
+    monkeypatch.setattr("bot.modules.rss.Config", SimpleNamespace(RSS_SIZE_LIMIT=0))
+    rss_d = run(RssFeeds.fetch("https://t.example/rss"))
+    data = {
+        "last_feed": "https://t.example/1",
+        "last_title": "",
+        "inf": [["1080p"]],
+        "exf": [],
+        "command": "",
+        "tag": "@user",
+    }
+    messages = _new_feed_messages(rss_d, 1, "feed", data)
+    assert len(messages) == 1
+    assert "https://t.example/3" in messages[0]
+
+    data |= {"inf": [], "exf": [["720p"]], "command": "leech -z"}
+    messages = _new_feed_messages(rss_d, 1, "feed", data)
+    assert messages[0].startswith("/leech https://t.example/3 -z")
+    assert len(messages) == 1
@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import pytest
+
+from bot import task_dict
+from bot.helper.ext_utils import status_utils
+from bot.helper.ext_utils.status_utils import (
+    MirrorStatus,
+    _filter_snapshot,
+    _progress_bucket,
+    get_status_snapshot,
+)
+
+
+class FakeTask:
+    def __init__(self, user_id, status, progress="0%"):
+        self.listener = SimpleNamespace(user_id=user_id)
+        self._status = status
+        self._progress = progress
+        self.polls = 0
+
+    async def status(self):
+        self.polls += 1
+        if self._status is None:
+            raise ValueError("gone")
+        return self._status
+
+    def progress(self):
+        return self._progress
+
+
+@pytest.fixture
+def tasks(monkeypatch, tmp_path):
+    monkeypatch.setattr(status_utils, "DOWNLOAD_DIR", str(tmp_path))
+    monkeypatch.setitem(status_utils._snapshot, "time", 0)
+    saved = dict(task_dict)
+    task_dict.clear()
+    yield task_dict
+    task_dict.clear()
+    task_dict.update(saved)
+
+
+def test_snapshot_is_shared_within_a_tick(tasks, run):
+    tasks[1] = FakeTask(10, MirrorStatus.STATUS_DOWNLOAD)
+    tasks[2] = FakeTask(20, None)
+    snapshot = run(get_status_snapshot())
+    assert [tk for tk, _ in snapshot["tasks"]] == [tasks[1]]
+    assert set(snapshot["stats"]) == {"cpu", "ram", "free"}
+    run(get_status_snapshot())
+    assert tasks[1].polls == 1
+    run(get_status_snapshot(max_age=0))
+    assert tasks[1].polls == 2
+
+
+def test_filter_snapshot_by_user_and_status():
+    up = FakeTask(10, MirrorStatus.STATUS_UPLOAD)
+    down = FakeTask(20, MirrorStatus.STATUS_DOWNLOAD)
+    custom = FakeTask(20, "SomeEngineState")
+    snapshot = {"tasks": [(tk, tk._status) for tk in (up, down, custom)]}
+    assert len(_filter_snapshot(snapshot, "All", None)) == 3
+    assert _filter_snapshot(snapshot, "All", 10) == [(up, up._status)]
+    assert [
+        tk for tk, _ in _filter_snapshot(snapshot, MirrorStatus.STATUS_DOWNLOAD, None)
+    ] == [
+        down,
+        custom,
+    ]
+
+
+def test_progress_bucket_ignores_small_changes():
+    assert _progress_bucket(FakeTask(1, None, "41.2%")) == 41
+    assert _progress_bucket(FakeTask(1, None, "41.9%")) == 41
+    assert _progress_bucket(FakeTask(1, None, "n/a")) == 0
@@ -0,0 +1,189 @@
+from asyncio import gather, sleep
+from types import SimpleNamespace
+
+from pyrogram.enums import ChatMemberStatus
+from pyrogram.errors import RPCError
+from tenacity import wait_none
+
+from bot.core.config_manager import Config
+from bot.core.tg_client import TgClient
+from bot.helper.ext_utils.leech_cache import LeechCache
+from bot.helper.mirror_leech_utils.upload_utils import telegram_uploader
+from bot.helper.mirror_leech_utils.upload_utils.telegram_uploader import (
+    SessionLimiter,
+    TelegramUploader,
+    get_upload_helpers,
+    upload_units,
+)
+
+
+def _info(path):
+    dirpath, file_ = path.rsplit("/", 1)
+    return dirpath, file_, path
+
+
+def test_upload_units_keeps_split_parts_together_in_order():
+    files = [
+        _info("/d/movie.mkv.001"),
+        _info("/d/movie.mkv.002"),
+        _info("/d/notes.txt"),
+        _info("/d/movie.mkv.003"),
+        _info("/d/show.part1.rar"),
+        _info("/d/show.part2.rar"),
+    ]
+    units = upload_units(files)
+    assert [[f[1] for f in unit] for unit in units] == [
+        ["movie.mkv.001", "movie.mkv.002", "movie.mkv.003"],
+        ["notes.txt"],
+        ["show.part1.rar", "show.part2.rar"],
+    ]
+
+
+def test_upload_units_separates_same_name_in_other_dirs():
+    units = upload_units([_info("/a/x.zip.001"), _info("/b/x.zip.001")])
+    assert len(units) == 2
+
+
+def test_session_limiter_aimd():
+    limiter = SessionLimiter(limit=2, max_limit=3)
+    limiter.on_success()
+    limiter.on_success()
+    assert limiter.limit == 3
+    for _ in range(5):
+        limiter.on_success()
+    assert limiter.limit == 3
+    limiter.on_flood()
+    assert limiter.limit == 1
+    limiter.on_flood()
+    assert limiter.limit == 1
+
+
+def test_session_limiter_bounds_concurrency(run):
+    limiter = SessionLimiter(limit=2)
+    active = peak = 0
+
+    async def job():
+        nonlocal active, peak
+        async with limiter:
+            active += 1
+            peak = max(peak, active)
+            await sleep(0.01)
+            active -= 1
+
+    async def main():
+        await gather(*(job() for _ in range(6)))
+
+    run(main())
+    assert peak == 2
+
+
+def test_failed_copy_is_retried_without_reupload(monkeypatch, run):
+    calls = {"send": 0, "copy": 0}
+
+    class Helper:
+        async def send_document(self, **kwargs):
+            calls["send"] += 1
+            return SimpleNamespace(chat=SimpleNamespace(id=-100), id=5)
+
+    class Client:
+        async def copy_message(self, **kwargs):
+            calls["copy"] += 1
+            if calls["copy"] == 1:
+                raise RPCError()
+            return "copied"
+
+    async def dump_chat_id():
+        return -100
+
+    monkeypatch.setattr(telegram_uploader, "get_dump_chat_id", dump_chat_id)
+    monkeypatch.setattr(TelegramUploader._copy_from_dump.retry, "wait", wait_none())
+    uploader = object.__new__(TelegramUploader)
+    uploader._listener = SimpleNamespace(client=Client())
+    reply_to = SimpleNamespace(chat=SimpleNamespace(id=-200), id=1)
+    sent, stored = run(
+        uploader._send_media("document", reply_to, Helper(), document="f")
+    )
+    assert sent == "copied"
+    assert (stored.chat.id, stored.id) == (-100, 5)
+    assert calls == {"send": 1, "copy": 2}
+
+
+def test_failed_helper_checks_expire(monkeypatch, run):
+    statuses = [RPCError(), SimpleNamespace(status=ChatMemberStatus.ADMINISTRATOR)]
+
+    class Helper:
+        me = SimpleNamespace(id=1, username="helper")
+
+        async def get_chat_member(self, chat, user):
+            status = statuses.pop(0)
+            if isinstance(status, Exception):
+                raise status
+            return status
+
+    now = [1000.0]
+    monkeypatch.setattr(telegram_uploader, "time", lambda: now[0])
+    monkeypatch.setattr(telegram_uploader, "_dump_admins", {})
+    monkeypatch.setattr(TgClient, "helper_bots", {0: Helper()})
+    monkeypatch.setattr(Config, "LEECH_DUMP_CHAT", "@dump")
+    assert run(get_upload_helpers()) == []
+    assert run(get_upload_helpers()) == []
+    now[0] += telegram_uploader._DUMP_RECHECK + 1
+    assert run(get_upload_helpers()) == [0]
+    assert not statuses
+    assert run(get_upload_helpers()) == [0]
+
+
+def test_cached_copies_are_replayed_by_the_bot(monkeypatch, run):
+    entries = {
+        "bot": {"chat_id": -100, "message_id": 1, "file_id": "f", "client": "bot"},
+        "helper": {
+            "chat_id": -100,
+            "message_id": 2,
+            "file_id": "h",
+            "client": "helper",
+        },
+    }
+    calls = []
+
+    class Bot:
+        async def copy_message(self, **kwargs):
+            calls.append(("copy", kwargs["message_id"]))
+            raise RPCError()
+
+        async def send_cached_media(self, **kwargs):
+            calls.append(("file_id", kwargs["file_id"]))
+            return "resent"
+
+    async def get(key):
+        return entries.get(key)
+
+    async def remove(key):
+        entries.pop(key)
+
+    monkeypatch.setattr(LeechCache, "get", get)
+    monkeypatch.setattr(LeechCache, "remove", remove)
+    uploader = object.__new__(TelegramUploader)
+    uploader._listener = SimpleNamespace(client=Bot())
+    reply_to = SimpleNamespace(chat=SimpleNamespace(id=-200), id=1)
+    assert run(uploader._send_cached("bot", reply_to, "cap")) == "resent"
+    assert "bot" in entries
+    assert run(uploader._send_cached("helper", reply_to, "cap")) is None
+    assert calls == [("copy", 1), ("file_id", "f"), ("copy", 2)]
+    assert "helper" not in entries
+
+
+def test_retried_upload_is_counted_once(run):
+    uploader = object.__new__(TelegramUploader)
+    uploader._listener = SimpleNamespace(is_cancelled=False)
+    uploader._processed_bytes = 0
+    progress = uploader._upload_progress(None)
+
+    async def attempts():
+        for current in (20, 60):
+            await progress(current, 100)
+        # the retry as a document starts again from zero
+        for current in (10, 50, 100):
+            await progress(current, 100)
+
+    run(attempts())
+    assert uploader._processed_bytes == 100
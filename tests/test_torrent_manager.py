@@ -0,0 +1,163 @@
+from time import time
+from types import SimpleNamespace
+
+import pytest
+
+from bot.core.torrent_manager import TorrentManager
+
+
+class FakeAria2:
+    def __init__(self):
+        self.downloads = {
+            "active1": {"gid": "active1", "status": "active"},
+            "other": {"gid": "other", "status": "active"},
+            "done1": {"gid": "done1", "status": "complete"},
+            "wait1": {"gid": "wait1", "status": "waiting"},
+        }
+        self.calls = []
+
+    async def tellActive(self):
+        self.calls.append(("tellActive",))
+        return [d for d in self.downloads.values() if d["status"] == "active"]
+
+    async def multicall(self, methods):
+        gids = [method["params"][0] for method in methods]
+        self.calls.append(("multicall", gids))
+        return [
+            [self.downloads[gid]]
+            if gid in self.downloads
+            else {"code": 1, "message": f"GID {gid} is not found"}
+            for gid in gids
+        ]
+
+    async def tellStatus(self, gid):
+        self.calls.append(("tellStatus", gid))
+        return self.downloads[gid]
+
+
+@pytest.fixture
+def aria2(monkeypatch):
+    aria2 = FakeAria2()
+    monkeypatch.setattr(TorrentManager, "aria2", aria2)
+    monkeypatch.setattr(TorrentManager, "aria2_downloads", {})
+    monkeypatch.setattr(TorrentManager, "_aria2_tracked", {})
+    monkeypatch.setattr(TorrentManager, "_aria2_polled", 0)
+    return aria2
+
+
+def test_refresh_asks_only_for_tracked_gids_missing_from_active(aria2, run):
+    now = time()
+    for gid in ("active1", "done1", "gone"):
+        TorrentManager._aria2_tracked[gid] = now
+    TorrentManager._aria2_tracked["stale"] = now - 120
+    run(TorrentManager._refresh_aria2())
+    assert aria2.calls == [("tellActive",), ("multicall", ["done1", "gone"])]
+    assert set(TorrentManager.aria2_downloads) == {"active1", "other", "done1"}
+    assert "stale" not in TorrentManager._aria2_tracked
+
+
+def test_get_download_tracks_the_gid(aria2, run):
+    assert run(TorrentManager.get_aria2_download("active1"))["status"] == "active"
+    assert aria2.calls == [("tellActive",)]
+
+    TorrentManager._aria2_polled = 0
+    assert run(TorrentManager.get_aria2_download("wait1"))["status"] == "waiting"
+    assert aria2.calls[1:] == [("tellActive",), ("multicall", ["wait1"])]
+
+    # within the poll interval the cached status is served
+    assert run(TorrentManager.get_aria2_download("wait1"))["status"] == "waiting"
+    assert len(aria2.calls) == 3
+
+
+def _tor(ext_hash, tag, state="downloading"):
+    return SimpleNamespace(hash=ext_hash, tags=[tag], state=state)
+
+
+class FakeQbit:
+    def __init__(self, *updates):
+        self.updates = list(updates)
+        self.torrents_by_hash = {}
+        self.rids = []
+        self.info_calls = []
+        self.sync = SimpleNamespace(maindata=self._maindata)
+        self.torrents = SimpleNamespace(info=self._info)
+
+    async def _maindata(self, rid):
+        self.rids.append(rid)
+        update = self.updates.pop(0)
+        if isinstance(update, Exception):
+            raise update
+        return update
+
+    async def _info(self, hashes=None, tag=None):
+        self.info_calls.append(hashes)
+        if hashes is None:
+            return list(self.torrents_by_hash.values())
+        return [self.torrents_by_hash[h] for h in hashes if h in self.torrents_by_hash]
+
+
+@pytest.fixture
+def qbit(monkeypatch):
+    def make(*updates):
+        qbit = FakeQbit(*updates)
+        monkeypatch.setattr(TorrentManager, "qbittorrent", qbit)
+        monkeypatch.setattr(TorrentManager, "qbit_torrents", {})
+        monkeypatch.setattr(TorrentManager, "_qbit_by_hash", {})
+        monkeypatch.setattr(TorrentManager, "_qbit_rid", 0)
+        monkeypatch.setattr(TorrentManager, "_qbit_polled", 0)
+        return qbit
+
+    return make
+
+
+def _poll(run):
+    TorrentManager._qbit_polled = 0
+    return run(TorrentManager.get_qbit_torrents())
+
+
+def test_qbit_sync_merges_partial_updates(qbit, run):
+    qbit = qbit(
+        SimpleNamespace(rid=1, full_update=True),
+        SimpleNamespace(
+            rid=2,
+            full_update=False,
+            torrents={"h2": {}, "h3": {}},
+            torrents_removed=["h1"],
+        ),
+        SimpleNamespace(rid=3, full_update=False),
+    )
+    qbit.torrents_by_hash = {"h1": _tor("h1", "a"), "h2": _tor("h2", "b")}
+    assert len(_poll(run)) == 2
+    assert set(TorrentManager.qbit_torrents) == {"a", "b"}
+
+    qbit.torrents_by_hash = {
+        "h2": _tor("h2", "b", "uploading"),
+        "h3": _tor("h3", "c"),
+    }
+    _poll(run)
+    assert qbit.info_calls == [None, ["h2", "h3"]]
+    assert set(TorrentManager._qbit_by_hash) == {"h2", "h3"}
+    assert TorrentManager.qbit_torrents["b"].state == "uploading"
+    assert "a" not in TorrentManager.qbit_torrents
+
+    # nothing changed: no torrents.info call at all
+    _poll(run)
+    assert len(qbit.info_calls) == 2
+    assert qbit.rids == [0, 1, 2]
+
+
+def test_qbit_sync_error_resets_rid(qbit, run):
+    qbit = qbit(
+        SimpleNamespace(rid=5, full_update=True),
+        RuntimeError("connection lost"),
+        SimpleNamespace(rid=1, full_update=True),
+    )
+    qbit.torrents_by_hash = {"h1": _tor("h1", "a")}
+    _poll(run)
+    assert TorrentManager._qbit_rid == 5
+    # the last known torrents are still served after the error
+    assert len(_poll(run)) == 1
+    assert TorrentManager._qbit_rid == 0
+    qbit.torrents_by_hash = {}
+    assert _poll(run) == []
+    assert qbit.rids == [0, 5, 0]
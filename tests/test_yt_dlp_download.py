@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+from yt_dlp import YoutubeDL
+
+from bot.helper.mirror_leech_utils.download_utils import yt_dlp_download
+from bot.helper.mirror_leech_utils.download_utils.yt_dlp_download import (
+    YoutubeDLHelper,
+)
+
+
+def _helper(size=300):
+    listener = SimpleNamespace(user_id=1, is_cancelled=False, size=size)
+    helper = YoutubeDLHelper(listener)
+    helper.is_playlist = True
+    return helper
+
+
+def _downloading(vid, done, speed):
+    return {
+        "status": "downloading",
+        "info_dict": {"id": vid},
+        "tmpfilename": f"/d/{vid}.mp4.part",
+        "filename": f"/d/{vid}.mp4",
+        "downloaded_bytes": done,
+        "speed": speed,
+    }
+
+
+def _finished(vid, done):
+    return {
+        "status": "finished",
+        "info_dict": {"id": vid},
+        "filename": f"/d/{vid}.mp4",
+        "downloaded_bytes": done,
+    }
+
+
+def test_playlist_progress_sums_active_and_finished_entries():
+    helper = _helper()
+    hook = helper._on_download_progress
+    hook(_downloading("a", 50, 10))
+    hook(_downloading("b", 20, 5))
+    assert helper.downloaded_bytes == 70
+    assert helper.download_speed == 15
+
+    hook(_downloading("a", 100, 10))
+    hook(_finished("a", 100))
+    assert helper._active.keys() == {"b"}
+    assert helper.downloaded_bytes == 120
+    assert helper.download_speed == 5
+
+    hook(_downloading("b", 200, 5))
+    hook(_finished("b", 200))
+    assert not helper._active
+    assert helper.downloaded_bytes == 300
+    assert helper.download_speed == 0
+    assert helper.progress == 100
+
+
+def test_all_failed_entries_report_error(monkeypatch):
+    helper = _helper()
+    helper._info = {"entries": [{"title": "a"}, {"title": "b"}]}
+    errors = []
+    monkeypatch.setattr(helper, "_download_entry", lambda entry: False)
+    monkeypatch.setattr(helper, "_on_download_error", errors.append)
+    monkeypatch.setattr(
+        yt_dlp_download,
+        "async_to_sync",
+        lambda *_: errors.append("completed"),
+    )
+    helper._download("/nonexistent")
+    assert len(errors) == 1
+    assert "All 2 playlist entries failed" in errors[0]
+
+
+def test_playlist_entry_errors_are_counted(monkeypatch):
+    class FailingYoutubeDL(YoutubeDL):
+        def process_ie_result(self, ie_result, download=True, extra_info=None):
+            self.report_error("entry unavailable")
+
+    monkeypatch.setattr(yt_dlp_download, "YoutubeDL", FailingYoutubeDL)
+    helper = _helper()
+    helper.opts = {"quiet": True, "ignoreerrors": True, "logger": None}
+    assert helper._download_entry({"title": "a"}) is False